@@ -0,0 +1,158 @@
+from typing import Dict, Iterable, Optional
+from collections import OrderedDict
+from datetime import datetime
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from app.core.config import settings
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def analysis_key(title: Optional[str], content: Optional[str], version: str) -> str:
+    """Hash of the normalized title and content plus the analyzer version.
+
+    Case and whitespace differences do not change the key; a new analyzer version does,
+    so its results never mix with cached ones from an older version.
+    """
+    normalized = "\x1f".join(_WHITESPACE.sub(" ", (text or "").lower()).strip() for text in (title, content))
+    return hashlib.sha256(f"{version}\x1e{normalized}".encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """Importance analyses keyed by content hash: an in-memory LRU over an optional SQLite file.
+
+    The memory layer holds the most recently used MAX_ENTRIES analyses. With a path, every
+    analysis is also written to that file (its own SQLite database, like the article cache),
+    so restarts and other workers reuse it; the file is trimmed by last access too.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None, persistent_max_entries: Optional[int] = None):
+        self.path = path if path is not None else settings.ANALYSIS_CACHE_PATH
+        self.max_entries = max_entries or settings.ANALYSIS_CACHE_MAX_ENTRIES
+        self.persistent_max_entries = persistent_max_entries or settings.ANALYSIS_CACHE_PERSISTENT_MAX_ENTRIES
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._approx_entries = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Cached analysis for a key, or None"""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict]:
+        """Cached analyses for any of `keys`, one file lookup for all memory misses"""
+        found = {}
+        with self._lock:
+            missing = []
+            for key in dict.fromkeys(keys):
+                analysis = self._memory.get(key)
+                if analysis is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = dict(analysis)
+                    self.hits += 1
+                else:
+                    missing.append(key)
+
+            if missing and self.path:
+                connection = self._connect()
+                now = time.time()
+                # Stay under SQLite's bound parameter limit
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = connection.execute(f"SELECT key, analysis FROM analyses WHERE key IN ({placeholders})", chunk).fetchall()
+                    for key, analysis in rows:
+                        found[key] = json.loads(analysis)
+                        self._remember(key, found[key])
+                        self.persistent_hits += 1
+                    if rows:
+                        connection.execute(
+                            f"UPDATE analyses SET last_access = ? WHERE key IN ({','.join('?' * len(rows))})",
+                            [now] + [key for key, _ in rows]
+                        )
+                connection.commit()
+            self.misses += len(missing) - sum(1 for key in missing if key in found)
+        return found
+
+    def put(self, key: str, analysis: Dict):
+        self.put_many({key: analysis})
+
+    def put_many(self, analyses: Dict[str, Dict]):
+        """Store analyses in memory and, when persistent, in the cache file"""
+        if not analyses:
+            return
+        with self._lock:
+            for key, analysis in analyses.items():
+                self._remember(key, dict(analysis))
+            if self.path:
+                connection = self._connect()
+                now = time.time()
+                connection.executemany(
+                    "INSERT OR REPLACE INTO analyses (key, analysis, last_access) VALUES (?, ?, ?)",
+                    [(key, json.dumps(analysis), now) for key, analysis in analyses.items()]
+                )
+                self._approx_entries += len(analyses)
+                if self._approx_entries > self.persistent_max_entries:
+                    self._evict(connection)
+                connection.commit()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters since startup plus the size of each layer"""
+        with self._lock:
+            persistent_entries = self._connect().execute("SELECT COUNT(*) FROM analyses").fetchone()[0] if self.path else None
+            memory_entries = len(self._memory)
+        lookups = self.hits + self.persistent_hits + self.misses
+        return {
+            "hits": self.hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.persistent_hits) / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "memory_entries": memory_entries,
+            "max_entries": self.max_entries,
+            "persistent_entries": persistent_entries,
+            "persistent_max_entries": self.persistent_max_entries if self.path else None,
+            "path": self.path or None,
+            "checked_at": datetime.utcnow()
+        }
+
+    def _remember(self, key: str, analysis: Dict):
+        self._memory[key] = analysis
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _evict(self, connection: sqlite3.Connection):
+        # Trim to 90% so a full file does not have to evict again on the very next write
+        overflow = connection.execute("SELECT COUNT(*) FROM analyses").fetchone()[0] - int(self.persistent_max_entries * 0.9)
+        if overflow > 0:
+            connection.execute(
+                "DELETE FROM analyses WHERE key IN (SELECT key FROM analyses ORDER BY last_access LIMIT ?)",
+                (overflow,)
+            )
+        self._approx_entries = connection.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS analyses (key TEXT PRIMARY KEY, analysis TEXT NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS ix_analyses_last_access ON analyses (last_access)")
+            self._connection.commit()
+            self._approx_entries = self._connection.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        return self._connection
+
+
+# Shared by every AIContentGenerator (scheduler and API routes)
+analysis_cache = AnalysisCache()
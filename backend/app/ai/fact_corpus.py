@@ -0,0 +1,62 @@
+from typing import Dict, Mapping, Optional, Tuple
+from pathlib import Path
+from types import MappingProxyType
+import json
+import threading
+
+# The rotation corpus shipped with the app; a new version goes in a new file
+DEFAULT_CORPUS_PATH = Path(__file__).parent / "data" / "rotation_facts_v1.json"
+
+
+class FactCorpus:
+    """Local facts rotated in when no model is available, indexed by category.
+
+    The data file is read once, on first use, into read-only tuples per category, so a
+    lookup is two index operations however large the corpus grows. Categories the file
+    does not have (such as "random") use its default category.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else DEFAULT_CORPUS_PATH
+        self.version: Optional[int] = None
+        self.source = "Daily Rotated Database"
+        self._facts: Mapping[str, Tuple[str, ...]] = MappingProxyType({})
+        self._default: Tuple[str, ...] = ()
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def pick(self, category: str, seed: int) -> str:
+        """The category's fact for a seed (the day's ordinal for daily rotation)"""
+        if not self._loaded:
+            self._load()
+        facts = self._facts.get(category, self._default)
+        return facts[seed % len(facts)]
+
+    def stats(self) -> Dict:
+        if not self._loaded:
+            self._load()
+        return {
+            "version": self.version,
+            "path": str(self.path),
+            "facts": sum(len(facts) for facts in self._facts.values()),
+            "categories": {category: len(facts) for category, facts in self._facts.items()}
+        }
+
+    def _load(self):
+        with self._lock:
+            if self._loaded:
+                return
+            with open(self.path, encoding="utf-8") as handle:
+                data = json.load(handle)
+            facts = {category: tuple(texts) for category, texts in data["categories"].items() if texts}
+            if data["default_category"] not in facts:
+                raise ValueError(f"{self.path}: default category {data['default_category']!r} has no facts")
+            self.version = data["version"]
+            self.source = data.get("source", self.source)
+            self._facts = MappingProxyType(facts)
+            self._default = facts[data["default_category"]]
+            self._loaded = True
+
+
+# Shared by every AIContentGenerator
+fact_corpus = FactCorpus()
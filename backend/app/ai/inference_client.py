@@ -0,0 +1,192 @@
+from typing import Any, Dict, Optional
+import asyncio
+import random
+import threading
+import time
+import aiohttp
+from app.core.circuit_breaker import OPEN, CircuitBreaker
+from app.core.config import settings
+
+# Worth retrying: rate limited, model still loading, or a transient server error
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class InferenceError(Exception):
+    """An inference call failed, ran out of its deadline or was short-circuited"""
+
+
+class InferenceClient:
+    """Non-blocking client for a Hugging Face style text generation API.
+
+    Calls share one pooled keep-alive aiohttp session per event loop: the API's loop keeps
+    its session for the life of the process, while each scheduler job runs on a loop of
+    its own and closes that loop's session when it ends (see `close`). Every call has a
+    total deadline budget: attempts, retries (exponential backoff with full jitter,
+    honouring Retry-After and a loading model's estimated_time) and, in
+    AIContentGenerator, the fallback model all have to fit in it. Each model has its own
+    circuit breaker, so a model that keeps failing is skipped without waiting for it;
+    breakers are shared by all loops, so they are only touched under a lock.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_token: Optional[str] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        retry_base: Optional[float] = None,
+        pool_size: Optional[int] = None
+    ):
+        self.base_url = (base_url or settings.INFERENCE_API_URL).rstrip("/")
+        self.api_token = api_token if api_token is not None else settings.INFERENCE_API_TOKEN
+        self.timeout = timeout or settings.INFERENCE_TIMEOUT_SECONDS
+        self.deadline = deadline or settings.INFERENCE_DEADLINE_SECONDS
+        self.max_retries = max_retries if max_retries is not None else settings.INFERENCE_MAX_RETRIES
+        self.retry_base = retry_base if retry_base is not None else settings.INFERENCE_RETRY_BASE_SECONDS
+        self.pool_size = pool_size or settings.INFERENCE_POOL_SIZE
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.stats = {"requests": 0, "succeeded": 0, "retries": 0, "failed": 0, "short_circuited": 0, "deadline_exceeded": 0}
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._sessions_lock = threading.Lock()
+        self._breakers_lock = threading.Lock()
+
+    def deadline_at(self) -> float:
+        """Event loop time by which a call started now has to finish"""
+        return asyncio.get_running_loop().time() + self.deadline
+
+    async def generate(self, model: str, payload: Dict, deadline_at: Optional[float] = None) -> Any:
+        """POST `payload` to a model and return the decoded JSON response.
+
+        Raises InferenceError when the model's breaker is open, the response is not
+        retryable, or the deadline leaves no room for another attempt.
+        """
+        loop = asyncio.get_running_loop()
+        deadline_at = deadline_at if deadline_at is not None else loop.time() + self.deadline
+        breaker = self._breaker(model)
+        with self._breakers_lock:
+            allowed = breaker.allow()
+        if not allowed:
+            self.stats["short_circuited"] += 1
+            raise InferenceError(f"{model} circuit breaker is open")
+
+        session = self._get_session()
+        attempt = 0
+        try:
+            while True:
+                remaining = deadline_at - loop.time()
+                if remaining <= 0:
+                    self.stats["deadline_exceeded"] += 1
+                    raise InferenceError(f"{model}: deadline exceeded")
+
+                retry_after = 0.0
+                self.stats["requests"] += 1
+                try:
+                    async with session.post(
+                        f"{self.base_url}/{model}",
+                        json=payload,
+                        timeout=aiohttp.ClientTimeout(total=min(self.timeout, remaining))
+                    ) as response:
+                        if response.status == 200:
+                            result = await response.json(content_type=None)
+                            with self._breakers_lock:
+                                breaker.record_success()
+                            self.stats["succeeded"] += 1
+                            return result
+                        error = f"HTTP {response.status}"
+                        retryable = response.status in RETRYABLE_STATUSES
+                        retry_after = await self._retry_after(response)
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    error = str(e) or type(e).__name__
+                    retryable = True
+
+                delay = max(random.uniform(0, self.retry_base * 2 ** attempt), retry_after)
+                if not retryable or attempt >= self.max_retries:
+                    raise InferenceError(f"{model}: {error}")
+                if loop.time() + delay >= deadline_at:
+                    self.stats["deadline_exceeded"] += 1
+                    raise InferenceError(f"{model}: {error}, no time left to retry")
+                attempt += 1
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+        except InferenceError:
+            with self._breakers_lock:
+                breaker.record_failure()
+            self.stats["failed"] += 1
+            raise
+        except asyncio.CancelledError:
+            # Cancelled mid-call (client gone, caller's timeout, shutdown): says nothing
+            # about the model, so only hand back a half-open breaker's trial slot
+            with self._breakers_lock:
+                breaker.release_probe()
+            raise
+
+    async def _retry_after(self, response: aiohttp.ClientResponse) -> float:
+        """Seconds the server asked us to wait: Retry-After, or a loading model's estimated_time"""
+        header = response.headers.get("Retry-After")
+        if header:
+            try:
+                return float(header)
+            except ValueError:
+                pass
+        if response.status == 503:
+            try:
+                body = await response.json(content_type=None)
+                return float(body.get("estimated_time", 0.0)) if isinstance(body, dict) else 0.0
+            except (aiohttp.ClientError, ValueError, TypeError):
+                return 0.0
+        return 0.0
+
+    def is_available(self, model: str) -> bool:
+        """Whether the model's breaker would let a call through now (without claiming it)"""
+        with self._breakers_lock:
+            breaker = self.breakers.get(model)
+            return breaker is None or breaker.state != OPEN or (breaker.open_until is not None and time.time() >= breaker.open_until)
+
+    def _breaker(self, model: str) -> CircuitBreaker:
+        with self._breakers_lock:
+            breaker = self.breakers.get(model)
+            if breaker is None:
+                breaker = self.breakers[model] = CircuitBreaker(
+                    failure_threshold=settings.INFERENCE_BREAKER_FAILURE_THRESHOLD,
+                    base_backoff=settings.INFERENCE_BREAKER_BASE_BACKOFF_SECONDS,
+                    max_backoff=settings.INFERENCE_BREAKER_MAX_BACKOFF_SECONDS
+                )
+            return breaker
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """The pooled session of the running event loop, created on first use"""
+        loop = asyncio.get_running_loop()
+        with self._sessions_lock:
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                headers = {"Content-Type": "application/json"}
+                if self.api_token:
+                    headers["Authorization"] = f"Bearer {self.api_token}"
+                connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=settings.INFERENCE_KEEPALIVE_SECONDS)
+                session = self._sessions[loop] = aiohttp.ClientSession(headers=headers, connector=connector)
+            return session
+
+    async def close(self):
+        """Close the running event loop's session; call it before that loop finishes"""
+        with self._sessions_lock:
+            session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _breaker_snapshots(self) -> Dict:
+        with self._breakers_lock:
+            return {model: breaker.snapshot() for model, breaker in self.breakers.items()}
+
+    def get_stats(self) -> Dict:
+        """Call counters since startup and each model's breaker state"""
+        return {
+            **self.stats,
+            "base_url": self.base_url,
+            "sessions": len(self._sessions),
+            "breakers": self._breaker_snapshots()
+        }
+
+
+# Shared by every AIContentGenerator so connections and breakers are shared too
+inference_client = InferenceClient()
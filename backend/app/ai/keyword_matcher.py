@@ -0,0 +1,184 @@
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+import hashlib
+import json
+import re
+
+# Every keyword list used for classification and scoring, by signal group. The matcher is
+# built from these once at import, so a text is scanned a single time for all of them.
+KEYWORD_GROUPS: Dict[str, List[str]] = {
+    # BreakingNewsService._is_breaking_news
+    "breaking_indicator": [
+        "breaking", "just in", "urgent", "alert", "announcement",
+        "launches", "releases", "acquires", "merges", "partners",
+        "funding", "ipo", "layoffs", "hiring", "expansion"
+    ],
+    "breaking_company": [
+        "google", "apple", "microsoft", "amazon", "meta", "facebook",
+        "tesla", "nvidia", "intel", "amd", "netflix", "spotify",
+        "uber", "lyft", "airbnb", "stripe", "openai", "anthropic"
+    ],
+    "breaking_ai": [
+        "artificial intelligence", "machine learning", "deep learning",
+        "neural network", "gpt", "chatgpt", "llm", "ai model", "algorithm"
+    ],
+    # BreakingNewsService._categorize_news, checked in this order
+    "category_ai": ["ai", "openai", "chatgpt", "artificial intelligence", "machine learning", "gpt", "llm"],
+    "category_startup": ["startup", "funding", "venture", "ipo"],
+    "category_acquisition": ["acquire", "merger", "acquisition"],
+    "category_employment": ["layoff", "hiring", "job"],
+    "category_security": ["breach", "security", "hack"],
+    # AIContentGenerator.analyze_news_importance
+    "news_high_importance": [
+        "breakthrough", "revolutionary", "major", "critical", "significant",
+        "first", "launch", "release", "announcement", "acquisition", "merger",
+        "ipo", "funding", "billion", "million", "partnership", "deal"
+    ],
+    "news_urgent": ["breaking", "urgent", "alert", "critical"],
+    # Both analyzers
+    "major_company": [
+        "apple", "microsoft", "google", "amazon", "meta", "facebook",
+        "tesla", "nvidia", "netflix", "openai", "anthropic", "x",
+        "twitter", "linkedin", "uber", "airbnb", "spotify"
+    ],
+    # content_generator.score_breaking_news
+    "breaking_high_importance": [
+        "breakthrough", "revolutionary", "major", "critical", "significant",
+        "first", "launch", "release", "announcement", "acquisition", "merger",
+        "ipo", "funding", "billion", "partnership", "deal", "crisis", "breach"
+    ],
+    "critical_indicator": [
+        "critical", "urgent", "breaking", "alert", "crisis", "breach",
+        "security", "hack", "attack", "outage", "down", "failure"
+    ],
+    "positive": [
+        "launch", "release", "announcement", "partnership", "acquisition",
+        "growth", "success", "breakthrough", "innovation", "achievement",
+        "milestone", "record", "profit", "gain", "up"
+    ],
+    "negative": [
+        "breach", "hack", "attack", "crisis", "failure", "outage",
+        "down", "loss", "decline", "layoff", "cut", "drop"
+    ],
+}
+
+CATEGORY_ORDER = [
+    ("category_ai", "ai"),
+    ("category_startup", "startup"),
+    ("category_acquisition", "acquisition"),
+    ("category_employment", "employment"),
+    ("category_security", "security"),
+]
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Single-word keywords this long also match inside a word ("security" in "cybersecurity");
+# shorter ones ("ai", "x", "up") only match as a word of their own
+SUBSTRING_MIN_LENGTH = 4
+
+# Bumped when the matching rules change, so results computed under the old ones are stale
+MATCHER_VERSION = 2
+
+
+def _inflections(word: str) -> Set[str]:
+    """Surface forms a keyword may take: plurals, past tense and -ing/-er forms.
+
+    Matching short keywords as whole tokens (plus these forms) instead of substrings keeps
+    "ai" from matching "said" and "up" from matching "startup".
+    """
+    forms = {word, word + "s", word + "es", word + "ed", word + "ing", word + "er", word + "ers"}
+    if word.endswith("e"):
+        forms.update({word + "d", word[:-1] + "ing"})
+    elif len(word) > 2 and word[-1] not in "aeiouwxy" and word[-2] in "aeiou" and word[-3] not in "aeiou":
+        forms.update({word + word[-1] + "ed", word + word[-1] + "ing"})  # drop -> dropped, cut -> cutting
+    return forms
+
+
+def keyword_digest(groups: Iterable[str]) -> str:
+    """Short hash of the keyword lists of `groups`, to version results computed from them"""
+    lists = {group: KEYWORD_GROUPS[group] for group in sorted(groups)}
+    lists["_matcher_version"] = MATCHER_VERSION
+    return hashlib.sha256(json.dumps(lists, sort_keys=True).encode("utf-8")).hexdigest()[:8]
+
+
+class KeywordSignals:
+    """Keywords found in one text, grouped by signal group"""
+
+    __slots__ = ("matches",)
+
+    def __init__(self, matches: Dict[str, Set[str]]):
+        self.matches = matches
+
+    def get(self, group: str) -> Set[str]:
+        return self.matches.get(group, set())
+
+    def count(self, group: str) -> int:
+        return len(self.matches.get(group, ()))
+
+    def has(self, group: str) -> bool:
+        return group in self.matches
+
+
+class KeywordMatcher:
+    """Token-boundary automaton that finds every group's keywords in one pass over a text.
+
+    Keywords are indexed by the surface forms of their first token; multi-word keywords
+    check their remaining tokens only when the first one matches. Single-word keywords of
+    SUBSTRING_MIN_LENGTH or more characters also match inside a token, as the substring
+    checks this replaced did, so compounds such as "cyberattack" keep their signals. The
+    entries for each distinct token are worked out once and remembered, so the cost of a
+    scan is one dict lookup per token however many keywords there are.
+    """
+
+    # Remembered token lookups before the memo is cleared (bounds memory on odd input)
+    MAX_MEMO_TOKENS = 200_000
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        # first token surface form -> [(remaining token alternatives, group, keyword)]
+        self._index: Dict[str, List[Tuple[Tuple[FrozenSet[str], ...], str, str]]] = {}
+        # keyword -> groups, for keywords that may appear inside a longer token
+        self._substrings: Dict[str, List[str]] = {}
+        for group, keywords in groups.items():
+            for keyword in dict.fromkeys(keywords):
+                tokens = _TOKEN.findall(keyword.lower())
+                if len(tokens) == 1 and len(tokens[0]) >= SUBSTRING_MIN_LENGTH:
+                    self._substrings.setdefault(tokens[0], []).append(group)
+                # Only the last word of a phrase is inflected ("ai model" -> "ai models")
+                alternatives = [frozenset([token]) for token in tokens[:-1]] + [frozenset(_inflections(tokens[-1]))]
+                for form in alternatives[0]:
+                    self._index.setdefault(form, []).append((tuple(alternatives[1:]), group, keyword))
+        self._memo: Dict[str, List[Tuple[Tuple[FrozenSet[str], ...], str, str]]] = {}
+
+    def _entries(self, token: str) -> List[Tuple[Tuple[FrozenSet[str], ...], str, str]]:
+        entries = self._memo.get(token)
+        if entries is None:
+            entries = list(self._index.get(token, ()))
+            entries.extend(
+                ((), group, keyword)
+                for keyword, keyword_groups in self._substrings.items() if keyword in token
+                for group in keyword_groups
+            )
+            if len(self._memo) >= self.MAX_MEMO_TOKENS:
+                self._memo.clear()
+            self._memo[token] = entries
+        return entries
+
+    def scan(self, text: str) -> KeywordSignals:
+        """Find every keyword of every group in `text`"""
+        tokens = _TOKEN.findall(text.lower())
+        matches: Dict[str, Set[str]] = {}
+        entries_for = self._entries
+        for position, token in enumerate(tokens):
+            entries = entries_for(token)
+            if not entries:
+                continue
+            for rest, group, keyword in entries:
+                if rest and not all(
+                    position + offset < len(tokens) and tokens[position + offset] in forms
+                    for offset, forms in enumerate(rest, start=1)
+                ):
+                    continue
+                matches.setdefault(group, set()).add(keyword)
+        return KeywordSignals(matches)
+
+
+keyword_matcher = KeywordMatcher(KEYWORD_GROUPS)
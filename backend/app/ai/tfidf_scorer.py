@@ -0,0 +1,310 @@
+"""Vectorized TF-IDF importance model for breaking news (optional, needs NumPy).
+
+Train it offline from the analyses already in breaking_news, from backend/:
+    python -m app.ai.tfidf_scorer [--out tfidf_model.npz] [--max-features 20000] [--limit 100000]
+
+then set BREAKING_NEWS_SCORER=tfidf. A batch is turned into one sparse TF-IDF matrix
+(CSR arrays) and scored with a single sparse product against the learned weights, for
+importance, criticality and sentiment at once.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+from collections import Counter
+from functools import lru_cache
+from itertools import repeat
+import argparse
+import hashlib
+import io
+import json
+import math
+import os
+
+try:
+    import numpy as np
+except ImportError:  # optional: the rule-based scorer needs nothing beyond the stdlib
+    np = None
+
+from app.core.config import settings
+
+# Columns of the weight matrix, in order
+TARGETS = ("importance", "critical", "sentiment")
+_SENTIMENT_VALUES = {"positive": 1.0, "negative": -1.0}
+
+# Words are runs of ASCII letters and digits, lowercased; every other byte breaks words.
+# The batch table keeps NUL, which separates the texts of a batch joined into one string.
+_WORD_BYTES = bytes(b + 32 if 65 <= b <= 90 else b if 97 <= b <= 122 or 48 <= b <= 57 else 32 for b in range(256))
+_BATCH_BYTES = b"\x00" + _WORD_BYTES[1:]
+_SEPARATOR = b"\x00"
+
+
+def _words(text: str, table: bytes = _WORD_BYTES) -> List[bytes]:
+    return text.encode("ascii", "replace").translate(table).split()
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words and adjacent word pairs ("machine learning")"""
+    words = [word.decode("ascii") for word in _words(text)]
+    return words + list(map(" ".join, zip(words, words[1:])))
+
+
+class SparseRows:
+    """A CSR matrix as plain NumPy arrays, with the two products the model needs"""
+
+    def __init__(self, indptr, indices, data, columns: int):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.columns = columns
+        self.rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+
+    def dot(self, weights):
+        """X @ weights for a (columns,) vector or (columns, k) matrix"""
+        if weights.ndim == 1:
+            return np.bincount(self.rows, weights=self.data * weights[self.indices], minlength=len(self.indptr) - 1)
+        return np.stack([self.dot(weights[:, column]) for column in range(weights.shape[1])], axis=1)
+
+    def tdot(self, values):
+        """X.T @ values for a (rows,) vector"""
+        return np.bincount(self.indices, weights=self.data * values[self.rows], minlength=self.columns)
+
+
+class TfidfModel:
+    """Vocabulary, IDF weights and a linear layer per target, saved as one .npz file"""
+
+    def __init__(self, terms: Sequence[str], idf, weights, bias, trained_on: int = 0):
+        self.terms = list(terms)
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = np.asarray(bias, dtype=np.float64)
+        self.trained_on = trained_on
+        digest = hashlib.sha256(self.weights.tobytes() + self.bias.tobytes() + "\n".join(self.terms).encode("utf-8"))
+        # Analyses from different models must not share cache entries
+        self.version = f"tfidf-{digest.hexdigest()[:12]}"
+        self._index_terms()
+
+    def _index_terms(self):
+        """Word ids for every word in a term, and the term columns by word id.
+
+        A word pair's code is first_id * len(words) + second_id, so the pairs of a whole
+        batch are found with array operations instead of building a string per pair.
+        """
+        self.words: Dict[bytes, int] = {}
+        for term in self.terms:
+            for word in term.encode("ascii").split(b" "):
+                self.words.setdefault(word, len(self.words))
+        self.word_columns = np.full(len(self.words) + 1, -1, dtype=np.int64)  # last slot: unknown words
+        pairs = []
+        for column, term in enumerate(self.terms):
+            parts = term.encode("ascii").split(b" ")
+            if len(parts) == 1:
+                self.word_columns[self.words[parts[0]]] = column
+            else:
+                pairs.append((self.words[parts[0]] * len(self.words) + self.words[parts[1]], column))
+        pairs.sort()
+        self.pair_codes = np.asarray([code for code, _ in pairs], dtype=np.int64)
+        self.pair_columns = np.asarray([column for _, column in pairs], dtype=np.int64)
+
+    def _word_ids(self, texts: Sequence[str]):
+        """Word ids of a whole batch as one flat array (-1 for unknown words), and their texts.
+
+        The batch is split into words in a single pass and looked up inside map(), so no
+        Python code runs per word or per text; everything after this is array operations.
+        """
+        lookup = {**self.words, _SEPARATOR: -2}.get
+        words = _words(" \x00 ".join(texts), _BATCH_BYTES)
+        ids = np.fromiter(map(lookup, words, repeat(-1)), dtype=np.int64, count=len(words))
+        separators = ids == -2
+        if len(texts) and separators.sum() == len(texts) - 1:
+            return ids[~separators], np.cumsum(separators)[~separators]
+
+        # A text contains NUL itself (or the batch is empty): split text by text
+        lookup = self.words.get
+        lengths: List[int] = []
+        word_ids: List[int] = []
+        for text in texts:
+            words = _words(text)
+            lengths.append(len(words))
+            word_ids.extend(map(lookup, words, repeat(-1)))
+        return np.asarray(word_ids, dtype=np.int64), np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+
+    def transform(self, texts: Sequence[str]) -> SparseRows:
+        """Sublinear TF-IDF rows, L2-normalized, for the known terms of each text"""
+        word_ids, word_rows = self._word_ids(texts)
+        columns = self.word_columns[word_ids]  # -1 indexes the unknown-word slot
+        term_rows = [word_rows[columns >= 0]]
+        term_columns = [columns[columns >= 0]]
+
+        # Adjacent word pairs within the same text that are terms
+        first, second = word_ids[:-1], word_ids[1:]
+        paired = (word_rows[:-1] == word_rows[1:]) & (first >= 0) & (second >= 0)
+        if len(self.pair_codes) and paired.any():
+            codes = first[paired] * len(self.words) + second[paired]
+            positions = np.minimum(np.searchsorted(self.pair_codes, codes), len(self.pair_codes) - 1)
+            found = self.pair_codes[positions] == codes
+            term_rows.append(word_rows[:-1][paired][found])
+            term_columns.append(self.pair_columns[positions[found]])
+
+        # Sorting (row, term) keys groups each text's terms: CSR order, counts included
+        width = max(len(self.terms), 1)
+        keys, counts = np.unique(np.concatenate(term_rows) * width + np.concatenate(term_columns), return_counts=True)
+        rows_of_keys = keys // width
+        indices = keys - rows_of_keys * width
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(rows_of_keys, minlength=len(texts)))))
+        data = (1.0 + np.log(counts)) * self.idf[indices]
+        rows = SparseRows(indptr, indices, data, len(self.terms))
+        norms = np.sqrt(np.bincount(rows.rows, weights=data * data, minlength=len(texts)))
+        rows.data = data / np.where(norms > 0, norms, 1.0)[rows.rows]
+        return rows
+
+    def predict(self, texts: Sequence[str]):
+        """(len(texts), len(TARGETS)) raw predictions"""
+        return self.transform(texts).dot(self.weights) + self.bias
+
+    def analyze(self, items: Sequence[Tuple[str, str]]) -> List[Dict]:
+        """Analyses shaped like score_breaking_news for (title, content) pairs, in order"""
+        predictions = self.predict([f"{title or ''} {content or ''}" for title, content in items])
+        analyses = []
+        for importance, critical, sentiment_value in predictions.tolist():
+            score = round(min(1.0, max(0.0, importance)), 2)
+            impact_level = "high" if score >= 0.8 else "medium" if score >= 0.6 else "low"
+            sentiment = "positive" if sentiment_value > 1 / 3 else "negative" if sentiment_value < -1 / 3 else "neutral"
+            analyses.append({
+                "importance_score": score,
+                "is_critical": critical >= 0.5,
+                "sentiment": sentiment,
+                "impact_level": impact_level,
+                "reason": f"TF-IDF model {self.version}: {impact_level} impact, {sentiment} sentiment"
+            })
+        return analyses
+
+    def save(self, path: str):
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            terms=np.asarray(self.terms, dtype=np.str_),
+            idf=self.idf,
+            weights=self.weights,
+            bias=self.bias,
+            meta=np.asarray(json.dumps({"targets": TARGETS, "trained_on": self.trained_on}))
+        )
+        # Write then rename, so a running app never loads a half-written model
+        with open(f"{path}.tmp", "wb") as handle:
+            handle.write(buffer.getvalue())
+        os.replace(f"{path}.tmp", path)
+
+    @classmethod
+    def load(cls, path: str) -> "TfidfModel":
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if tuple(meta["targets"]) != TARGETS:
+                raise ValueError(f"{path}: model predicts {meta['targets']}, expected {TARGETS}")
+            return cls(data["terms"].tolist(), data["idf"], data["weights"], data["bias"], meta.get("trained_on", 0))
+
+
+def train(
+    texts: Sequence[str],
+    targets,
+    max_features: int = 20000,
+    min_df: int = 2,
+    l2: float = 1.0,
+    iterations: int = 100
+) -> TfidfModel:
+    """Fit a ridge regression per target on TF-IDF features.
+
+    `targets` is (len(texts), len(TARGETS)). Each column is solved with conjugate gradient
+    on the normal equations, using only sparse products, so memory stays proportional to
+    the number of stored terms rather than texts x vocabulary.
+    """
+    document_frequency = Counter()
+    for text in texts:
+        document_frequency.update(set(tokenize(text)))
+    common = [(df, term) for term, df in document_frequency.items() if df >= min_df]
+    terms = sorted(term for _, term in sorted(common, key=lambda entry: (-entry[0], entry[1]))[:max_features])
+    idf = np.asarray([math.log((1 + len(texts)) / (1 + document_frequency[term])) + 1.0 for term in terms])
+
+    targets = np.asarray(targets, dtype=np.float64)
+    bias = targets.mean(axis=0)
+    model = TfidfModel(terms, idf, np.zeros((len(terms), len(TARGETS))), bias, trained_on=len(texts))
+    rows = model.transform(texts)
+
+    weights = np.zeros((len(terms), len(TARGETS)))
+    for column in range(len(TARGETS)):
+        weights[:, column] = _conjugate_gradient(rows, targets[:, column] - bias[column], l2, iterations)
+    return TfidfModel(terms, idf, weights, bias, trained_on=len(texts))
+
+
+def _conjugate_gradient(rows: SparseRows, y, l2: float, iterations: int):
+    """Solve (X.T X + l2 I) w = X.T y"""
+    w = np.zeros(rows.columns)
+    residual = rows.tdot(y)
+    direction = residual.copy()
+    residual_norm = residual @ residual
+    for _ in range(iterations):
+        if residual_norm < 1e-10:
+            break
+        product = rows.tdot(rows.dot(direction)) + l2 * direction
+        step = residual_norm / (direction @ product)
+        w += step * direction
+        residual -= step * product
+        next_norm = residual @ residual
+        direction = residual + (next_norm / residual_norm) * direction
+        residual_norm = next_norm
+    return w
+
+
+def analysis_targets(importance_score: Optional[float], is_critical: Optional[bool], sentiment: Optional[str]) -> List[float]:
+    """Training targets from a stored analysis, in TARGETS order"""
+    return [importance_score or 0.0, 1.0 if is_critical else 0.0, _SENTIMENT_VALUES.get(sentiment, 0.0)]
+
+
+def train_from_database(db, max_features: int = 20000, limit: Optional[int] = None) -> TfidfModel:
+    """Train on the analyzed rows of breaking_news, newest first"""
+    from app.models.database import BreakingNews
+
+    query = db.query(
+        BreakingNews.title, BreakingNews.content, BreakingNews.importance_score,
+        BreakingNews.is_critical, BreakingNews.sentiment
+    ).filter(BreakingNews.ai_analysis.isnot(None)).order_by(BreakingNews.id.desc())
+    if limit:
+        query = query.limit(limit)
+    texts, targets = [], []
+    for title, content, importance_score, is_critical, sentiment in query.yield_per(1000):
+        texts.append(f"{title or ''} {content or ''}")
+        targets.append(analysis_targets(importance_score, is_critical, sentiment))
+    if not texts:
+        raise ValueError("No analyzed breaking news to train on")
+    return train(texts, targets, max_features=max_features)
+
+
+@lru_cache(maxsize=1)
+def load_configured_model() -> Optional[TfidfModel]:
+    """The model BREAKING_NEWS_SCORER=tfidf asks for, or None to keep the rules"""
+    if settings.BREAKING_NEWS_SCORER != "tfidf":
+        return None
+    if np is None:
+        print("BREAKING_NEWS_SCORER=tfidf needs numpy; using rule-based scoring")
+        return None
+    try:
+        model = TfidfModel.load(settings.TFIDF_MODEL_PATH)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Could not load TF-IDF model from {settings.TFIDF_MODEL_PATH} ({e}); using rule-based scoring")
+        return None
+    print(f"Loaded TF-IDF model {model.version}: {len(model.terms)} terms, trained on {model.trained_on} items")
+    return model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the TF-IDF importance model from breaking_news")
+    parser.add_argument("--out", default=settings.TFIDF_MODEL_PATH)
+    parser.add_argument("--max-features", type=int, default=20000)
+    parser.add_argument("--limit", type=int, default=None, help="train on at most this many of the newest rows")
+    args = parser.parse_args()
+
+    from app.models.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        model = train_from_database(db, max_features=args.max_features, limit=args.limit)
+    finally:
+        db.close()
+    model.save(args.out)
+    print(f"Saved {model.version} ({len(model.terms)} terms, {model.trained_on} items) to {args.out}")
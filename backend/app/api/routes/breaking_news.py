@@ -5,18 +5,26 @@ from datetime import datetime, timedelta
 import requests
 import json
 from bs4 import BeautifulSoup
+from pydantic import BaseModel
 import asyncio
 import aiohttp
 
-from app.models.database import get_db, BreakingNews
+from app.models.database import get_db, BreakingNews, User
+from app.api.routes.auth import get_current_user
+from app.ai.analysis_cache import analysis_cache
 from app.ai.content_generator import AIContentGenerator
+from app.core.config import settings
+from app.core.http_cache import http_cache
+from app.core.response_cache import BREAKING_NEWS, FEED_SOURCES, response_cache
+from app.services.article_cache import article_cache
 from app.services.breaking_news_service import BreakingNewsService
+from app.services.scheduler import news_scheduler
 
 router = APIRouter()
 ai_generator = AIContentGenerator()
 breaking_news_service = BreakingNewsService()
 
-@router.get("/")
+@router.get("/", dependencies=[Depends(http_cache(BREAKING_NEWS, max_age=60, stale_while_revalidate=300))])
 async def get_breaking_news(
     limit: int = 10,
     db: Session = Depends(get_db)
@@ -32,7 +40,7 @@ async def get_breaking_news(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/latest")
+@router.get("/latest", dependencies=[Depends(http_cache(BREAKING_NEWS, max_age=60, stale_while_revalidate=300))])
 async def get_latest_breaking_news(db: Session = Depends(get_db)):
     """Get the most recent breaking news (last 24 hours)"""
     try:
@@ -48,7 +56,7 @@ async def get_latest_breaking_news(db: Session = Depends(get_db)):
 async def fetch_google_news(db: Session = Depends(get_db)):
     """Fetch breaking news from Google News"""
     try:
-        news_items = await breaking_news_service.fetch_google_news(db)
+        news_items = await breaking_news_service.fetch_source(db, "google_news")
         return {
             "success": True,
             "message": f"Fetched {len(news_items)} breaking news items",
@@ -61,7 +69,7 @@ async def fetch_google_news(db: Session = Depends(get_db)):
 async def fetch_wired_news(db: Session = Depends(get_db)):
     """Fetch breaking news from Wired.com"""
     try:
-        news_items = await breaking_news_service.fetch_wired_news(db)
+        news_items = await breaking_news_service.fetch_source(db, "wired.com")
         return {
             "success": True,
             "message": f"Fetched {len(news_items)} breaking news items from Wired.com",
@@ -87,12 +95,11 @@ async def analyze_breaking_news_importance(
             news_item.content
         )
         
-        # Update the news item
-        news_item.importance_score = importance_analysis.get("importance_score", 0.5)
-        news_item.is_critical = importance_analysis.get("is_critical", False)
-        news_item.ai_analysis = importance_analysis.get("reason", "")
+        # Update the news item (stamped with the analyzer version)
+        news_scheduler.analysis_service.apply_analysis(news_item, importance_analysis)
         
         db.commit()
+        response_cache.invalidate(BREAKING_NEWS)
         
         return {
             "success": True,
@@ -110,7 +117,83 @@ async def analyze_breaking_news_importance(
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/critical")
+@router.post("/analyze-batch")
+async def analyze_breaking_news_batch(
+    news_ids: List[int],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Analyze the importance of many breaking news items in one call (JSON list of ids)"""
+    try:
+        if len(news_ids) > settings.ANALYSIS_BATCH_SIZE:
+            raise HTTPException(status_code=400, detail=f"At most {settings.ANALYSIS_BATCH_SIZE} items per batch")
+        news_items = db.query(BreakingNews).filter(BreakingNews.id.in_(news_ids)).order_by(BreakingNews.id).all()
+        result = await news_scheduler.analysis_service.analyze_items(db, news_items)
+        return {
+            "success": True,
+            "data": [
+                {
+                    "id": item.id,
+                    "title": item.title,
+                    "importance_score": item.importance_score,
+                    "is_critical": item.is_critical,
+                    "ai_analysis": item.ai_analysis
+                }
+                for item in news_items
+            ],
+            "analyzed": result["analyzed"],
+            "reused": result["reused"],
+            "not_found": sorted(set(news_ids) - {item.id for item in news_items})
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/analyze-pending")
+async def analyze_pending_breaking_news(
+    max_items: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Analyze every item without an analysis yet, committing batch by batch (backfill)"""
+    try:
+        return {
+            "success": True,
+            "data": await news_scheduler.analysis_service.analyze_pending(db, max_items=max_items)
+        }
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/rescore")
+async def rescore_stale_breaking_news(
+    max_items: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Re-analyze breaking news analyzed by an older analyzer version"""
+    try:
+        return {
+            "success": True,
+            "data": await news_scheduler.analysis_service.rescore_stale(db, max_items=max_items)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/analysis/versions", dependencies=[Depends(http_cache(None))])
+async def get_analysis_versions(db: Session = Depends(get_db)):
+    """Get analyzed breaking news per analyzer version and how many are stale"""
+    try:
+        return {
+            "success": True,
+            "data": news_scheduler.analysis_service.get_version_stats(db)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/critical", dependencies=[Depends(http_cache(BREAKING_NEWS, max_age=60, stale_while_revalidate=300))])
 async def get_critical_breaking_news(db: Session = Depends(get_db)):
     """Get critical breaking news items"""
     try:
@@ -137,15 +220,240 @@ async def get_critical_breaking_news(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/trending")
+@router.get("/trending", dependencies=[Depends(http_cache(BREAKING_NEWS, max_age=60, stale_while_revalidate=300))])
 async def get_trending_breaking_news(db: Session = Depends(get_db)):
     """Get trending breaking news based on importance and recency"""
     try:
-        trending_news = breaking_news_service.get_trending_news(db, limit=10)
+        return response_cache.get_or_build(BREAKING_NEWS, "trending", lambda: {
+            "success": True,
+            "data": breaking_news_service.get_trending_news(db, limit=10)
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/feed-stats", dependencies=[Depends(http_cache(None))])
+async def get_feed_stats(db: Session = Depends(get_db)):
+    """Get per-source conditional GET stats (304s, bandwidth and processing time saved) and unparseable date counts"""
+    try:
+        stats = breaking_news_service.feed_validators.get_stats(db)
+        return {
+            "success": True,
+            "data": stats,
+            "totals": {
+                "bytes_saved": sum(item["bytes_saved"] for item in stats),
+                "process_seconds_saved": round(sum(item["process_seconds_saved"] for item in stats), 3),
+                "not_modified_count": sum(item["not_modified_count"] for item in stats),
+                "unparseable_dates": sum(item["unparseable_dates"] for item in stats)
+            }
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/sources", dependencies=[Depends(http_cache(FEED_SOURCES, max_age=300, stale_while_revalidate=1800))])
+async def get_feed_sources(include_disabled: bool = False, db: Session = Depends(get_db)):
+    """Get the configured news sources (enabled ones unless include_disabled is set)"""
+    try:
+        sources = breaking_news_service.feed_registry.get_sources(db, enabled_only=not include_disabled)
+        return {
+            "success": True,
+            "data": sources
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/sources")
+async def create_feed_source(
+    name: str,
+    source: str,
+    url: str,
+    parser: str = "rss",
+    limit: int = 15,
+    require_breaking: bool = False,
+    poll_interval_minutes: Optional[float] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Add a news source; it is picked up by the next ingestion run"""
+    try:
+        feed_source = await breaking_news_service.feed_registry.create_source(
+            db,
+            name=name,
+            source=source,
+            url=url,
+            parser=parser,
+            limit=limit,
+            require_breaking=require_breaking,
+            poll_interval_minutes=poll_interval_minutes
+        )
+        return {
+            "success": True,
+            "data": feed_source
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+class FeedSourceUpdate(BaseModel):
+    """Fields to change on a feed source; fields left out are kept"""
+    url: Optional[str] = None
+    parser: Optional[str] = None
+    limit: Optional[int] = None
+    require_breaking: Optional[bool] = None
+    poll_interval_minutes: Optional[float] = None  # null returns the source to adaptive polling
+    enabled: Optional[bool] = None
+
+@router.put("/sources/{source_id}")
+async def update_feed_source(
+    source_id: int,
+    changes: FeedSourceUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Change or disable a news source"""
+    try:
+        feed_source = await breaking_news_service.feed_registry.update_source(
+            db,
+            source_id,
+            changes.model_dump(exclude_unset=True)
+        )
+        if not feed_source:
+            raise HTTPException(status_code=404, detail="Feed source not found")
+        return {
+            "success": True,
+            "data": feed_source
+        }
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/sources/status", dependencies=[Depends(http_cache(None))])
+async def get_sources_status(db: Session = Depends(get_db)):
+    """Get each source's adaptive poll interval, next poll time and circuit breaker state"""
+    try:
+        status = breaking_news_service.poll_scheduler.get_status(db)
+        return {
+            "success": True,
+            "data": status,
+            "open_breakers": sum(1 for item in status if item["breaker_state"] != "closed")
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/pipeline/stats", dependencies=[Depends(http_cache(None))])
+async def get_pipeline_stats():
+    """Get per-stage counters (items, errors, busy and blocked time, queue depth) of the last ingestion run"""
+    try:
+        return {
+            "success": True,
+            "data": news_scheduler.breaking_news_service.last_pipeline_stats
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/analysis-cache/stats", dependencies=[Depends(http_cache(None))])
+async def get_analysis_cache_stats():
+    """Get hit/miss counters and size of the importance analysis cache"""
+    try:
+        return {
+            "success": True,
+            "data": analysis_cache.stats()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/response-cache/stats", dependencies=[Depends(http_cache(None))])
+async def get_response_cache_stats():
+    """Get hit/miss counters, entries and dataset versions of the hot endpoint response cache"""
+    try:
+        return {
+            "success": True,
+            "data": response_cache.get_stats()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/article-cache/stats", dependencies=[Depends(http_cache(None))])
+async def get_article_cache_stats():
+    """Get hit/miss counters and size of the extracted article cache"""
+    try:
+        return {
+            "success": True,
+            "data": article_cache.stats()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/url-redirects/stats", dependencies=[Depends(http_cache(None))])
+async def get_url_redirect_stats(db: Session = Depends(get_db)):
+    """Get the size of the redirect -> canonical URL map and how links were resolved"""
+    try:
+        return {
+            "success": True,
+            "data": news_scheduler.breaking_news_service.url_resolver.get_stats(db)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/history", dependencies=[Depends(http_cache(BREAKING_NEWS, max_age=300, stale_while_revalidate=1800))])
+async def get_breaking_news_history(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    source: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+    db: Session = Depends(get_db)
+):
+    """Get archived breaking news (older than the retention window), newest first"""
+    try:
+        history = news_scheduler.retention_service.get_history(
+            db,
+            start=start,
+            end=end,
+            source=source,
+            category=category,
+            limit=min(limit, 200),
+            offset=offset
+        )
+        return {
+            "success": True,
+            "data": history["items"],
+            "total": history["total"]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/archive/stats", dependencies=[Depends(http_cache(None))])
+async def get_archive_stats(db: Session = Depends(get_db)):
+    """Get row counts and date ranges of the live and archived breaking news"""
+    try:
+        return {
+            "success": True,
+            "data": news_scheduler.retention_service.get_stats(db)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/archive")
+async def archive_breaking_news(
+    retention_days: Optional[float] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Move breaking news older than the retention window to the archive now"""
+    try:
         return {
             "success": True,
-            "data": trending_news
+            "data": news_scheduler.retention_service.archive_old_news(db, retention_days=retention_days)
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -159,6 +467,7 @@ async def delete_breaking_news(news_id: int, db: Session = Depends(get_db)):
         
         db.delete(news_item)
         db.commit()
+        response_cache.invalidate(BREAKING_NEWS)
         
         return {"success": True, "message": "Breaking news deleted"}
     except HTTPException:
@@ -1,66 +1,86 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime
 
-from app.models.database import get_db, Fact
+from app.models.database import get_db, Fact, User
+from app.api.routes.auth import get_current_user
 from app.ai.content_generator import AIContentGenerator
+from app.core.http_cache import http_cache
+from app.core.response_cache import FACTS, response_cache
+from app.services.daily_facts import DailyFactService
 
 router = APIRouter()
 ai_generator = AIContentGenerator()
+daily_fact_service = DailyFactService(ai_generator)
 
-@router.get("/daily")
+
+def _released_facts(db: Session):
+    """Active facts, leaving out those pre-generated for days still to come"""
+    return db.query(Fact).filter(
+        Fact.is_active == True,
+        or_(Fact.fact_date.is_(None), Fact.fact_date <= date.today())
+    )
+
+@router.get("/daily", dependencies=[Depends(http_cache(FACTS, max_age=300, stale_while_revalidate=3600))])
 async def get_daily_fact(db: Session = Depends(get_db)):
-    """Get a single fact for today. If no fact exists for today, generate one."""
+    """Get the fact for today (pre-generated by the scheduler, created once on a miss)"""
     try:
-        today = datetime.now().date()
-        tomorrow = today + timedelta(days=1)
-        
-        # Check if we already have a fact for today (created today, before tomorrow)
-        today_fact = db.query(Fact).filter(
-            Fact.is_active == True,
-            Fact.created_at >= datetime.combine(today, datetime.min.time()),
-            Fact.created_at < datetime.combine(tomorrow, datetime.min.time())
-        ).order_by(Fact.created_at.desc()).first()
-        
-        if today_fact:
-            return {
-                "success": True,
-                "data": {
-                    "fact_text": today_fact.fact_text,
-                    "category": today_fact.category,
-                    "source": today_fact.source,
-                    "created_at": today_fact.created_at
-                }
-            }
-        
-        # If no fact for today, generate one
-        fact_data = await ai_generator.generate_tech_fact("random")
-        
-        new_fact = Fact(
-            fact_text=fact_data["fact_text"],
-            category=fact_data["category"],
-            source=fact_data["source"]
-        )
-        
-        db.add(new_fact)
-        db.commit()
-        db.refresh(new_fact)
+        today = date.today()
+        version = response_cache.version(FACTS)
+        cached = response_cache.get(FACTS, ("daily", today))
+        if cached is not None:
+            return cached
         
-        return {
+        today_fact = await daily_fact_service.ensure_daily_fact(db, today)
+        response = {
             "success": True,
             "data": {
-                "fact_text": new_fact.fact_text,
-                "category": new_fact.category,
-                "source": new_fact.source,
-                "created_at": new_fact.created_at
+                "fact_text": today_fact.fact_text,
+                "category": today_fact.category,
+                "source": today_fact.source,
+                "created_at": today_fact.created_at
             }
         }
+        response_cache.put(FACTS, ("daily", today), response, version)
+        return response
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/")
+@router.get("/queue", dependencies=[Depends(http_cache(FACTS, max_age=60, stale_while_revalidate=300))])
+async def get_fact_queue(db: Session = Depends(get_db)):
+    """Get the days from today on that already have a pre-generated fact"""
+    try:
+        queue = daily_fact_service.get_queue(db)
+        return {
+            "success": True,
+            "data": queue,
+            "count": len(queue)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/pregenerate")
+async def pregenerate_facts(
+    days: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Fill the coming days that have no fact yet"""
+    try:
+        return {
+            "success": True,
+            "data": await daily_fact_service.pregenerate(db, days)
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/", dependencies=[Depends(http_cache(FACTS, max_age=300, stale_while_revalidate=1800))])
 async def get_daily_facts(
     limit: int = 5,
     category: Optional[str] = None,
@@ -68,7 +88,7 @@ async def get_daily_facts(
 ):
     """Get daily tech facts"""
     try:
-        query = db.query(Fact).filter(Fact.is_active == True)
+        query = _released_facts(db)
         
         if category:
             query = query.filter(Fact.category == category)
@@ -92,14 +112,13 @@ async def get_daily_facts(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/today")
+@router.get("/today", dependencies=[Depends(http_cache(FACTS, max_age=300, stale_while_revalidate=3600))])
 async def get_today_facts(db: Session = Depends(get_db)):
     """Get facts created today"""
     try:
         today = datetime.now().date()
-        today_facts = db.query(Fact).filter(
-            Fact.is_active == True,
-            Fact.created_at >= today
+        today_facts = _released_facts(db).filter(
+            or_(Fact.created_at >= today, Fact.fact_date == today)
         ).order_by(Fact.created_at.desc()).all()
         
         return {
@@ -137,6 +156,7 @@ async def generate_new_fact(
         
         db.add(new_fact)
         db.commit()
+        response_cache.invalidate(FACTS)
         db.refresh(new_fact)
         
         return {
@@ -170,6 +190,7 @@ async def create_fact(
         
         db.add(new_fact)
         db.commit()
+        response_cache.invalidate(FACTS)
         db.refresh(new_fact)
         
         return {
@@ -186,7 +207,7 @@ async def create_fact(
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/categories")
+@router.get("/categories", dependencies=[Depends(http_cache(FACTS, max_age=3600, stale_while_revalidate=86400))])
 async def get_fact_categories(db: Session = Depends(get_db)):
     """Get available fact categories"""
     try:
@@ -198,12 +219,23 @@ async def get_fact_categories(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/random")
+@router.get("/inference/stats", dependencies=[Depends(http_cache(None))])
+async def get_inference_stats():
+    """Get inference client counters (retries, failures, deadlines) and per-model breaker state"""
+    try:
+        return {
+            "success": True,
+            "data": ai_generator.inference_client.get_stats()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/random", dependencies=[Depends(http_cache(None))])
 async def get_random_fact(db: Session = Depends(get_db)):
     """Get a random fact"""
     try:
         import random
-        facts = db.query(Fact).filter(Fact.is_active == True).all()
+        facts = _released_facts(db).all()
         
         if not facts:
             raise HTTPException(status_code=404, detail="No facts available")
@@ -234,7 +266,10 @@ async def delete_fact(fact_id: int, db: Session = Depends(get_db)):
             raise HTTPException(status_code=404, detail="Fact not found")
         
         fact.is_active = False
+        # Free its day so a replacement daily fact can be created
+        fact.fact_date = None
         db.commit()
+        response_cache.invalidate(FACTS)
         
         return {"success": True, "message": "Fact deleted"}
     except HTTPException:
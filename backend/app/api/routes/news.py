@@ -3,6 +3,8 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timedelta
 
+from app.core.http_cache import http_cache
+from app.core.response_cache import NEWS, response_cache
 from app.models.database import get_db, News
 from app.ai.content_generator import AIContentGenerator
 from app.services.news_service import NewsService
@@ -11,7 +13,7 @@ router = APIRouter()
 ai_generator = AIContentGenerator()
 news_service = NewsService()
 
-@router.get("/")
+@router.get("/", dependencies=[Depends(http_cache(NEWS, max_age=300, stale_while_revalidate=1800))])
 async def get_daily_news(
     limit: int = 10,
     category: Optional[str] = None,
@@ -28,15 +30,14 @@ async def get_daily_news(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/latest")
+@router.get("/latest", dependencies=[Depends(http_cache(NEWS, max_age=300, stale_while_revalidate=1800))])
 async def get_latest_news(db: Session = Depends(get_db)):
     """Get the most recent news items"""
     try:
-        latest_news = news_service.get_latest_news(db, limit=5)
-        return {
+        return response_cache.get_or_build(NEWS, "latest", lambda: {
             "success": True,
-            "data": latest_news
-        }
+            "data": news_service.get_latest_news(db, limit=5)
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -67,6 +68,7 @@ async def create_news(
         
         db.add(news_item)
         db.commit()
+        response_cache.invalidate(NEWS)
         db.refresh(news_item)
         
         return {
@@ -82,7 +84,7 @@ async def create_news(
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/important")
+@router.get("/important", dependencies=[Depends(http_cache(NEWS, max_age=300, stale_while_revalidate=1800))])
 async def get_important_news(db: Session = Depends(get_db)):
     """Get news marked as important (for weekly section)"""
     try:
@@ -107,7 +109,7 @@ async def get_important_news(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/categories")
+@router.get("/categories", dependencies=[Depends(http_cache(NEWS, max_age=3600, stale_while_revalidate=86400))])
 async def get_news_categories(db: Session = Depends(get_db)):
     """Get available news categories"""
     try:
@@ -129,6 +131,7 @@ async def delete_news(news_id: int, db: Session = Depends(get_db)):
         
         db.delete(news_item)
         db.commit()
+        response_cache.invalidate(NEWS)
         
         return {"success": True, "message": "News item deleted"}
     except HTTPException:
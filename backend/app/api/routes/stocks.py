@@ -4,6 +4,8 @@ from typing import List, Optional
 from datetime import datetime
 import yfinance as yf
 
+from app.core.http_cache import http_cache
+from app.core.response_cache import STOCKS, response_cache
 from app.models.database import get_db, Stock
 from app.services.stock_service import StockService
 
@@ -24,7 +26,7 @@ TECH_COMPANIES = [
     {"symbol": "CRM", "name": "Salesforce Inc."}
 ]
 
-@router.get("/")
+@router.get("/", dependencies=[Depends(http_cache(STOCKS, max_age=300, stale_while_revalidate=3600))])
 async def get_all_stocks(db: Session = Depends(get_db)):
     """Get all tracked tech stocks"""
     try:
@@ -50,43 +52,46 @@ async def get_all_stocks(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/daily")
+@router.get("/daily", dependencies=[Depends(http_cache(STOCKS, max_age=300, stale_while_revalidate=3600))])
 async def get_daily_stocks(db: Session = Depends(get_db)):
     """Get daily stocks for the feed"""
     try:
-        # Get all stocks, ordered by market cap (largest first) or by symbol
-        stocks = db.query(Stock).order_by(Stock.market_cap.desc().nullslast(), Stock.symbol).all()
-        
-        if not stocks or len(stocks) == 0:
-            # If no stocks in DB, return empty array
-            return {
-                "success": True,
-                "data": [],
-                "message": "No stocks available. Stocks will be updated daily at 9:00 AM."
-            }
-        
+        return response_cache.get_or_build(STOCKS, "daily", lambda: _daily_stocks_response(db))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _daily_stocks_response(db: Session):
+    # Get all stocks, ordered by market cap (largest first) or by symbol
+    stocks = db.query(Stock).order_by(Stock.market_cap.desc().nullslast(), Stock.symbol).all()
+    
+    if not stocks or len(stocks) == 0:
+        # If no stocks in DB, return empty array
         return {
             "success": True,
-            "data": [
-                {
-                    "id": stock.id,
-                    "symbol": stock.symbol,
-                    "company_name": stock.company_name,
-                    "current_price": stock.current_price or 0,
-                    "change": stock.change or 0,
-                    "change_percent": stock.change_percent or 0,
-                    "volume": stock.volume or 0,
-                    "market_cap": stock.market_cap or 0,
-                    "updated_at": stock.updated_at
-                }
-                for stock in stocks
-            ],
-            "count": len(stocks)
+            "data": [],
+            "message": "No stocks available. Stocks will be updated daily at 9:00 AM."
         }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {
+        "success": True,
+        "data": [
+            {
+                "id": stock.id,
+                "symbol": stock.symbol,
+                "company_name": stock.company_name,
+                "current_price": stock.current_price or 0,
+                "change": stock.change or 0,
+                "change_percent": stock.change_percent or 0,
+                "volume": stock.volume or 0,
+                "market_cap": stock.market_cap or 0,
+                "updated_at": stock.updated_at
+            }
+            for stock in stocks
+        ],
+        "count": len(stocks)
+    }
 
-@router.get("/live")
+@router.get("/live", dependencies=[Depends(http_cache(None))])
 async def get_live_stocks(db: Session = Depends(get_db)):
     """Get live stock data (fetch from API and update database)"""
     try:
@@ -140,6 +145,7 @@ async def get_live_stocks(db: Session = Depends(get_db)):
                 continue
         
         db.commit()
+        response_cache.invalidate(STOCKS)
         
         return {
             "success": True,
@@ -150,7 +156,7 @@ async def get_live_stocks(db: Session = Depends(get_db)):
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/{symbol}")
+@router.get("/{symbol}", dependencies=[Depends(http_cache(STOCKS, max_age=300, stale_while_revalidate=3600))])
 async def get_stock_by_symbol(symbol: str, db: Session = Depends(get_db)):
     """Get specific stock by symbol"""
     try:
@@ -178,7 +184,7 @@ async def get_stock_by_symbol(symbol: str, db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/top-gainers")
+@router.get("/top-gainers", dependencies=[Depends(http_cache(STOCKS, max_age=300, stale_while_revalidate=3600))])
 async def get_top_gainers(db: Session = Depends(get_db)):
     """Get top gaining stocks"""
     try:
@@ -201,7 +207,7 @@ async def get_top_gainers(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/top-losers")
+@router.get("/top-losers", dependencies=[Depends(http_cache(STOCKS, max_age=300, stale_while_revalidate=3600))])
 async def get_top_losers(db: Session = Depends(get_db)):
     """Get top losing stocks"""
     try:
@@ -224,7 +230,7 @@ async def get_top_losers(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/market-summary")
+@router.get("/market-summary", dependencies=[Depends(http_cache(STOCKS, max_age=300, stale_while_revalidate=3600))])
 async def get_market_summary(db: Session = Depends(get_db)):
     """Get market summary statistics"""
     try:
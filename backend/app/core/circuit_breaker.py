@@ -0,0 +1,83 @@
+from typing import Dict, Optional
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops calling a failing dependency, backing off exponentially between retries.
+
+    After `failure_threshold` consecutive failures the breaker opens for `base_backoff`
+    seconds. When that passes one trial call is let through (half-open): success closes
+    the breaker, failure opens it again for twice as long, up to `max_backoff`.
+
+    State can be restored from and saved to storage (see `snapshot`) so a breaker survives
+    restarts; times are epoch seconds.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        base_backoff: float,
+        max_backoff: float,
+        state: Optional[str] = None,
+        failures: int = 0,
+        trips: int = 0,
+        open_until: Optional[float] = None
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = state or CLOSED
+        self.failures = failures or 0
+        self.trips = trips or 0  # consecutive openings; sets the backoff length
+        self.open_until = open_until
+        self._probe_in_flight = False
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        """Whether a call may go ahead now"""
+        now = now if now is not None else time.time()
+        if self.state == OPEN:
+            if self.open_until is not None and now < self.open_until:
+                return False
+            self.state = HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+        return True
+
+    def record_success(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.open_until = None
+        self._probe_in_flight = False
+
+    def record_failure(self, now: Optional[float] = None):
+        now = now if now is not None else time.time()
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.trips += 1
+            self.state = OPEN
+            self.open_until = now + self.backoff_seconds()
+
+    def release_probe(self):
+        """Give back a half-open breaker's trial slot without recording an outcome (call cancelled)"""
+        self._probe_in_flight = False
+
+    def backoff_seconds(self) -> float:
+        """How long the breaker stays open after its current number of trips"""
+        return min(self.base_backoff * 2 ** max(self.trips - 1, 0), self.max_backoff)
+
+    def snapshot(self) -> Dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "open_until": self.open_until
+        }
@@ -22,6 +22,10 @@ class Settings(BaseSettings):
     # OpenAI Configuration
     OPENAI_API_KEY: Optional[str] = None
     
+    # Text generation inference API (Hugging Face style); the token is optional
+    INFERENCE_API_URL: str = "https://api-inference.huggingface.co/models"
+    INFERENCE_API_TOKEN: Optional[str] = None
+    
     # News API Configuration
     NEWS_API_KEY: Optional[str] = None
     
@@ -65,6 +69,97 @@ class Settings(BaseSettings):
                 merged.append(origin)
         return merged
     
+    # Breaking news ingestion
+    # Fetch all feeds at once on one aiohttp session instead of one after another
+    BREAKING_NEWS_CONCURRENT_FETCH: bool = True
+    BREAKING_NEWS_FETCH_CONCURRENCY: int = 10
+    BREAKING_NEWS_FEED_TIMEOUT_SECONDS: float = 10.0
+    BREAKING_NEWS_RUN_DEADLINE_SECONDS: float = 30.0
+    # Staged ingestion pipeline: threads for parsing/classifying and the bound on each
+    # stage's input queue (feeds or enrichment jobs) before the stage upstream waits
+    BREAKING_NEWS_PARSE_WORKERS: int = 2
+    BREAKING_NEWS_PIPELINE_QUEUE_SIZE: int = 32
+    # Adaptive polling: the scheduler wakes every tick and polls only sources that are due.
+    # Each source's interval follows its publish rate, aiming for ITEMS_PER_POLL new items
+    BREAKING_NEWS_ADAPTIVE_POLLING: bool = True
+    BREAKING_NEWS_POLL_TICK_MINUTES: int = 5
+    BREAKING_NEWS_DEFAULT_POLL_MINUTES: float = 120.0
+    BREAKING_NEWS_MIN_POLL_MINUTES: float = 10.0
+    BREAKING_NEWS_MAX_POLL_MINUTES: float = 360.0
+    BREAKING_NEWS_ITEMS_PER_POLL: float = 3.0
+    # Per-source circuit breaker: opens after this many failures in a row, then backs off
+    # exponentially from BASE to MAX between trial polls
+    FEED_BREAKER_FAILURE_THRESHOLD: int = 3
+    FEED_BREAKER_BASE_BACKOFF_MINUTES: float = 15.0
+    FEED_BREAKER_MAX_BACKOFF_MINUTES: float = 1440.0
+    # Importance analysis of new breaking news: scored and committed BATCH_SIZE rows at a
+    # time; backlogs of at least PROCESS_MIN_ITEMS are spread over PROCESS_WORKERS processes
+    ANALYSIS_BATCH_SIZE: int = 500
+    ANALYSIS_PROCESS_WORKERS: int = 4
+    ANALYSIS_PROCESS_MIN_ITEMS: int = 2000
+    # Analyses keyed by a hash of normalized title + content and the analyzer version: an
+    # in-memory LRU of MAX_ENTRIES over a SQLite file (empty path keeps it in memory only)
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 5000
+    ANALYSIS_CACHE_PATH: str = "./analysis_cache.db"
+    ANALYSIS_CACHE_PERSISTENT_MAX_ENTRIES: int = 100000
+    # Breaking news importance scorer: "rules" (keywords) or "tfidf", a model trained from the
+    # stored analyses with `python -m app.ai.tfidf_scorer` (needs numpy; falls back to rules)
+    BREAKING_NEWS_SCORER: str = "rules"
+    TFIDF_MODEL_PATH: str = "./tfidf_model.npz"
+    # Rows analyzed by an older analyzer version are rescored in the background: every
+    # RESCORE_EVERY_MINUTES, at most RESCORE_MAX_ITEMS per run, in ANALYSIS_BATCH_SIZE chunks
+    ANALYSIS_RESCORE_EVERY_MINUTES: int = 30
+    ANALYSIS_RESCORE_MAX_ITEMS: int = 5000
+    # Retention: breaking news published more than RETENTION_DAYS ago is moved to
+    # breaking_news_archive every day at ARCHIVE_AT, ARCHIVE_BATCH_SIZE rows per transaction
+    BREAKING_NEWS_RETENTION_DAYS: float = 30.0
+    BREAKING_NEWS_ARCHIVE_BATCH_SIZE: int = 500
+    BREAKING_NEWS_ARCHIVE_AT: str = "03:00"
+    # Google News redirect links resolved to publisher URLs, once each (url_redirects table);
+    # links that could not be resolved are retried after RETRY_HOURS
+    URL_RESOLVE_CONCURRENCY: int = 5
+    URL_RESOLVE_TIMEOUT_SECONDS: float = 10.0
+    URL_RESOLVE_RETRY_HOURS: float = 24.0
+    # Article pages fetched for items whose feed description is too short
+    ARTICLE_ENRICH_WORKERS: int = 8
+    ARTICLE_ENRICH_PER_HOST: int = 2
+    ARTICLE_ENRICH_MAX_BYTES: int = 1_000_000
+    ARTICLE_ENRICH_TIMEOUT_SECONDS: float = 10.0
+    ARTICLE_ENRICH_RUN_DEADLINE_SECONDS: float = 60.0
+    # Extracted article text, keyed by canonical URL, in its own SQLite file
+    ARTICLE_CACHE_PATH: str = "./article_cache.db"
+    ARTICLE_CACHE_TTL_HOURS: float = 72.0
+    ARTICLE_CACHE_MAX_ENTRIES: int = 20000
+    # Near-duplicate story clustering: SimHash fingerprints split into LSH bands. Any two
+    # fingerprints within MAX_DISTANCE bits are found as long as BANDS > MAX_DISTANCE
+    STORY_CLUSTER_BANDS: int = 8
+    STORY_CLUSTER_MAX_DISTANCE: int = 6
+    STORY_CLUSTER_WINDOW_HOURS: float = 48.0
+
+    # Daily facts are generated ahead of time for the next PREGENERATE_DAYS days, in
+    # batches of BATCH_SIZE model calls, every EVERY_HOURS hours
+    FACT_PREGENERATE_DAYS: int = 7
+    FACT_PREGENERATE_BATCH_SIZE: int = 3
+    FACT_PREGENERATE_EVERY_HOURS: int = 6
+    # Inference client: per-attempt timeout, total budget per fact (retries and fallback
+    # model included), jittered retries and a per-model circuit breaker
+    INFERENCE_TIMEOUT_SECONDS: float = 8.0
+    INFERENCE_DEADLINE_SECONDS: float = 12.0
+    INFERENCE_MAX_RETRIES: int = 2
+    INFERENCE_RETRY_BASE_SECONDS: float = 0.5
+    INFERENCE_POOL_SIZE: int = 4
+    INFERENCE_KEEPALIVE_SECONDS: float = 30.0
+    INFERENCE_BREAKER_FAILURE_THRESHOLD: int = 3
+    INFERENCE_BREAKER_BASE_BACKOFF_SECONDS: float = 60.0
+    INFERENCE_BREAKER_MAX_BACKOFF_SECONDS: float = 1800.0
+    # Hot read endpoints (trending, latest news, daily stocks, daily fact) are cached in
+    # process until their data is written or TTL_SECONDS pass
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: float = 300.0
+    # Read endpoints send ETags (from the dataset versions above) and Cache-Control, and
+    # answer a matching If-None-Match with 304
+    HTTP_CACHE_ENABLED: bool = True
+
     # Security
     SECRET_KEY: str = "your-secret-key-here"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
@@ -0,0 +1,58 @@
+from typing import Callable, Optional
+import hashlib
+import time
+import uuid
+from fastapi import HTTPException, Request, Response
+from app.core.config import settings
+from app.core.response_cache import response_cache
+
+# Version counters are per process, so validators carry the process they came from; a
+# validator from another worker never matches and that request is answered in full
+BOOT_ID = uuid.uuid4().hex[:8]
+
+NO_STORE = "no-store"
+
+
+def dataset_etag(dataset: str, request: Request) -> str:
+    """Strong validator for a read of `dataset` at its current version.
+
+    It changes when the dataset is invalidated in this process, and at least every
+    RESPONSE_CACHE_TTL_SECONDS so writes made by other workers (which only bump their own
+    counters) and time-relative queries are picked up within the same bound as the
+    response cache.
+    """
+    window = int(time.time() // settings.RESPONSE_CACHE_TTL_SECONDS)
+    target = hashlib.sha1(f"{request.url.path}?{request.url.query}".encode("utf-8")).hexdigest()[:10]
+    return f'"{BOOT_ID}-{dataset}-{response_cache.version(dataset)}-{window}-{target}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # A weak form of our validator is the same validator for If-None-Match (weak comparison)
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def http_cache(dataset: Optional[str], max_age: int = 60, stale_while_revalidate: int = 300) -> Callable:
+    """Route dependency adding an ETag and Cache-Control to a read endpoint.
+
+    A request whose If-None-Match holds the current validator is answered with 304 before
+    the endpoint runs, so no query is made. Endpoints without a dataset (counters, stats,
+    random picks) are marked no-store.
+    """
+    cache_control = f"public, max-age={max_age}, stale-while-revalidate={stale_while_revalidate}"
+
+    def dependency(request: Request, response: Response):
+        if not settings.HTTP_CACHE_ENABLED:
+            return
+        if dataset is None:
+            response.headers["Cache-Control"] = NO_STORE
+            return
+        etag = dataset_etag(dataset, request)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = cache_control
+
+    return dependency
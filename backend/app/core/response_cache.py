@@ -0,0 +1,92 @@
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import threading
+import time
+from app.core.config import settings
+
+# Datasets cached responses are built from; writers invalidate the one they changed
+BREAKING_NEWS = "breaking_news"
+NEWS = "news"
+STOCKS = "stocks"
+FACTS = "facts"
+FEED_SOURCES = "feed_sources"
+
+
+class ResponseCache:
+    """In-process cache of read endpoint responses, grouped by the dataset they read.
+
+    Responses live until RESPONSE_CACHE_TTL_SECONDS pass or their dataset is invalidated,
+    whichever comes first. Ingestion, stock updates, fact generation and the write
+    endpoints invalidate what they change, so reads in between are served without the
+    database; the TTL bounds staleness from writes made by another worker process.
+    Every invalidation bumps the dataset's version counter.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, enabled: Optional[bool] = None):
+        self.ttl = ttl if ttl is not None else settings.RESPONSE_CACHE_TTL_SECONDS
+        self.enabled = enabled if enabled is not None else settings.RESPONSE_CACHE_ENABLED
+        self.versions: Dict[str, int] = {}
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        self._entries: Dict[Tuple[str, Hashable], Tuple[float, int, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_build(self, dataset: str, key: Hashable, build: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """The cached response for (dataset, key), building and storing it on a miss"""
+        version = self.version(dataset)
+        response = self.get(dataset, key)
+        if response is None:
+            response = build()
+            self.put(dataset, key, response, version, ttl)
+        return response
+
+    def get(self, dataset: str, key: Hashable) -> Optional[Any]:
+        """The cached response for (dataset, key), or None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get((dataset, key))
+            if entry is not None and entry[0] > time.monotonic() and entry[1] == self.versions.get(dataset, 0):
+                self.stats["hits"] += 1
+                return entry[2]
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, dataset: str, key: Hashable, response: Any, version: int, ttl: Optional[float] = None):
+        """Store a response built from the dataset at `version` (read before building it)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            # Not stored if the dataset was invalidated while the response was being built
+            if self.versions.get(dataset, 0) == version:
+                expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl)
+                self._entries[(dataset, key)] = (expires_at, version, response)
+
+    def invalidate(self, *datasets: str):
+        """Drop the cached responses of `datasets` and bump their versions"""
+        with self._lock:
+            for dataset in datasets:
+                self.versions[dataset] = self.versions.get(dataset, 0) + 1
+                self.stats["invalidations"] += 1
+            self._entries = {
+                entry_key: entry for entry_key, entry in self._entries.items()
+                if entry_key[0] not in datasets
+            }
+
+    def version(self, dataset: str) -> int:
+        with self._lock:
+            return self.versions.get(dataset, 0)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "versions": dict(self.versions),
+                "ttl_seconds": self.ttl,
+                "enabled": self.enabled
+            }
+
+
+# Shared by the API routes and the scheduler, which run in the same process
+response_cache = ResponseCache()
@@ -0,0 +1,31 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+import asyncio
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one in-flight call.
+
+    The first caller for a key starts the work as a task; callers arriving while it runs
+    await that same task instead of starting their own, and all of them get its result
+    (or its exception). A caller being cancelled does not cancel the shared work. Calls
+    are tracked per event loop, since the scheduler runs its jobs on loops of its own.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        flight_key = (asyncio.get_running_loop(), key)
+        task = self._calls.get(flight_key)
+        if task is None:
+            task = self._calls[flight_key] = asyncio.ensure_future(call())
+            task.add_done_callback(lambda _: self._calls.pop(flight_key, None))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
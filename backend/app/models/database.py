@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String, Text, create_engine, event
+from sqlalchemy import BigInteger, Boolean, Column, Date, DateTime, Float, Integer, String, Text, bindparam, create_engine, event, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -60,17 +60,102 @@ class BreakingNews(Base):
     title = Column(String, index=True)
     content = Column(Text)
     source = Column(String)  # google_news, linkedin, etc.
-    url = Column(String)
-    published_at = Column(DateTime, default=datetime.utcnow)
+    url = Column(String, unique=True, index=True)
+    simhash = Column(BigInteger)  # 64-bit title/content fingerprint, signed
+    cluster_key = Column(BigInteger, index=True)  # fingerprint of the story's first item
+    published_at = Column(DateTime, default=datetime.utcnow, index=True)  # NULL when the feed's date was unparseable
     category = Column(String)  # tech, ai, cs, companies, etc.
     importance_score = Column(Float, default=0.0)
     is_critical = Column(Boolean, default=False)  # For critical breaking news
     ai_analysis = Column(Text)  # AI analysis of the news
     sentiment = Column(String)  # positive, negative, neutral
     impact_level = Column(String)  # high, medium, low
+    analyzer_version = Column(String, index=True)  # analyzer that produced the analysis fields
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+# Breaking news older than the retention window, moved out of the hot table
+class BreakingNewsArchive(Base):
+    __tablename__ = "breaking_news_archive"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)  # id the row had in breaking_news
+    title = Column(String)
+    content = Column(Text)
+    source = Column(String, index=True)
+    url = Column(String, index=True)
+    simhash = Column(BigInteger)
+    cluster_key = Column(BigInteger)
+    published_at = Column(DateTime, index=True)
+    category = Column(String, index=True)
+    importance_score = Column(Float, default=0.0)
+    is_critical = Column(Boolean, default=False)
+    ai_analysis = Column(Text)
+    sentiment = Column(String)
+    impact_level = Column(String)
+    analyzer_version = Column(String)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+class FeedFetchState(Base):
+    __tablename__ = "feed_fetch_state"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    feed_url = Column(String, unique=True, index=True)  # full request URL, query string included
+    source = Column(String)
+    etag = Column(String)
+    last_modified = Column(String)
+    last_status = Column(Integer)
+    last_payload_bytes = Column(BigInteger, default=0)
+    last_process_seconds = Column(Float, default=0.0)
+    fetch_count = Column(Integer, default=0)
+    not_modified_count = Column(Integer, default=0)
+    bytes_downloaded = Column(BigInteger, default=0)
+    bytes_saved = Column(BigInteger, default=0)  # payload bytes not transferred thanks to 304s
+    process_seconds_saved = Column(Float, default=0.0)  # parse/store time skipped thanks to 304s
+    last_fetched_at = Column(DateTime)
+    unparseable_dates = Column(Integer, default=0)  # items stored with the fetch time instead
+    # Adaptive polling: interval learned from the feed's publish rate
+    publish_interval_seconds = Column(Float)  # median gap between the feed's items
+    poll_interval_seconds = Column(Float)
+    next_poll_at = Column(DateTime)
+    # Circuit breaker
+    breaker_state = Column(String, default="closed")  # closed, open, half_open
+    consecutive_failures = Column(Integer, default=0)
+    breaker_trips = Column(Integer, default=0)
+    breaker_open_until = Column(DateTime)
+    last_error = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class FeedSource(Base):
+    __tablename__ = "feed_sources"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True)  # display name, e.g. "TechCrunch"
+    source = Column(String, index=True)  # value stored in BreakingNews.source, e.g. "techcrunch.com"
+    url = Column(String, nullable=False)
+    params = Column(Text)  # JSON object of query parameters, if any
+    parser = Column(String, default="rss")  # rss, google_news
+    item_limit = Column(Integer, default=15)
+    require_breaking = Column(Boolean, default=False)
+    poll_interval_minutes = Column(Float)  # fixed interval; adaptive when empty
+    enabled = Column(Boolean, default=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class UrlRedirect(Base):
+    __tablename__ = "url_redirects"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    redirect_url = Column(String, unique=True, index=True)  # e.g. a news.google.com/rss/articles/... link
+    canonical_url = Column(String)  # publisher URL; empty until resolved
+    method = Column(String)  # decoded, redirect, page
+    attempts = Column(Integer, default=0)
+    last_attempt_at = Column(DateTime)
+    resolved_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 class Fact(Base):
     __tablename__ = "facts"
     
@@ -78,6 +163,7 @@ class Fact(Base):
     fact_text = Column(Text)
     category = Column(String)  # cs, ai, tech, companies
     source = Column(String, default="AI Generated")
+    fact_date = Column(Date, unique=True, index=True)  # day it is the daily fact; may be generated days ahead
     created_at = Column(DateTime, default=datetime.utcnow)
     is_active = Column(Boolean, default=True)
 
@@ -107,8 +193,146 @@ class User(Base):
 
 
 
+def _ensure_breaking_news_url_index(connection):
+    """Tables created before the URL became unique lack the index create_all() would add.
+
+    The index is only built here when no URL is stored twice. Otherwise the duplicates are
+    reported and left alone until merge_duplicate_breaking_news_urls is run on purpose;
+    until then ingestion inserts without ON CONFLICT (see BreakingNewsService).
+    """
+    indexes = {index["name"] for index in inspect(connection).get_indexes("breaking_news")}
+    if "ix_breaking_news_url" in indexes:
+        return
+    duplicates = connection.execute(text(_DUPLICATE_URL_COUNT)).scalar()
+    if duplicates:
+        print(
+            f"breaking_news has {duplicates} rows whose URL is stored more than once, so the unique URL "
+            "index was not created; ingestion still works, relying on its URL lookups. Run "
+            "`python -m app.models.database --merge-duplicate-urls` to move them to breaking_news_archive "
+            "and create it."
+        )
+        return
+    connection.execute(text("CREATE UNIQUE INDEX ix_breaking_news_url ON breaking_news (url)"))
+
+
+# Rows of breaking_news that repeat an older row's URL
+_DUPLICATE_URL_IDS = (
+    "SELECT id FROM breaking_news WHERE url IS NOT NULL AND id NOT IN "
+    "(SELECT MIN(id) FROM breaking_news WHERE url IS NOT NULL GROUP BY url)"
+)
+_DUPLICATE_URL_COUNT = f"SELECT COUNT(*) FROM ({_DUPLICATE_URL_IDS}) AS duplicates"
+
+
+def merge_duplicate_breaking_news_urls(connection) -> int:
+    """One-time migration: move every later copy of a URL to breaking_news_archive.
+
+    The oldest row of each URL stays in breaking_news; the others are copied to the archive
+    (keeping their ids) and then deleted, and the unique URL index is created. Returns
+    how many rows were moved.
+    """
+    columns = ", ".join(column.name for column in BreakingNews.__table__.columns)
+    duplicate_ids = [row_id for (row_id,) in connection.execute(text(_DUPLICATE_URL_IDS))]
+    moved = 0
+    for start in range(0, len(duplicate_ids), 500):
+        batch = duplicate_ids[start:start + 500]
+        connection.execute(
+            text(
+                f"INSERT INTO breaking_news_archive ({columns}, archived_at) "
+                f"SELECT {columns}, :archived_at FROM breaking_news "
+                "WHERE id IN :ids AND id NOT IN (SELECT id FROM breaking_news_archive)"
+            ).bindparams(bindparam("ids", expanding=True)),
+            {"ids": batch, "archived_at": datetime.utcnow()}
+        )
+        # Only delete rows whose copy is in the archive
+        moved += connection.execute(
+            text(
+                "DELETE FROM breaking_news WHERE id IN :ids AND EXISTS (SELECT 1 FROM breaking_news_archive "
+                "WHERE breaking_news_archive.id = breaking_news.id AND breaking_news_archive.url = breaking_news.url)"
+            ).bindparams(bindparam("ids", expanding=True)),
+            {"ids": batch}
+        ).rowcount
+    remaining = connection.execute(text(_DUPLICATE_URL_COUNT)).scalar()
+    if remaining:
+        raise RuntimeError(f"{remaining} duplicate-URL rows could not be archived (their ids are already taken in breaking_news_archive)")
+    indexes = {index["name"] for index in inspect(connection).get_indexes("breaking_news")}
+    if "ix_breaking_news_url" not in indexes:
+        connection.execute(text("CREATE UNIQUE INDEX ix_breaking_news_url ON breaking_news (url)"))
+    return moved
+
+
+def _add_missing_columns(connection, table: str, columns: dict):
+    """ALTER TABLE ... ADD COLUMN for each of `columns` (name -> SQL type) the table lacks."""
+    existing = {column["name"] for column in inspect(connection).get_columns(table)}
+    for name, column_type in columns.items():
+        if name not in existing:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}"))
+
+
+def _ensure_breaking_news_cluster_columns(connection):
+    """Add the story clustering columns; existing rows are fingerprinted by the ingester."""
+    _add_missing_columns(connection, "breaking_news", {"simhash": "BIGINT", "cluster_key": "BIGINT"})
+    indexes = {index["name"] for index in inspect(connection).get_indexes("breaking_news")}
+    if "ix_breaking_news_cluster_key" not in indexes:
+        connection.execute(text("CREATE INDEX ix_breaking_news_cluster_key ON breaking_news (cluster_key)"))
+
+
+def _ensure_breaking_news_published_index(connection):
+    """The hot feed queries filter on published_at; older tables have no index for it."""
+    indexes = {index["name"] for index in inspect(connection).get_indexes("breaking_news")}
+    if "ix_breaking_news_published_at" not in indexes:
+        connection.execute(text("CREATE INDEX ix_breaking_news_published_at ON breaking_news (published_at)"))
+
+
+def _ensure_analyzer_version_columns(connection):
+    """Analyses are stamped with the analyzer version; older ones have none and count as stale."""
+    _add_missing_columns(connection, "breaking_news", {"analyzer_version": "VARCHAR"})
+    _add_missing_columns(connection, "breaking_news_archive", {"analyzer_version": "VARCHAR"})
+    indexes = {index["name"] for index in inspect(connection).get_indexes("breaking_news")}
+    if "ix_breaking_news_analyzer_version" not in indexes:
+        connection.execute(text("CREATE INDEX ix_breaking_news_analyzer_version ON breaking_news (analyzer_version)"))
+
+
+def _ensure_fact_date_column(connection):
+    """Daily facts are looked up by fact_date, one per day; older facts keep it empty."""
+    _add_missing_columns(connection, "facts", {"fact_date": "DATE"})
+    indexes = {index["name"]: index for index in inspect(connection).get_indexes("facts")}
+    if indexes.get("ix_facts_fact_date", {}).get("unique"):
+        return
+    if "ix_facts_fact_date" in indexes:
+        connection.execute(text("DROP INDEX ix_facts_fact_date"))
+    # Only the oldest active fact of a day keeps its date so the unique index can be built
+    connection.execute(text("UPDATE facts SET fact_date = NULL WHERE is_active = false AND fact_date IS NOT NULL"))
+    connection.execute(text(
+        "UPDATE facts SET fact_date = NULL WHERE fact_date IS NOT NULL AND id NOT IN "
+        "(SELECT MIN(id) FROM facts WHERE fact_date IS NOT NULL GROUP BY fact_date)"
+    ))
+    connection.execute(text("CREATE UNIQUE INDEX ix_facts_fact_date ON facts (fact_date)"))
+
+
+def run_migrations():
+    """Apply schema changes that create_all() cannot make to existing tables."""
+    with engine.begin() as connection:
+        _ensure_breaking_news_url_index(connection)
+        _ensure_breaking_news_cluster_columns(connection)
+        _ensure_breaking_news_published_index(connection)
+        _ensure_analyzer_version_columns(connection)
+        _ensure_fact_date_column(connection)
+        _add_missing_columns(connection, "feed_fetch_state", {
+            "publish_interval_seconds": "FLOAT",
+            "poll_interval_seconds": "FLOAT",
+            "next_poll_at": "TIMESTAMP",
+            "breaker_state": "VARCHAR DEFAULT 'closed'",
+            "consecutive_failures": "INTEGER DEFAULT 0",
+            "breaker_trips": "INTEGER DEFAULT 0",
+            "breaker_open_until": "TIMESTAMP",
+            "last_error": "VARCHAR",
+            "unparseable_dates": "INTEGER DEFAULT 0",
+        })
+
+
 # Create tables
 Base.metadata.create_all(bind=engine)
+run_migrations()
 
 # Dependency to get database session
 def get_db():
@@ -116,4 +340,19 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="One-time database migrations")
+    parser.add_argument("--merge-duplicate-urls", action="store_true", help="move duplicate-URL breaking news to the archive and make the URL unique")
+    args = parser.parse_args()
+
+    if args.merge_duplicate_urls:
+        with engine.begin() as connection:
+            moved = merge_duplicate_breaking_news_urls(connection)
+        print(f"Moved {moved} duplicate-URL rows from breaking_news to breaking_news_archive; ix_breaking_news_url is in place")
+    else:
+        parser.print_help()
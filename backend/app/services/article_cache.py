@@ -0,0 +1,116 @@
+from typing import Dict, Optional
+from datetime import datetime
+import sqlite3
+import threading
+import time
+from app.core.config import settings
+from app.services.url_canonicalizer import canonicalize_url
+
+
+class ArticleCache:
+    """On-disk cache of extracted article text with a TTL and LRU eviction.
+
+    Backed by its own SQLite file (not the app database) so lookups never compete with
+    ingestion writes and the cache can be deleted at any time. Empty extractions are
+    cached too, so pages without usable text are not refetched either.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self.path = path or settings.ARTICLE_CACHE_PATH
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.ARTICLE_CACHE_TTL_HOURS * 3600
+        self.max_entries = max_entries or settings.ARTICLE_CACHE_MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._approx_entries: Optional[int] = None
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[str]:
+        """Cached article text for a URL, or None on a miss"""
+        key = canonicalize_url(url)
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute("SELECT content, stored_at FROM articles WHERE url = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            content, stored_at = row
+            if now - stored_at > self.ttl_seconds:
+                connection.execute("DELETE FROM articles WHERE url = ?", (key,))
+                connection.commit()
+                self.expired += 1
+                self.misses += 1
+                return None
+            connection.execute("UPDATE articles SET last_access = ? WHERE url = ?", (now, key))
+            connection.commit()
+            self.hits += 1
+            return content
+
+    def put(self, url: str, content: str):
+        """Store extracted article text, evicting least recently used entries when full"""
+        key = canonicalize_url(url)
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO articles (url, content, stored_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, content, now, now)
+            )
+            # Replacing an existing key is also counted, so this only ever overestimates
+            # the size; the real row count is taken once it crosses the limit
+            self._approx_entries += 1
+            if self._approx_entries > self.max_entries:
+                self._evict(connection)
+            connection.commit()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters since startup plus the current cache size"""
+        with self._lock:
+            entries = self._connect().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_hours": round(self.ttl_seconds / 3600, 2),
+            "path": self.path,
+            "checked_at": datetime.utcnow()
+        }
+
+    def _evict(self, connection: sqlite3.Connection):
+        cutoff = time.time() - self.ttl_seconds
+        expired = connection.execute("DELETE FROM articles WHERE stored_at < ?", (cutoff,)).rowcount
+        self.expired += expired
+        # Trim to 90% so a full cache does not have to evict again on the very next write
+        overflow = connection.execute("SELECT COUNT(*) FROM articles").fetchone()[0] - int(self.max_entries * 0.9)
+        if overflow > 0:
+            connection.execute(
+                "DELETE FROM articles WHERE url IN (SELECT url FROM articles ORDER BY last_access LIMIT ?)",
+                (overflow,)
+            )
+            self.evictions += overflow
+        self._approx_entries = connection.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                "url TEXT PRIMARY KEY, content TEXT NOT NULL, stored_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS ix_articles_last_access ON articles (last_access)")
+            self._connection.commit()
+            self._approx_entries = self._connection.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        return self._connection
+
+
+# Shared by the scheduler's enrichment workers and the stats endpoint
+article_cache = ArticleCache()
@@ -0,0 +1,158 @@
+from typing import Callable, Dict, List, Optional
+import asyncio
+import aiohttp
+from bs4 import BeautifulSoup
+from app.core.config import settings
+from app.services.article_cache import ArticleCache
+
+
+def extract_article_text(page: bytes, max_length: int = 800) -> str:
+    """Pull the first paragraphs of readable text out of an article page"""
+    soup = BeautifulSoup(page, 'html.parser')
+
+    # Remove script and style elements
+    for script in soup(["script", "style", "nav", "header", "footer", "aside"]):
+        script.decompose()
+
+    # Try to find main content in common article tags
+    article = soup.find('article') or soup.find('main') or soup.find('div', class_=lambda x: x and ('article' in x.lower() or 'content' in x.lower() or 'post' in x.lower()))
+
+    if article:
+        # Get all paragraph text
+        paragraphs = article.find_all('p')
+        if paragraphs:
+            content = ' '.join([p.get_text(strip=True) for p in paragraphs[:5] if p.get_text(strip=True)])
+            if len(content) > 100:
+                return content[:max_length] + '...' if len(content) > max_length else content
+
+    # Fallback: get all paragraph text from body
+    paragraphs = soup.find_all('p')
+    if paragraphs:
+        content = ' '.join([p.get_text(strip=True) for p in paragraphs[:5] if p.get_text(strip=True) and len(p.get_text(strip=True)) > 50])
+        if len(content) > 100:
+            return content[:max_length] + '...' if len(content) > max_length else content
+
+    return ""
+
+
+class EnrichmentPool:
+    """A running set of enrichment workers; submit jobs while other ingestion work continues.
+
+    Each job is a dict with the stored item's id and url. `on_result(job, content)` is called
+    from the event loop as soon as a worker has extracted at least 100 characters of text.
+    """
+
+    def __init__(self, enricher: "ArticleEnricher", on_result: Callable[[Dict, str], None], start_workers: bool = True):
+        self.enricher = enricher
+        self.on_result = on_result
+        self.start_workers = start_workers
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.workers: List[asyncio.Task] = []
+        self.stats = {"submitted": 0, "enriched": 0, "failed": 0, "too_short": 0, "cache_hits": 0, "expired": 0}
+
+    async def __aenter__(self) -> "EnrichmentPool":
+        connector = aiohttp.TCPConnector(limit=self.enricher.workers, limit_per_host=self.enricher.per_host)
+        timeout = aiohttp.ClientTimeout(total=self.enricher.timeout)
+        self.session = aiohttp.ClientSession(headers=self.enricher.headers, timeout=timeout, connector=connector)
+        if self.start_workers:
+            self.workers = [asyncio.create_task(self._worker()) for _ in range(self.enricher.workers)]
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        for _ in self.workers:
+            self.queue.put_nowait(None)
+        try:
+            await asyncio.wait_for(asyncio.gather(*self.workers), timeout=self.enricher.run_deadline)
+        except asyncio.TimeoutError:
+            print(f"Article enrichment stopped at {self.enricher.run_deadline}s deadline; {self.queue.qsize()} jobs left unfetched")
+        finally:
+            for worker in self.workers:
+                worker.cancel()
+            await asyncio.gather(*self.workers, return_exceptions=True)
+            await self.session.close()
+
+    def submit(self, job: Dict):
+        self.stats["submitted"] += 1
+        self.queue.put_nowait(job)
+
+    async def enrich_one(self, job: Dict):
+        """Fill in one job's article text now (what each worker does per queued job)"""
+        try:
+            cache = self.enricher.cache
+            content = cache.get(job["url"]) if cache else None
+            if content is not None:
+                self.stats["cache_hits"] += 1
+            else:
+                page = await self.enricher.fetch_page(self.session, job["url"])
+                content = await asyncio.get_running_loop().run_in_executor(None, extract_article_text, page) if page else ""
+                if cache:
+                    cache.put(job["url"], content)
+            if len(content) > 100:
+                self.on_result(job, content)
+                self.stats["enriched"] += 1
+            else:
+                self.stats["too_short"] += 1
+        except Exception as e:
+            self.stats["failed"] += 1
+            print(f"Error fetching article content from {job['url']}: {e}")
+
+    async def _worker(self):
+        while True:
+            job = await self.queue.get()
+            if job is None:
+                return
+            await self.enrich_one(job)
+
+
+class ArticleEnricher:
+    """Fills in article text for items whose feed description is too short, off the ingest path"""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        per_host: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        timeout: Optional[float] = None,
+        run_deadline: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+        cache: Optional[ArticleCache] = None
+    ):
+        self.workers = workers or settings.ARTICLE_ENRICH_WORKERS
+        self.per_host = per_host or settings.ARTICLE_ENRICH_PER_HOST
+        self.max_bytes = max_bytes or settings.ARTICLE_ENRICH_MAX_BYTES
+        self.timeout = timeout or settings.ARTICLE_ENRICH_TIMEOUT_SECONDS
+        self.run_deadline = run_deadline or settings.ARTICLE_ENRICH_RUN_DEADLINE_SECONDS
+        self.headers = headers or {}
+        self.cache = cache
+
+    def pool(self, on_result: Callable[[Dict, str], None], start_workers: bool = True) -> EnrichmentPool:
+        """Start workers with `async with enricher.pool(on_result) as pool: pool.submit(job)`.
+
+        Without workers the pool only provides the session, for callers that schedule
+        `enrich_one` themselves.
+        """
+        return EnrichmentPool(self, on_result, start_workers)
+
+    async def enrich(self, jobs: List[Dict], on_result: Callable[[Dict, str], None]) -> Dict[str, int]:
+        """Enrich a fixed list of jobs and wait for all of them"""
+        async with self.pool(on_result) as pool:
+            for job in jobs:
+                pool.submit(job)
+        return pool.stats
+
+    async def fetch_page(self, session: aiohttp.ClientSession, url: str) -> bytes:
+        """Download an HTML page, stopping after max_bytes (article text sits near the top)"""
+        async with session.get(url, allow_redirects=True) as response:
+            response.raise_for_status()
+            if "html" not in response.headers.get("Content-Type", "text/html"):
+                return b""
+
+            chunks = []
+            size = 0
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                chunks.append(chunk[: self.max_bytes - size])
+                size += len(chunks[-1])
+                if size >= self.max_bytes:
+                    break
+            return b"".join(chunks)
@@ -1,27 +1,45 @@
+from sqlalchemy import func, insert, inspect
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
-import requests
 import json
-from bs4 import BeautifulSoup
 import asyncio
 import aiohttp
 import re
-from app.models.database import BreakingNews
+import time
+from app.ai.keyword_matcher import CATEGORY_ORDER, KeywordSignals, keyword_matcher
+from app.models.database import BreakingNews, BreakingNewsArchive
 from app.core.config import settings
+from app.core.response_cache import BREAKING_NEWS, response_cache
+from app.services.article_cache import article_cache
+from app.services.article_enricher import ArticleEnricher
+from app.services.date_parser import FeedDateParser
+from app.services.feed_cache import FeedValidatorStore
+from app.services.feed_parser import clean_description, parse_feed_items
+from app.services.feed_polling import FeedPollScheduler
+from app.services.feed_sources import FeedSourceRegistry
+from app.services.pipeline import Pipeline, Stage, in_executor
+from app.services.story_clusters import StoryClusterIndex, simhash
+from app.services.url_canonicalizer import RedirectResolver, canonicalize_url, is_google_news_redirect
 
 class BreakingNewsService:
     def __init__(self):
-        self.google_news_url = "https://news.google.com/rss/search"
-        self.wired_rss_url = "https://www.wired.com/feed/rss"
-        self.techcrunch_rss_url = "https://techcrunch.com/feed/"
-        self.theverge_rss_url = "https://www.theverge.com/rss/index.xml"
-        self.arstechnica_rss_url = "https://feeds.arstechnica.com/arstechnica/index"
-        self.engadget_rss_url = "https://www.engadget.com/rss.xml"
-        self.mit_tech_review_rss_url = "https://www.technologyreview.com/feed/"
-        self.cnet_rss_url = "https://www.cnet.com/rss/news/"
-        self.venturebeat_rss_url = "https://venturebeat.com/feed/"
-        self.techrepublic_rss_url = "https://www.techrepublic.com/rssfeeds/articles/"
+        self.request_headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+        # Feeds to ingest live in the feed_sources table
+        self.feed_registry = FeedSourceRegistry()
+        self.feed_validators = FeedValidatorStore()
+        self.date_parser = FeedDateParser()
+        self.poll_scheduler = FeedPollScheduler()
+        self.article_enricher = ArticleEnricher(headers=self.request_headers, cache=article_cache)
+        self.story_clusters = StoryClusterIndex()
+        self.url_resolver = RedirectResolver(headers=self.request_headers)
+        self.last_pipeline_stats: Optional[Dict] = None
+        # Whether breaking_news.url has its unique index (absent while duplicates await merging)
+        self._url_index_ready = False
         self.tech_keywords = [
             "artificial intelligence", "AI", "machine learning", "ML",
             "tech company", "startup", "venture capital", "IPO",
@@ -32,9 +50,9 @@ class BreakingNewsService:
         ]
         
     def get_breaking_news(self, db: Session, limit: int = 10) -> List[Dict]:
-        """Get breaking news items"""
+        """Get breaking news items, newest first (items without a publish date last)"""
         news_items = db.query(BreakingNews).order_by(
-            BreakingNews.published_at.desc()
+            BreakingNews.published_at.desc().nulls_last()
         ).limit(limit).all()
         
         return [
@@ -56,7 +74,7 @@ class BreakingNewsService:
         ]
     
     def get_latest_breaking_news(self, db: Session, hours: int = 24) -> List[Dict]:
-        """Get breaking news from the last N hours"""
+        """Get breaking news from the last N hours (items without a publish date are left out)"""
         time_threshold = datetime.utcnow() - timedelta(hours=hours)
         
         news_items = db.query(BreakingNews).filter(
@@ -78,145 +96,27 @@ class BreakingNewsService:
             for item in news_items
         ]
     
-    async def fetch_google_news(self, db: Session) -> List[Dict]:
-        """Fetch breaking news from Google News RSS - filtered for tech news"""
-        try:
-            # Use Google News RSS feed for tech news, prioritize Wired.com
-            params = {
-                'q': '(technology OR "artificial intelligence" OR "machine learning" OR "tech company") (site:wired.com OR "wired")',
-                'hl': 'en-US',
-                'gl': 'US',
-                'ceid': 'US:en'
-            }
-            
-            response = requests.get(self.google_news_url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'xml')
-            items = soup.find_all('item')
-            
-            fetched_news = []
-            
-            for item in items[:15]:  # Limit to 15 items
-                title_elem = item.find('title')
-                link_elem = item.find('link')
-                pub_date_elem = item.find('pubDate')
-                description_elem = item.find('description')
-                
-                # Extract and clean text
-                raw_title = title_elem.get_text(strip=True) if title_elem else ""
-                # Clean common source suffixes from titles (e.g. " - WIRED", " - Wired")
-                title = self._clean_title(raw_title)
-                link = link_elem.get_text(strip=True) if link_elem else ""
-                pub_date = pub_date_elem.get_text(strip=True) if pub_date_elem else ""
-                
-                # Clean description - remove HTML tags and get meaningful content
-                if description_elem:
-                    # Get the raw HTML first
-                    desc_html = str(description_elem)
-                    desc_soup = BeautifulSoup(desc_html, 'html.parser')
-                    
-                    # Remove all script and style elements
-                    for script in desc_soup(["script", "style", "a"]):
-                        script.decompose()
-                    
-                    # Try to extract meaningful content
-                    # First, try to get text from paragraph tags
-                    paragraphs = desc_soup.find_all('p')
-                    if paragraphs:
-                        description = ' '.join([p.get_text(strip=True) for p in paragraphs[:3] if p.get_text(strip=True)])
-                    else:
-                        # If no paragraphs, get all text
-                        description = desc_soup.get_text(separator=' ', strip=True)
-                    
-                    # Clean up the description
-                    description = description.replace('&nbsp;', ' ').replace('&amp;', '&')
-                    description = description.replace('&lt;', '<').replace('&gt;', '>')
-                    description = description.replace('&quot;', '"').replace('&#39;', "'")
-                    # Remove extra whitespace
-                    description = ' '.join(description.split())
-                    
-                    # If description is same as title or too short, try to fetch from article
-                    if description.lower().strip() == title.lower().strip() or len(description) < 100:
-                        # Try to fetch article content
-                        try:
-                            article_content = self._fetch_article_content(link)
-                            if article_content and len(article_content) > 100:
-                                description = article_content
-                        except Exception as e:
-                            print(f"Could not fetch article content: {e}")
-                            # Use a more descriptive fallback
-                            description = f"This article covers {title.lower()}. Click 'Read Full Story' to view the complete article."
-                else:
-                    description = f"This article covers {title.lower()}. Click 'Read Full Story' to view the complete article."
-                
-                # Check if this is breaking news based on keywords
-                if self._is_breaking_news(title, description):
-                    # Check if already exists
-                    existing = db.query(BreakingNews).filter(
-                        BreakingNews.url == link
-                    ).first()
-                    
-                    if not existing:
-                        news_item = BreakingNews(
-                            title=title,
-                            content=description,
-                            source="google_news",
-                            url=link,
-                            category=self._categorize_news(title, description),
-                            published_at=self._parse_date(pub_date)
-                        )
-                        
-                        db.add(news_item)
-                        fetched_news.append({
-                            "title": title,
-                            "content": description,
-                            "source": "google_news",
-                            "url": link
-                        })
-            
-            db.commit()
-            return fetched_news
-            
-        except Exception as e:
-            print(f"Error fetching Google News: {e}")
-            return []
-    
-    async def fetch_wired_news(self, db: Session) -> List[Dict]:
-        """Fetch news from Wired.com RSS feed"""
-        return await self._fetch_rss_feed(self.wired_rss_url, "wired.com", db, limit=15, require_breaking=False)
-    
-    async def fetch_techcrunch_news(self, db: Session) -> List[Dict]:
-        """Fetch news from TechCrunch RSS feed"""
-        return await self._fetch_rss_feed(self.techcrunch_rss_url, "techcrunch.com", db, limit=15, require_breaking=False)
-    
-    async def fetch_theverge_news(self, db: Session) -> List[Dict]:
-        """Fetch news from The Verge RSS feed"""
-        return await self._fetch_rss_feed(self.theverge_rss_url, "theverge.com", db, limit=15, require_breaking=False)
-    
-    async def fetch_arstechnica_news(self, db: Session) -> List[Dict]:
-        """Fetch news from Ars Technica RSS feed"""
-        return await self._fetch_rss_feed(self.arstechnica_rss_url, "arstechnica.com", db, limit=15, require_breaking=False)
+    async def fetch_source(self, db: Session, key: str, session: Optional[aiohttp.ClientSession] = None, due_only: bool = False) -> List[Dict]:
+        """Fetch one configured source now, by display name or source label"""
+        source = self.feed_registry.get_source(db, key)
+        if source is None:
+            raise ValueError(f"Unknown feed source '{key}'")
+        return await self._fetch_feed(source, db, session, due_only=due_only) or []
     
-    async def fetch_engadget_news(self, db: Session) -> List[Dict]:
-        """Fetch news from Engadget RSS feed"""
-        return await self._fetch_rss_feed(self.engadget_rss_url, "engadget.com", db, limit=15, require_breaking=False)
-    
-    async def fetch_mit_tech_review_news(self, db: Session) -> List[Dict]:
-        """Fetch news from MIT Technology Review RSS feed"""
-        return await self._fetch_rss_feed(self.mit_tech_review_rss_url, "technologyreview.com", db, limit=15, require_breaking=False)
-    
-    async def fetch_cnet_news(self, db: Session) -> List[Dict]:
-        """Fetch news from CNET RSS feed"""
-        return await self._fetch_rss_feed(self.cnet_rss_url, "cnet.com", db, limit=15, require_breaking=False)
-    
-    async def fetch_venturebeat_news(self, db: Session) -> List[Dict]:
-        """Fetch news from VentureBeat RSS feed"""
-        return await self._fetch_rss_feed(self.venturebeat_rss_url, "venturebeat.com", db, limit=15, require_breaking=False)
-    
-    async def fetch_techrepublic_news(self, db: Session) -> List[Dict]:
-        """Fetch news from TechRepublic RSS feed"""
-        return await self._fetch_rss_feed(self.techrepublic_rss_url, "techrepublic.com", db, limit=15, require_breaking=False)
+    async def fetch_sources_sequentially(self, db: Session, due_only: bool = False) -> Dict[str, List[Dict]]:
+        """Fetch the feeds one after another on one aiohttp session (BREAKING_NEWS_CONCURRENT_FETCH off).
+
+        Feeds are skipped the same way as in `fetch_all_sources`; only polled feeds appear
+        in the result.
+        """
+        results = {}
+        timeout = aiohttp.ClientTimeout(total=settings.BREAKING_NEWS_FEED_TIMEOUT_SECONDS)
+        async with aiohttp.ClientSession(headers=self.request_headers, timeout=timeout) as session:
+            for source in self.feed_registry.get_sources(db):
+                news_items = await self._fetch_feed(source, db, session, due_only=due_only)
+                if news_items is not None:
+                    results[source["name"]] = news_items
+        return results
     
     def _clean_title(self, title: str) -> str:
         """Remove common source suffixes from article titles."""
@@ -254,107 +154,441 @@ class BreakingNewsService:
         
         return cleaned
     
-    async def _fetch_rss_feed(self, rss_url: str, source_name: str, db: Session, limit: int = 15, require_breaking: bool = False) -> List[Dict]:
-        """Generic helper method to fetch and process RSS feeds"""
+    async def _fetch_feed(
+        self,
+        source: Dict,
+        db: Session,
+        session: Optional[aiohttp.ClientSession] = None,
+        due_only: bool = False
+    ) -> Optional[List[Dict]]:
+        """Fetch one feed with a conditional GET; a 304 skips parsing entirely.
+
+        Returns None without fetching when the feed's circuit breaker is open or, with
+        `due_only`, its poll interval has not elapsed yet.
+        """
+        feed_key = self.feed_validators.feed_key(source["url"], source["params"])
+        if not self.poll_scheduler.due_sources(db, [source], [feed_key], ignore_schedule=not due_only):
+            print(f"{source['name']} feed not due or its circuit breaker is open; skipped")
+            return None
+        if session is None:
+            timeout = aiohttp.ClientTimeout(total=settings.BREAKING_NEWS_FEED_TIMEOUT_SECONDS)
+            async with aiohttp.ClientSession(headers=self.request_headers, timeout=timeout) as own_session:
+                return await self._poll_feed(source, feed_key, db, own_session)
+        return await self._poll_feed(source, feed_key, db, session)
+    
+    async def _poll_feed(self, source: Dict, feed_key: str, db: Session, session: aiohttp.ClientSession) -> List[Dict]:
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(rss_url, headers=headers, timeout=10)
-            response.raise_for_status()
+            conditional_headers = self.feed_validators.conditional_headers(db, feed_key)
+            status, content, response_headers = await self._download_feed(session, source, conditional_headers)
             
-            soup = BeautifulSoup(response.content, 'xml')
-            items = soup.find_all('item')
+            if status == 304:
+                self.feed_validators.record_not_modified(db, feed_key, source["source"])
+                self.poll_scheduler.record_success(db, feed_key, source["source"], not_modified=True, fixed_interval_minutes=source["poll_interval_minutes"])
+                print(f"{source['name']} feed not modified since last poll; skipped parsing")
+                return []
             
-            fetched_news = []
+            enrichment_jobs = []
+            news_items = await self._ingest_payload(source, feed_key, content, response_headers, db, enrichment_jobs)
+        except Exception as e:
+            db.rollback()
+            self.poll_scheduler.record_failure(db, feed_key, source["source"], str(e) or type(e).__name__)
+            print(f"Error fetching {source['name']} news: {e}")
+            return []
+        
+        if enrichment_jobs:
+            await self.article_enricher.enrich(enrichment_jobs, lambda job, content: self._store_article_content(db, job, content))
+        return news_items
+    
+    async def _ingest_payload(
+        self,
+        source: Dict,
+        feed_key: str,
+        content: bytes,
+        response_headers,
+        db: Session,
+        enrichment_jobs: Optional[List[Dict]] = None
+    ) -> List[Dict]:
+        """Process a full feed response, then remember its validators and publish rate for the next poll"""
+        started = time.perf_counter()
+        publish_times = []
+        news_items = await self._process_feed_source(source, content, db, enrichment_jobs, publish_times)
+        self._record_fetched(db, source, feed_key, content, response_headers, publish_times, time.perf_counter() - started)
+        return news_items
+    
+    def _record_fetched(
+        self,
+        db: Session,
+        source: Dict,
+        feed_key: str,
+        content: bytes,
+        response_headers,
+        publish_times: List[datetime],
+        process_seconds: float
+    ):
+        self.feed_validators.record_fetched(
+            db,
+            feed_key,
+            source["source"],
+            etag=response_headers.get("ETag"),
+            last_modified=response_headers.get("Last-Modified"),
+            payload_bytes=len(content),
+            process_seconds=process_seconds,
+            unparseable_dates=self.date_parser.take_unparseable(source["source"])
+        )
+        self.poll_scheduler.record_success(db, feed_key, source["source"], publish_times, fixed_interval_minutes=source["poll_interval_minutes"])
+    
+    def _parse_payload(self, source: Dict, content: bytes, publish_times: Optional[List[datetime]] = None) -> List[Dict]:
+        """Parse up to the source's limit of items and their publish dates (no database access)"""
+        items = parse_feed_items(content, limit=source["limit"])
+        self._parse_item_dates(items, source["source"], publish_times)
+        return items
+    
+    async def _canonicalize_links(self, db: Session, items: List[Dict], session: Optional[aiohttp.ClientSession] = None) -> List[Dict]:
+        """Replace each item's link with its canonical URL, resolving Google News redirects.
+
+        Dedupe, clustering and the article cache all key on the stored URL, so the same
+        article reached through a redirect or with tracking parameters is stored once.
+        """
+        for item in items:
+            item["link"] = canonicalize_url(item["link"])
+        redirects = [item["link"] for item in items if is_google_news_redirect(item["link"])]
+        if redirects:
+            resolved = await self.url_resolver.resolve(db, redirects, session)
+            for item in items:
+                item["link"] = resolved.get(item["link"], item["link"])
+        return items
+    
+    def _drop_known_items(self, db: Session, items: List[Dict]) -> List[Dict]:
+        """Skip already stored items before doing any description or article work"""
+        # One set-based lookup for the whole batch instead of a query per item
+        seen_urls = self._get_existing_urls(db, [item["link"] for item in items])
+        new_items = []
+        for item in items:
+            if item["link"] and item["link"] not in seen_urls:
+                seen_urls.add(item["link"])
+                new_items.append(item)
+        return new_items
+    
+    def _classify_items(self, source: Dict, items: List[Dict]) -> List[Dict]:
+        """Turn new feed items into rows: clean text, filter breaking news, categorize, fingerprint.
+
+        Rows whose description is too short are flagged with needs_enrichment so their
+        article text can be fetched after they are stored. No database access, so this
+        can run off the event loop.
+        """
+        google_news = source["parser"] == "google_news"
+        rows = []
+        
+        for item in items:
+            # Clean common source suffixes from titles (e.g. " - WIRED", " - Wired")
+            title = self._clean_title(item["title"])
+            if not title:
+                continue
             
-            for item in items[:limit]:
-                title_elem = item.find('title')
-                link_elem = item.find('link')
-                pub_date_elem = item.find('pubDate')
-                description_elem = item.find('description')
-                
-                # Extract and clean text
-                raw_title = title_elem.get_text(strip=True) if title_elem else ""
-                title = self._clean_title(raw_title)
-                link = link_elem.get_text(strip=True) if link_elem else ""
-                pub_date = pub_date_elem.get_text(strip=True) if pub_date_elem else ""
+            # Clean description - remove HTML tags and get meaningful content
+            if item["description"] is not None:
+                description = clean_description(item["description"])
                 
-                # Clean description - remove HTML tags and get meaningful content
-                if description_elem:
-                    desc_html = str(description_elem)
-                    desc_soup = BeautifulSoup(desc_html, 'html.parser')
-                    
-                    # Remove all script and style elements
-                    for script in desc_soup(["script", "style", "a"]):
-                        script.decompose()
-                    
-                    # Try to extract meaningful content
-                    paragraphs = desc_soup.find_all('p')
-                    if paragraphs:
-                        description = ' '.join([p.get_text(strip=True) for p in paragraphs[:3] if p.get_text(strip=True)])
-                    else:
-                        description = desc_soup.get_text(separator=' ', strip=True)
-                    
-                    # Clean up the description
-                    description = description.replace('&nbsp;', ' ').replace('&amp;', '&')
-                    description = description.replace('&lt;', '<').replace('&gt;', '>')
-                    description = description.replace('&quot;', '"').replace('&#39;', "'")
-                    description = ' '.join(description.split())
-                    
-                    # If description is too short, try to fetch from article
-                    if len(description) < 100:
-                        try:
-                            article_content = self._fetch_article_content(link)
-                            if article_content and len(article_content) > 100:
-                                description = article_content
-                        except Exception as e:
-                            print(f"Could not fetch article content: {e}")
-                            description = f"This {source_name} article covers {title.lower()}. Click 'Read Full Story' to view the complete article."
+                # If description is too short (or, on Google News, just the title), fill it in from the article later
+                needs_enrichment = len(description) < 100 or (google_news and description.lower().strip() == title.lower().strip())
+            else:
+                needs_enrichment = False
+                if google_news:
+                    description = f"This article covers {title.lower()}. Click 'Read Full Story' to view the complete article."
                 else:
-                    description = f"This {source_name} article covers {title.lower()}. Click 'Read Full Story' to view the complete article."
-                
-                # Check if this is breaking news (if required)
-                if require_breaking and not self._is_breaking_news(title, description):
-                    continue
-                
-                # Check if already exists
-                existing = db.query(BreakingNews).filter(
-                    BreakingNews.url == link
-                ).first()
-                
-                if not existing and title and link:
-                    news_item = BreakingNews(
-                        title=title,
-                        content=description,
-                        source=source_name,
-                        url=link,
-                        category=self._categorize_news(title, description),
-                        published_at=self._parse_date(pub_date)
-                    )
-                    
-                    db.add(news_item)
-                    fetched_news.append({
-                        "title": title,
-                        "content": description,
-                        "source": source_name,
-                        "url": link
-                    })
+                    description = f"This {source['source']} article covers {title.lower()}. Click 'Read Full Story' to view the complete article."
             
-            db.commit()
-            return fetched_news
+            # Check if this is breaking news (if required)
+            signals = keyword_matcher.scan(f"{title} {description}")
+            if source["require_breaking"] and not self._is_breaking_news(title, description, signals):
+                continue
             
-        except Exception as e:
-            print(f"Error fetching {source_name} news: {e}")
-            return []
+            rows.append({
+                "title": title,
+                "content": description,
+                "source": source["source"],
+                "url": item["link"],
+                "category": self._categorize_news(title, description, signals),
+                # Unparseable dates stay NULL rather than passing the fetch time off as publish time
+                "published_at": item["published_at"],
+                # Placeholder descriptions would make unrelated items look alike
+                "simhash": simhash(title, None if needs_enrichment else description),
+                "needs_enrichment": needs_enrichment
+            })
+        
+        return rows
+    
+    def _get_existing_urls(self, db: Session, links: List[str]) -> set:
+        """Return which of a batch's links are already stored, using a single IN query"""
+        links = {link for link in links if link}
+        if not links:
+            return set()
+        existing = {url for (url,) in db.query(BreakingNews.url).filter(BreakingNews.url.in_(links))}
+        # An item still listed by its feed after its row was archived is not stored again
+        if links - existing:
+            existing.update(url for (url,) in db.query(BreakingNewsArchive.url).filter(BreakingNewsArchive.url.in_(links - existing)))
+        return existing
+    
+    def _parse_item_dates(self, items: List[Dict], feed: str, publish_times: Optional[List[datetime]] = None):
+        """Set each item's published_at (None when unparseable) and collect the parsed ones"""
+        for item in items:
+            item["published_at"] = self._parse_date(item["pub_date"], feed)
+        if publish_times is not None:
+            publish_times.extend(item["published_at"] for item in items if item["published_at"])
+    
+    def _insert_new_items(self, db: Session, rows: List[Dict], enrichment_jobs: Optional[List[Dict]] = None) -> List[Dict]:
+        """Write a feed's new items with one bulk INSERT ... ON CONFLICT (url) DO NOTHING.
+
+        Until the unique URL index exists (duplicates from before it are waiting to be
+        merged) a plain bulk insert is used instead.
+
+        Each item is attached to the story cluster of any near-duplicate already stored
+        (from any source) before the insert.
+        """
+        enrich_urls = {row["url"] for row in rows if row.pop("needs_enrichment", False)}
+        if rows:
+            self.story_clusters.sync(db)
+            for row in rows:
+                row["cluster_key"] = self.story_clusters.assign(row["simhash"])
+            dialect = db.get_bind().dialect.name
+            # Core insert on the table: the ORM bulk path would replace a NULL published_at
+            # with the column default
+            table = BreakingNews.__table__
+            if not self._has_url_index(db):
+                # No unique index to conflict on: the rows were already checked against
+                # stored URLs, so a plain insert is safe apart from a concurrent ingest
+                statement = insert(table)
+            elif dialect == "sqlite":
+                statement = sqlite_insert(table).on_conflict_do_nothing(index_elements=["url"])
+            elif dialect == "postgresql":
+                statement = postgresql_insert(table).on_conflict_do_nothing(index_elements=["url"])
+            else:
+                statement = insert(table)
+            db.execute(statement, rows)
+        db.commit()
+        if rows:
+            response_cache.invalidate(BREAKING_NEWS)
+        
+        if enrich_urls and enrichment_jobs is not None:
+            enrichment_jobs.extend(
+                {"id": news_id, "url": url}
+                for news_id, url in db.query(BreakingNews.id, BreakingNews.url).filter(BreakingNews.url.in_(enrich_urls))
+            )
+        
+        return [
+            {
+                "title": row["title"],
+                "content": row["content"],
+                "source": row["source"],
+                "url": row["url"]
+            }
+            for row in rows
+        ]
+
+    def _has_url_index(self, db: Session) -> bool:
+        """Whether the unique URL index exists; checked until it does, then remembered"""
+        if not self._url_index_ready:
+            indexes = {index["name"] for index in inspect(db.connection()).get_indexes("breaking_news")}
+            self._url_index_ready = "ix_breaking_news_url" in indexes
+            if not self._url_index_ready:
+                print("breaking_news.url has no unique index yet; inserting without ON CONFLICT "
+                      "(run `python -m app.models.database --merge-duplicate-urls`)")
+        return self._url_index_ready
+
+    async def fetch_all_sources(self, db: Session, due_only: bool = False) -> Dict[str, List[Dict]]:
+        """Fetch every feed through the staged ingestion pipeline.
+
+        fetch -> parse -> resolve -> dedupe -> classify -> store -> enrich, connected by bounded queues
+        (see app/services/pipeline.py). Downloads run concurrently on one aiohttp session
+        (BREAKING_NEWS_FETCH_CONCURRENCY workers) and a feed is parsed as soon as it arrives,
+        in a worker thread, while other feeds are still downloading. Parsing and classifying
+        run off the event loop; resolve (links to canonical URLs), dedupe and store use the
+        session on it. Feeds not downloaded by the run deadline are given up on, so a run
+        takes as long as the slowest feed, never the sum. Items with short descriptions are stored immediately and their article text
+        is filled in by the enrich stage; when enrichment falls behind, its full queue holds
+        back the stages before it.
+
+        Feeds whose circuit breaker is open are skipped; with `due_only`, so are feeds whose
+        adaptive poll interval has not elapsed yet. Only polled feeds appear in the result.
+        Per-stage counters of the run are kept in `last_pipeline_stats`.
+        """
+        all_sources = self.feed_registry.get_sources(db)
+        feed_keys = [self.feed_validators.feed_key(source["url"], source["params"]) for source in all_sources]
+        sources = self.poll_scheduler.due_sources(db, all_sources, feed_keys, ignore_schedule=not due_only)
+        results = {source["name"]: [] for source in sources}
+        if not sources:
+            return results
+
+        timeout = aiohttp.ClientTimeout(total=settings.BREAKING_NEWS_FEED_TIMEOUT_SECONDS)
+        connector = aiohttp.TCPConnector(limit=settings.BREAKING_NEWS_FETCH_CONCURRENCY)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.BREAKING_NEWS_RUN_DEADLINE_SECONDS
+        enrich_deadline = deadline + settings.ARTICLE_ENRICH_RUN_DEADLINE_SECONDS
+        feeds = [
+            {"source": source, "feed_key": self.feed_validators.feed_key(source["url"], source["params"]), "process_seconds": 0.0}
+            for source in sources
+        ]
+
+        async with self.article_enricher.pool(lambda job, article: self._store_article_content(db, job, article), start_workers=False) as enrichment:
+            async with aiohttp.ClientSession(headers=self.request_headers, timeout=timeout, connector=connector) as session:
+
+                async def fetch(feed):
+                    source = feed["source"]
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    conditional_headers = self.feed_validators.conditional_headers(db, feed["feed_key"])
+                    status, content, response_headers = await asyncio.wait_for(
+                        self._download_feed(session, source, conditional_headers), remaining
+                    )
+                    if status == 304:
+                        self.feed_validators.record_not_modified(db, feed["feed_key"], source["source"])
+                        self.poll_scheduler.record_success(db, feed["feed_key"], source["source"], not_modified=True, fixed_interval_minutes=source["poll_interval_minutes"])
+                        print(f"{source['name']} feed not modified since last poll; skipped parsing")
+                        return
+                    feed.update(content=content, response_headers=response_headers, publish_times=[])
+                    yield feed
+
+                def parse(feed):
+                    started = time.perf_counter()
+                    feed["items"] = self._parse_payload(feed["source"], feed["content"], feed["publish_times"])
+                    feed["process_seconds"] += time.perf_counter() - started
+                    return feed
+
+                async def resolve(feed):
+                    started = time.perf_counter()
+                    feed["items"] = await self._canonicalize_links(db, feed["items"], session)
+                    feed["process_seconds"] += time.perf_counter() - started
+                    yield feed
+
+                async def dedupe(feed):
+                    started = time.perf_counter()
+                    feed["items"] = self._drop_known_items(db, feed["items"])
+                    feed["process_seconds"] += time.perf_counter() - started
+                    yield feed
+
+                def classify(feed):
+                    started = time.perf_counter()
+                    feed["rows"] = self._classify_items(feed["source"], feed["items"])
+                    feed["process_seconds"] += time.perf_counter() - started
+                    return feed
+
+                async def store(feed):
+                    enrichment_jobs = []
+                    results[feed["source"]["name"]] = self._store_feed_rows(db, feed, enrichment_jobs)
+                    for job in enrichment_jobs:
+                        yield job
+
+                async def enrich(job):
+                    if loop.time() > enrich_deadline:
+                        enrichment.stats["expired"] += 1
+                        return
+                    await enrichment.enrich_one(job)
+                    yield job
+
+                def on_error(stage, item, error):
+                    if "feed_key" not in item:
+                        return  # enrichment failures are counted by the pool
+                    db.rollback()
+                    source = item["source"]
+                    if isinstance(error, asyncio.TimeoutError):
+                        self.poll_scheduler.record_failure(db, item["feed_key"], source["source"], "run deadline exceeded")
+                        print(f"Timed out fetching {source['name']} news after {settings.BREAKING_NEWS_RUN_DEADLINE_SECONDS}s run deadline")
+                    else:
+                        self.poll_scheduler.record_failure(db, item["feed_key"], source["source"], str(error) or type(error).__name__)
+                        print(f"Error fetching {source['name']} news at {stage} stage: {error}")
+
+                pipeline = Pipeline([
+                    Stage("fetch", fetch, workers=settings.BREAKING_NEWS_FETCH_CONCURRENCY),
+                    Stage("parse", in_executor(parse), workers=settings.BREAKING_NEWS_PARSE_WORKERS),
+                    Stage("resolve", resolve),
+                    Stage("dedupe", dedupe),
+                    Stage("classify", in_executor(classify), workers=settings.BREAKING_NEWS_PARSE_WORKERS),
+                    Stage("store", store),
+                    Stage("enrich", enrich, workers=self.article_enricher.workers),
+                ], queue_size=settings.BREAKING_NEWS_PIPELINE_QUEUE_SIZE, on_error=on_error)
+                stage_stats = await pipeline.run(feeds)
+
+        self.last_pipeline_stats = {"finished_at": datetime.utcnow(), "stages": stage_stats, "enrichment": dict(enrichment.stats)}
+        return results
+
+    async def _download_feed(
+        self,
+        session: aiohttp.ClientSession,
+        source: Dict,
+        conditional_headers: Dict[str, str]
+    ) -> Tuple[int, bytes, Dict]:
+        """Download one feed payload"""
+        async with session.get(source["url"], params=source["params"], headers=conditional_headers) as response:
+            if response.status == 304:
+                return 304, b"", response.headers
+            response.raise_for_status()
+            return response.status, await response.read(), response.headers
+
+    def _store_feed_rows(self, db: Session, feed: Dict, enrichment_jobs: List[Dict]) -> List[Dict]:
+        """Store a processed feed's rows, then remember its validators and publish rate"""
+        started = time.perf_counter()
+        news_items = self._insert_new_items(db, feed["rows"], enrichment_jobs)
+        self._record_fetched(db, feed["source"], feed["feed_key"], feed["content"], feed["response_headers"], feed["publish_times"], feed["process_seconds"] + time.perf_counter() - started)
+        return news_items
+
+    async def _process_feed_source(
+        self,
+        source: Dict,
+        content: bytes,
+        db: Session,
+        enrichment_jobs: Optional[List[Dict]] = None,
+        publish_times: Optional[List[datetime]] = None
+    ) -> List[Dict]:
+        """Run a downloaded payload through every ingestion step in turn and store its new items.
+
+        Items whose description is too short are stored right away and added to
+        `enrichment_jobs` so their article text can be fetched afterwards. The publish
+        time of every parsed item, stored or not, is added to `publish_times`.
+        """
+        items = self._parse_payload(source, content, publish_times)
+        items = await self._canonicalize_links(db, items)
+        items = self._drop_known_items(db, items)
+        rows = self._classify_items(source, items)
+        return self._insert_new_items(db, rows, enrichment_jobs)
     
+    def _store_article_content(self, db: Session, job: Dict, content: str):
+        """Replace a stored item's short description once its article text has been fetched"""
+        try:
+            db.query(BreakingNews).filter(BreakingNews.id == job["id"]).update({"content": content})
+            db.commit()
+            response_cache.invalidate(BREAKING_NEWS)
+        except Exception:
+            db.rollback()
+            raise
+
     def get_trending_news(self, db: Session, limit: int = 10) -> List[Dict]:
-        """Get trending breaking news based on importance and recency"""
-        # Get news from last 48 hours, ordered by importance and recency
+        """Get trending breaking news based on importance and recency, one entry per story.
+
+        Copies of a story from different sources share a cluster_key; the highest scored
+        copy is returned along with how many copies there are.
+        """
+        # Get news from last 48 hours, ordered by importance and recency; items whose
+        # publish date could not be parsed have none and are left out
         time_threshold = datetime.utcnow() - timedelta(hours=48)
         
-        trending_news = db.query(BreakingNews).filter(
+        # Rows stored before clustering have no key and stand alone
+        cluster = func.coalesce(BreakingNews.cluster_key, BreakingNews.id)
+        ranked = db.query(
+            BreakingNews.id.label("id"),
+            func.row_number().over(
+                partition_by=cluster,
+                order_by=(BreakingNews.importance_score.desc(), BreakingNews.published_at.desc())
+            ).label("rank"),
+            func.count().over(partition_by=cluster).label("cluster_size")
+        ).filter(
             BreakingNews.published_at >= time_threshold
+        ).subquery()
+        
+        trending_news = db.query(BreakingNews, ranked.c.cluster_size).join(
+            ranked, ranked.c.id == BreakingNews.id
+        ).filter(
+            ranked.c.rank == 1
         ).order_by(
             BreakingNews.importance_score.desc(),
             BreakingNews.published_at.desc()
@@ -369,124 +603,35 @@ class BreakingNewsService:
                 "url": item.url,
                 "importance_score": item.importance_score,
                 "is_critical": item.is_critical,
-                "published_at": item.published_at
+                "published_at": item.published_at,
+                "cluster_size": cluster_size
             }
-            for item in trending_news
+            for item, cluster_size in trending_news
         ]
     
-    def _is_breaking_news(self, title: str, content: str) -> bool:
+    def _is_breaking_news(self, title: str, content: str, signals: Optional[KeywordSignals] = None) -> bool:
         """Determine if news is breaking based on keywords and patterns"""
-        text = f"{title} {content}".lower()
-        
-        # Check for breaking news indicators
-        breaking_indicators = [
-            "breaking", "just in", "urgent", "alert", "announcement",
-            "launches", "releases", "acquires", "merges", "partners",
-            "funding", "ipo", "layoffs", "hiring", "expansion"
-        ]
-        
-        # Check for tech company names
-        tech_companies = [
-            "google", "apple", "microsoft", "amazon", "meta", "facebook",
-            "tesla", "nvidia", "intel", "amd", "netflix", "spotify",
-            "uber", "lyft", "airbnb", "stripe", "openai", "anthropic"
-        ]
-        
-        # Check for AI/ML keywords
-        ai_keywords = [
-            "artificial intelligence", "machine learning", "deep learning",
-            "neural network", "gpt", "llm", "ai model", "algorithm"
-        ]
-        
-        # Score the news
-        score = 0
-        
-        for indicator in breaking_indicators:
-            if indicator in text:
-                score += 2
+        signals = signals or keyword_matcher.scan(f"{title} {content}")
         
-        for company in tech_companies:
-            if company in text:
-                score += 3
-        
-        for keyword in ai_keywords:
-            if keyword in text:
-                score += 2
+        # Breaking indicators and AI/ML keywords score 2 each, tech company names 3
+        score = (
+            2 * signals.count("breaking_indicator")
+            + 3 * signals.count("breaking_company")
+            + 2 * signals.count("breaking_ai")
+        )
         
         # Consider it breaking news if score is high enough
         return score >= 3
     
-    def _categorize_news(self, title: str, content: str) -> str:
+    def _categorize_news(self, title: str, content: str, signals: Optional[KeywordSignals] = None) -> str:
         """Categorize news based on content"""
-        text = f"{title} {content}".lower()
+        signals = signals or keyword_matcher.scan(f"{title} {content}")
         
-        if any(word in text for word in ["ai", "artificial intelligence", "machine learning", "gpt", "llm"]):
-            return "ai"
-        elif any(word in text for word in ["startup", "funding", "venture", "ipo"]):
-            return "startup"
-        elif any(word in text for word in ["acquire", "merger", "acquisition"]):
-            return "acquisition"
-        elif any(word in text for word in ["layoff", "hiring", "job"]):
-            return "employment"
-        elif any(word in text for word in ["breach", "security", "hack"]):
-            return "security"
-        else:
-            return "tech"
+        for group, category in CATEGORY_ORDER:
+            if signals.has(group):
+                return category
+        return "tech"
     
-    def _fetch_article_content(self, url: str, max_length: int = 800) -> str:
-        """Fetch article content from URL"""
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10, allow_redirects=True)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "header", "footer", "aside"]):
-                script.decompose()
-            
-            # Try to find main content in common article tags
-            article = soup.find('article') or soup.find('main') or soup.find('div', class_=lambda x: x and ('article' in x.lower() or 'content' in x.lower() or 'post' in x.lower()))
-            
-            if article:
-                # Get all paragraph text
-                paragraphs = article.find_all('p')
-                if paragraphs:
-                    content = ' '.join([p.get_text(strip=True) for p in paragraphs[:5] if p.get_text(strip=True)])
-                    if len(content) > 100:
-                        return content[:max_length] + '...' if len(content) > max_length else content
-            
-            # Fallback: get all paragraph text from body
-            paragraphs = soup.find_all('p')
-            if paragraphs:
-                content = ' '.join([p.get_text(strip=True) for p in paragraphs[:5] if p.get_text(strip=True) and len(p.get_text(strip=True)) > 50])
-                if len(content) > 100:
-                    return content[:max_length] + '...' if len(content) > max_length else content
-            
-            return ""
-        except Exception as e:
-            print(f"Error fetching article content from {url}: {e}")
-            return ""
-    
-    def _parse_date(self, date_string: str) -> datetime:
-        """Parse date string from RSS feed"""
-        try:
-            # Handle common RSS date formats
-            formats = [
-                "%a, %d %b %Y %H:%M:%S %Z",
-                "%a, %d %b %Y %H:%M:%S %z",
-                "%Y-%m-%dT%H:%M:%SZ"
-            ]
-            
-            for fmt in formats:
-                try:
-                    return datetime.strptime(date_string, fmt)
-                except ValueError:
-                    continue
-            
-            return datetime.utcnow()
-        except:
-            return datetime.utcnow() 
\ No newline at end of file
+    def _parse_date(self, date_string: str, feed: str = "") -> Optional[datetime]:
+        """Parse date string from RSS feed into naive UTC, or None (counted per feed) if unparseable"""
+        return self.date_parser.parse(date_string, feed)
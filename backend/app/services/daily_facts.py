@@ -0,0 +1,211 @@
+from typing import Dict, List, Optional
+from datetime import date, timedelta
+import asyncio
+import re
+from sqlalchemy import func, insert, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.ai.content_generator import AIContentGenerator
+from app.core.config import settings
+from app.core.response_cache import FACTS, response_cache
+from app.core.single_flight import SingleFlight
+from app.models.database import Fact, SessionLocal
+
+# Category asked of the model for daily facts
+DAILY_FACT_CATEGORY = "random"
+
+# First key of the Postgres advisory lock taken while a day's fact is created (the day is the second)
+DAILY_FACT_LOCK_CLASS = 19_001
+# How long a request waits for another worker holding that lock before inserting itself
+DAILY_FACT_LOCK_WAIT_SECONDS = 5.0
+
+# One creation per day at a time in this process, shared by the API and the scheduler
+_daily_fact_flights = SingleFlight()
+
+# Signs the model repeated the prompt instead of answering it
+_PROMPT_ECHOES = ("generate one", "the fact should", "return only", "maximum 100 words")
+_WORD = re.compile(r"[A-Za-z]{2,}")
+
+
+def validate_fact_text(fact_text: Optional[str]) -> Optional[str]:
+    """Why a generated fact is not usable, or None when it is"""
+    text = (fact_text or "").strip()
+    if len(text) < 30:
+        return "too short"
+    if len(text) > 600:
+        return "too long"
+    if len(_WORD.findall(text)) < 6:
+        return "too few words"
+    lowered = text.lower()
+    if any(echo in lowered for echo in _PROMPT_ECHOES):
+        return "echoes the prompt"
+    return None
+
+
+class DailyFactService:
+    """The fact of the day: generated ahead of time, read by its fact_date.
+
+    `pregenerate` keeps the next FACT_PREGENERATE_DAYS days filled with validated model
+    facts, asking the model in batches and only while its circuit breakers are closed.
+    Days it could not fill are retried on the next run; today always gets a fact, from
+    the local rotation if need be. Serving the daily fact is then a single indexed read,
+    and `ensure_daily_fact` covers the rare miss with the rotation fact, without a model
+    call and without racing anyone (fact_date is unique).
+    """
+
+    def __init__(self, ai_generator: Optional[AIContentGenerator] = None, days_ahead: Optional[int] = None, batch_size: Optional[int] = None):
+        self.ai_generator = ai_generator or AIContentGenerator()
+        self.days_ahead = days_ahead or settings.FACT_PREGENERATE_DAYS
+        self.batch_size = batch_size or settings.FACT_PREGENERATE_BATCH_SIZE
+
+    def get_daily_fact(self, db: Session, day: date) -> Optional[Fact]:
+        """The active fact for a day, if there is one"""
+        return db.query(Fact).filter(Fact.fact_date == day, Fact.is_active == True).first()
+
+    async def ensure_daily_fact(self, db: Session, day: date) -> Fact:
+        """A day's fact, storing the local rotation fact if there is none yet.
+
+        The model is never asked here: `pregenerate` fills days ahead from the scheduler,
+        so a miss on the request path only costs an insert. Concurrent misses in this
+        process wait on one shared insert; other workers are kept out by an advisory lock
+        (Postgres) and, on any database, by the unique fact_date.
+        """
+        fact = self.get_daily_fact(db, day)
+        if fact:
+            return fact
+        # Hand the connection back to the pool while waiting: the creation needs one too
+        db.rollback()
+        await _daily_fact_flights.do(day, lambda: self._create_daily_fact(day))
+        return self.get_daily_fact(db, day)
+
+    async def _create_daily_fact(self, day: date):
+        db = SessionLocal()
+        try:
+            if not self._lock_day(db, day):
+                # Another worker is storing the day's fact; it only has an insert to make
+                if await self._wait_for_fact(db, day):
+                    return
+            elif self.get_daily_fact(db, day):
+                return
+            self._insert_facts(db, [self._fact_values(day, self.ai_generator.get_rotation_fact(DAILY_FACT_CATEGORY, day))])
+            db.commit()
+            response_cache.invalidate(FACTS)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _lock_day(self, db: Session, day: date) -> bool:
+        """Take the day's advisory lock until commit; False if another worker holds it.
+
+        SQLite has no advisory locks: racing workers may each build a fact, and the
+        unique fact_date keeps the first one stored.
+        """
+        if db.get_bind().dialect.name != "postgresql":
+            return True
+        return bool(db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:lock_class, :day)"),
+            {"lock_class": DAILY_FACT_LOCK_CLASS, "day": day.toordinal()}
+        ).scalar())
+
+    async def _wait_for_fact(self, db: Session, day: date) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + DAILY_FACT_LOCK_WAIT_SECONDS
+        while loop.time() < deadline:
+            await asyncio.sleep(0.25)
+            db.rollback()
+            if self.get_daily_fact(db, day):
+                return True
+        return False
+
+    def create_rotation_fact(self, db: Session, day: date) -> Optional[Fact]:
+        """Store the local rotation fact as a day's fact (no model call), unless it has one"""
+        fact_data = self.ai_generator.get_rotation_fact(DAILY_FACT_CATEGORY, day)
+        self._insert_facts(db, [self._fact_values(day, fact_data)])
+        db.commit()
+        response_cache.invalidate(FACTS)
+        return self.get_daily_fact(db, day)
+
+    def _fact_values(self, day: date, fact_data: Dict) -> Dict:
+        return {"fact_text": fact_data["fact_text"].strip(), "category": fact_data["category"], "source": fact_data["source"], "fact_date": day}
+
+    def _insert_facts(self, db: Session, values: List[Dict]) -> int:
+        """Insert daily facts, skipping days that got one meanwhile; returns how many were stored"""
+        if not values:
+            return 0
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            statement = sqlite_insert(Fact).on_conflict_do_nothing(index_elements=["fact_date"])
+        elif dialect == "postgresql":
+            statement = postgresql_insert(Fact).on_conflict_do_nothing(index_elements=["fact_date"])
+        else:
+            statement = insert(Fact)
+        return db.execute(statement.values(values)).rowcount
+
+    async def pregenerate(self, db: Session, days: Optional[int] = None) -> Dict:
+        """Fill the days from today on that have no fact yet (at most FACT_PREGENERATE_DAYS)"""
+        if days is not None and not 1 <= days <= settings.FACT_PREGENERATE_DAYS:
+            raise ValueError(f"days must be between 1 and {settings.FACT_PREGENERATE_DAYS}")
+        today = date.today()
+        wanted = [today + timedelta(days=offset) for offset in range(days or self.days_ahead)]
+        have = {
+            fact_date for (fact_date,) in db.query(Fact.fact_date).filter(
+                Fact.fact_date.in_(wanted),
+                Fact.is_active == True
+            )
+        }
+        missing = [day for day in wanted if day not in have]
+        result = {"missing": len(missing), "generated": 0, "rejected": 0, "rotation": 0, "model_available": self.ai_generator.models_available()}
+
+        for start in range(0, len(missing), self.batch_size):
+            if not self.ai_generator.models_available():
+                result["model_available"] = False
+                break
+            batch = missing[start:start + self.batch_size]
+            generated = await asyncio.gather(*(self.ai_generator.generate_model_fact(DAILY_FACT_CATEGORY) for _ in batch))
+            accepted = self._accept(db, batch, generated)
+            # Another worker's scheduler may have filled some of these days meanwhile
+            result["generated"] += self._insert_facts(db, accepted)
+            result["rejected"] += sum(1 for fact_data in generated if fact_data) - len(accepted)
+            db.commit()
+            response_cache.invalidate(FACTS)
+            have.update(values["fact_date"] for values in accepted)
+
+        # The daily fact must never be missing, model or not
+        if today not in have and not self.get_daily_fact(db, today):
+            self.create_rotation_fact(db, today)
+            result["rotation"] += 1
+        return result
+
+    def _accept(self, db: Session, days: List[date], generated: List[Optional[Dict]]) -> List[Dict]:
+        """Validated, not yet seen facts from a batch, one per day"""
+        texts = [fact_data["fact_text"].strip() for fact_data in generated if fact_data]
+        seen = {
+            text.lower() for (text,) in db.query(Fact.fact_text).filter(func.lower(Fact.fact_text).in_([text.lower() for text in texts]))
+        } if texts else set()
+
+        accepted = []
+        candidates = iter(fact_data for fact_data in generated if fact_data)
+        for day in days:
+            for fact_data in candidates:
+                text = fact_data["fact_text"].strip()
+                reason = validate_fact_text(text)
+                if reason is None and text.lower() in seen:
+                    reason = "duplicate"
+                if reason is not None:
+                    print(f"Rejected generated fact ({reason}): {text[:60]}")
+                    continue
+                seen.add(text.lower())
+                accepted.append(self._fact_values(day, fact_data))
+                break
+        return accepted
+
+    def get_queue(self, db: Session) -> List[Dict]:
+        """Facts already prepared for today and the days after it"""
+        facts = db.query(Fact).filter(Fact.fact_date >= date.today(), Fact.is_active == True).order_by(Fact.fact_date).all()
+        return [
+            {"fact_date": fact.fact_date, "category": fact.category, "source": fact.source, "created_at": fact.created_at}
+            for fact in facts
+        ]
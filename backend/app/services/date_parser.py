@@ -0,0 +1,79 @@
+from typing import Callable, Dict, Optional
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import threading
+
+
+def _parse_rfc822(value: str) -> Optional[datetime]:
+    """RSS 2.0 pubDate, e.g. "Mon, 01 Jun 2026 10:00:00 GMT" or "... +0200" """
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _parse_iso8601(value: str) -> Optional[datetime]:
+    """Atom and Dublin Core dates, e.g. "2026-06-01T10:00:00Z" or "2026-06-01 10:00:00+02:00" """
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+# Tried in this order for a feed with no remembered format
+PARSERS: Dict[str, Callable[[str], Optional[datetime]]] = {
+    "rfc822": _parse_rfc822,
+    "iso8601": _parse_iso8601,
+}
+
+
+def to_utc(moment: datetime) -> datetime:
+    """Naive UTC datetime, as stored in the database; naive input is taken to be UTC"""
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class FeedDateParser:
+    """Parses feed item dates, remembering which format each feed uses.
+
+    A feed almost always uses one format for every item, so after its first date only the
+    remembered parser is tried. Dates no parser understands return None and are counted per
+    feed instead of being replaced with the current time.
+    """
+
+    def __init__(self):
+        self._formats: Dict[str, str] = {}
+        self._unparseable: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def parse(self, value: Optional[str], feed: str = "") -> Optional[datetime]:
+        """Parse one date string from `feed` into a naive UTC datetime"""
+        value = (value or "").strip()
+        if not value:
+            return None
+
+        remembered = self._formats.get(feed)
+        if remembered is not None:
+            parsed = PARSERS[remembered](value)
+            if parsed is not None:
+                return to_utc(parsed)
+
+        for name, parser in PARSERS.items():
+            if name == remembered:
+                continue
+            parsed = parser(value)
+            if parsed is not None:
+                self._formats[feed] = name
+                return to_utc(parsed)
+
+        with self._lock:
+            self._unparseable[feed] = self._unparseable.get(feed, 0) + 1
+        return None
+
+    def take_unparseable(self, feed: str) -> int:
+        """Unparseable dates counted for a feed since the last call, resetting the count"""
+        with self._lock:
+            return self._unparseable.pop(feed, 0)
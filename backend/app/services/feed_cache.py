@@ -0,0 +1,92 @@
+from sqlalchemy.orm import Session
+from typing import List, Dict, Optional
+from datetime import datetime
+from urllib.parse import urlencode
+from app.models.database import FeedFetchState
+
+class FeedValidatorStore:
+    """Persists ETag / Last-Modified validators per feed so polls can be conditional GETs"""
+
+    def feed_key(self, url: str, params: Optional[Dict] = None) -> str:
+        """Identify a feed by its full request URL (Google News differs only by query string)"""
+        if not params:
+            return url
+        separator = "&" if "?" in url else "?"
+        return f"{url}{separator}{urlencode(params)}"
+
+    def get_state(self, db: Session, feed_key: str) -> Optional[FeedFetchState]:
+        """Get the stored state row for a feed"""
+        return db.query(FeedFetchState).filter(FeedFetchState.feed_url == feed_key).first()
+
+    def conditional_headers(self, db: Session, feed_key: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from the last successful fetch"""
+        state = self.get_state(db, feed_key)
+        headers = {}
+        if state:
+            if state.etag:
+                headers["If-None-Match"] = state.etag
+            if state.last_modified:
+                headers["If-Modified-Since"] = state.last_modified
+        return headers
+
+    def record_not_modified(self, db: Session, feed_key: str, source: str):
+        """Count a 304 and credit the bytes and processing time it saved"""
+        state = self._get_or_create(db, feed_key, source)
+        state.last_status = 304
+        state.fetch_count = (state.fetch_count or 0) + 1
+        state.not_modified_count = (state.not_modified_count or 0) + 1
+        state.bytes_saved = (state.bytes_saved or 0) + (state.last_payload_bytes or 0)
+        state.process_seconds_saved = (state.process_seconds_saved or 0.0) + (state.last_process_seconds or 0.0)
+        state.last_fetched_at = datetime.utcnow()
+        db.commit()
+
+    def record_fetched(
+        self,
+        db: Session,
+        feed_key: str,
+        source: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        payload_bytes: int,
+        process_seconds: float,
+        unparseable_dates: int = 0
+    ):
+        """Store the validators of a full response once its items have been processed"""
+        state = self._get_or_create(db, feed_key, source)
+        state.etag = etag
+        state.last_modified = last_modified
+        state.last_status = 200
+        state.last_payload_bytes = payload_bytes
+        state.last_process_seconds = process_seconds
+        state.fetch_count = (state.fetch_count or 0) + 1
+        state.bytes_downloaded = (state.bytes_downloaded or 0) + payload_bytes
+        state.unparseable_dates = (state.unparseable_dates or 0) + unparseable_dates
+        state.last_fetched_at = datetime.utcnow()
+        db.commit()
+
+    def get_stats(self, db: Session) -> List[Dict]:
+        """Per-source conditional GET savings"""
+        states = db.query(FeedFetchState).order_by(FeedFetchState.source).all()
+
+        return [
+            {
+                "source": state.source,
+                "feed_url": state.feed_url,
+                "fetch_count": state.fetch_count or 0,
+                "not_modified_count": state.not_modified_count or 0,
+                "bytes_downloaded": state.bytes_downloaded or 0,
+                "bytes_saved": state.bytes_saved or 0,
+                "process_seconds_saved": round(state.process_seconds_saved or 0.0, 3),
+                "unparseable_dates": state.unparseable_dates or 0,
+                "last_status": state.last_status,
+                "last_fetched_at": state.last_fetched_at
+            }
+            for state in states
+        ]
+
+    def _get_or_create(self, db: Session, feed_key: str, source: str) -> FeedFetchState:
+        state = self.get_state(db, feed_key)
+        if not state:
+            state = FeedFetchState(feed_url=feed_key, source=source)
+            db.add(state)
+        return state
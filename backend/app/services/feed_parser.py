@@ -0,0 +1,134 @@
+from io import BytesIO
+from typing import Dict, Iterator, List, Optional
+import html
+import re
+from lxml import etree
+from lxml import html as lxml_html
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+RSS1_NS = "http://purl.org/rss/1.0/"
+
+# RSS 2.0 <item>, Atom <entry> and RSS 1.0 (RDF) <item>
+ITEM_TAGS = ("item", f"{{{ATOM_NS}}}entry", f"{{{RSS1_NS}}}item")
+
+# Child element local names checked in order for each field
+PUB_DATE_NAMES = ("pubDate", "published", "updated", "date")
+DESCRIPTION_NAMES = ("description", "summary", "content")
+
+_WHITESPACE = re.compile(r"\s+")
+_TAG = re.compile(r"<[^>]+>")
+
+
+def iter_feed_items(content: bytes, limit: Optional[int] = None) -> Iterator[Dict[str, Optional[str]]]:
+    """Stream items out of an RSS/Atom payload, stopping after `limit` items.
+
+    Each item is a dict with title, link, pub_date and description (the raw description
+    HTML, or None when the item has no description element). Parsed items are freed as
+    soon as they are yielded so memory stays flat however long the feed is.
+    """
+    if not content:
+        return
+
+    context = etree.iterparse(
+        BytesIO(content),
+        events=("end",),
+        tag=ITEM_TAGS,
+        recover=True,
+        resolve_entities=False,
+        no_network=True
+    )
+    count = 0
+    try:
+        for _, elem in context:
+            yield _item_fields(elem)
+            count += 1
+
+            elem.clear(keep_tail=False)
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+            if limit is not None and count >= limit:
+                break
+    except etree.XMLSyntaxError:
+        # recover=True handles most broken feeds; anything worse ends the stream
+        return
+    finally:
+        del context
+
+
+def parse_feed_items(content: bytes, limit: Optional[int] = None) -> List[Dict[str, Optional[str]]]:
+    """Parse up to `limit` items from an RSS/Atom payload"""
+    return list(iter_feed_items(content, limit=limit))
+
+
+def clean_description(raw_html: Optional[str], max_paragraphs: int = 3) -> str:
+    """Turn a description's HTML into plain text in a single parse.
+
+    Scripts, styles and links are dropped; the first `max_paragraphs` paragraphs are kept
+    when there are any, otherwise all text. Entities (including double-escaped ones such
+    as &amp;nbsp;) are decoded and whitespace collapsed.
+    """
+    if not raw_html or not raw_html.strip():
+        return ""
+
+    if "<" not in raw_html:
+        text = raw_html
+    else:
+        try:
+            fragment = lxml_html.fragment_fromstring(raw_html, create_parent="div")
+            etree.strip_elements(fragment, "script", "style", "a", with_tail=False)
+
+            paragraphs = []
+            for paragraph in fragment.iter("p"):
+                paragraph_text = paragraph.text_content().strip()
+                if paragraph_text:
+                    paragraphs.append(paragraph_text)
+                    if len(paragraphs) >= max_paragraphs:
+                        break
+            text = " ".join(paragraphs) if paragraphs else fragment.text_content()
+        except (etree.ParserError, ValueError):
+            text = _TAG.sub(" ", raw_html)
+
+    return _WHITESPACE.sub(" ", html.unescape(text)).strip()
+
+
+def _item_fields(elem) -> Dict[str, Optional[str]]:
+    children = {}
+    links = []
+    for child in elem.iterchildren():
+        if not isinstance(child.tag, str):
+            continue  # comments and processing instructions
+        name = etree.QName(child).localname
+        if name == "link":
+            links.append(child)
+        elif name not in children:
+            children[name] = child
+
+    return {
+        "title": _text(children.get("title")),
+        "link": _link(links),
+        "pub_date": next((_text(children[name]) for name in PUB_DATE_NAMES if name in children), ""),
+        "description": next(
+            ("".join(children[name].itertext()) for name in DESCRIPTION_NAMES if name in children),
+            None
+        )
+    }
+
+
+def _text(elem) -> str:
+    if elem is None:
+        return ""
+    return "".join(elem.itertext()).strip()
+
+
+def _link(links: List) -> str:
+    """RSS puts the URL in the element text, Atom in the href of the alternate link"""
+    for link in links:
+        href = link.get("href")
+        if href and link.get("rel", "alternate") == "alternate":
+            return href.strip()
+        if not href and link.text and link.text.strip():
+            return link.text.strip()
+    return ""
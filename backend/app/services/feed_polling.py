@@ -0,0 +1,155 @@
+from sqlalchemy.orm import Session
+from typing import List, Dict, Optional
+from datetime import datetime, timedelta, timezone
+import statistics
+from app.core.circuit_breaker import CircuitBreaker, OPEN
+from app.core.config import settings
+from app.models.database import FeedFetchState
+
+# Weight of the newest publish-rate estimate against the current interval
+SMOOTHING = 0.5
+# Interval growth when a poll finds nothing new (304)
+NOT_MODIFIED_BACKOFF = 1.25
+
+
+def _epoch(moment: datetime) -> float:
+    """Epoch seconds of a naive UTC datetime as stored in the database"""
+    return moment.replace(tzinfo=timezone.utc).timestamp()
+
+
+class FeedPollScheduler:
+    """Decides when each feed is polled next and trips a circuit breaker on dead feeds.
+
+    A feed's interval tracks its publish rate: the median gap between its items times
+    BREAKING_NEWS_ITEMS_PER_POLL, smoothed and clamped to the configured bounds. The state
+    lives on the feed's FeedFetchState row so it survives restarts and is shared by workers.
+    """
+
+    def __init__(self):
+        self.min_interval = settings.BREAKING_NEWS_MIN_POLL_MINUTES * 60
+        self.max_interval = settings.BREAKING_NEWS_MAX_POLL_MINUTES * 60
+        self.default_interval = settings.BREAKING_NEWS_DEFAULT_POLL_MINUTES * 60
+
+    def due_sources(self, db: Session, sources: List[Dict], feed_keys: List[str], ignore_schedule: bool = False) -> List[Dict]:
+        """The sources whose next poll time has come and whose breaker lets a poll through.
+
+        With `ignore_schedule` every source with a closed (or half-open) breaker is due.
+        """
+        states = {
+            state.feed_url: state
+            for state in db.query(FeedFetchState).filter(FeedFetchState.feed_url.in_(feed_keys))
+        }
+        now = datetime.utcnow()
+        return [
+            source for source, feed_key in zip(sources, feed_keys)
+            if self._is_due(states.get(feed_key), now, ignore_schedule)
+        ]
+
+    def record_success(
+        self,
+        db: Session,
+        feed_key: str,
+        source: str,
+        publish_times: Optional[List[datetime]] = None,
+        not_modified: bool = False,
+        fixed_interval_minutes: Optional[float] = None
+    ):
+        """Close the breaker and schedule the next poll from the feed's publish rate.
+
+        A source configured with a fixed interval keeps it; its publish rate is still recorded.
+        """
+        state = self._get_or_create(db, feed_key, source)
+        breaker = self._breaker(state)
+        breaker.record_success()
+        self._save_breaker(state, breaker)
+        state.last_error = None
+
+        interval = state.poll_interval_seconds or self.default_interval
+        publish_interval = self._publish_interval(publish_times or [])
+        if publish_interval is not None:
+            state.publish_interval_seconds = publish_interval
+            target = publish_interval * settings.BREAKING_NEWS_ITEMS_PER_POLL
+            interval = SMOOTHING * target + (1 - SMOOTHING) * interval
+        elif not_modified:
+            interval *= NOT_MODIFIED_BACKOFF
+        if fixed_interval_minutes:
+            interval = fixed_interval_minutes * 60
+        state.poll_interval_seconds = min(max(interval, self.min_interval), self.max_interval)
+        state.next_poll_at = datetime.utcnow() + timedelta(seconds=state.poll_interval_seconds)
+        db.commit()
+
+    def record_failure(self, db: Session, feed_key: str, source: str, error: str):
+        """Count a failed or timed out poll; repeated failures open the breaker"""
+        state = self._get_or_create(db, feed_key, source)
+        breaker = self._breaker(state)
+        breaker.record_failure()
+        self._save_breaker(state, breaker)
+        state.last_error = error[:500]
+
+        interval = state.poll_interval_seconds or self.default_interval
+        if breaker.state == OPEN:
+            state.next_poll_at = state.breaker_open_until
+            print(f"Circuit breaker opened for {source} after {breaker.failures} failures; retrying at {state.next_poll_at}")
+        else:
+            state.next_poll_at = datetime.utcnow() + timedelta(seconds=min(interval, self.min_interval))
+        db.commit()
+
+    def get_status(self, db: Session) -> List[Dict]:
+        """Current poll interval and breaker state per source"""
+        states = db.query(FeedFetchState).order_by(FeedFetchState.source).all()
+
+        return [
+            {
+                "source": state.source,
+                "feed_url": state.feed_url,
+                "poll_interval_minutes": round((state.poll_interval_seconds or self.default_interval) / 60, 1),
+                "publish_interval_minutes": round(state.publish_interval_seconds / 60, 1) if state.publish_interval_seconds else None,
+                "next_poll_at": state.next_poll_at,
+                "breaker_state": state.breaker_state or "closed",
+                "consecutive_failures": state.consecutive_failures or 0,
+                "breaker_open_until": state.breaker_open_until,
+                "last_error": state.last_error,
+                "last_status": state.last_status,
+                "last_fetched_at": state.last_fetched_at
+            }
+            for state in states
+        ]
+
+    def _is_due(self, state: Optional[FeedFetchState], now: datetime, ignore_schedule: bool = False) -> bool:
+        if state is None:
+            return True
+        if not self._breaker(state).allow(_epoch(now)):
+            return False
+        return ignore_schedule or state.next_poll_at is None or state.next_poll_at <= now
+
+    def _publish_interval(self, publish_times: List[datetime]) -> Optional[float]:
+        """Median gap in seconds between distinct item timestamps, if there are enough"""
+        times = sorted(set(publish_times))
+        gaps = [(later - earlier).total_seconds() for earlier, later in zip(times, times[1:])]
+        if len(gaps) < 2:
+            return None
+        return statistics.median(gaps)
+
+    def _breaker(self, state: FeedFetchState) -> CircuitBreaker:
+        return CircuitBreaker(
+            failure_threshold=settings.FEED_BREAKER_FAILURE_THRESHOLD,
+            base_backoff=settings.FEED_BREAKER_BASE_BACKOFF_MINUTES * 60,
+            max_backoff=settings.FEED_BREAKER_MAX_BACKOFF_MINUTES * 60,
+            state=state.breaker_state,
+            failures=state.consecutive_failures,
+            trips=state.breaker_trips,
+            open_until=_epoch(state.breaker_open_until) if state.breaker_open_until else None
+        )
+
+    def _save_breaker(self, state: FeedFetchState, breaker: CircuitBreaker):
+        state.breaker_state = breaker.state
+        state.consecutive_failures = breaker.failures
+        state.breaker_trips = breaker.trips
+        state.breaker_open_until = datetime.utcfromtimestamp(breaker.open_until) if breaker.open_until else None
+
+    def _get_or_create(self, db: Session, feed_key: str, source: str) -> FeedFetchState:
+        state = db.query(FeedFetchState).filter(FeedFetchState.feed_url == feed_key).first()
+        if not state:
+            state = FeedFetchState(feed_url=feed_key, source=source)
+            db.add(state)
+        return state
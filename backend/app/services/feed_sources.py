@@ -0,0 +1,185 @@
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Any, List, Dict, Optional
+from urllib.parse import urlsplit
+import asyncio
+import ipaddress
+import json
+import socket
+from app.core.response_cache import FEED_SOURCES, response_cache
+from app.models.database import FeedSource
+
+GOOGLE_NEWS_PARAMS = {
+    'q': '(technology OR "artificial intelligence" OR "machine learning" OR "tech company") (site:wired.com OR "wired")',
+    'hl': 'en-US',
+    'gl': 'US',
+    'ceid': 'US:en'
+}
+
+# Seeded into an empty feed_sources table; after that the table is the source of truth
+DEFAULT_FEED_SOURCES = [
+    {"name": "Google News", "source": "google_news", "url": "https://news.google.com/rss/search", "params": GOOGLE_NEWS_PARAMS, "parser": "google_news", "limit": 15, "require_breaking": True},
+    {"name": "Wired.com", "source": "wired.com", "url": "https://www.wired.com/feed/rss"},
+    {"name": "TechCrunch", "source": "techcrunch.com", "url": "https://techcrunch.com/feed/"},
+    {"name": "The Verge", "source": "theverge.com", "url": "https://www.theverge.com/rss/index.xml"},
+    {"name": "Ars Technica", "source": "arstechnica.com", "url": "https://feeds.arstechnica.com/arstechnica/index"},
+    {"name": "Engadget", "source": "engadget.com", "url": "https://www.engadget.com/rss.xml"},
+    {"name": "MIT Technology Review", "source": "technologyreview.com", "url": "https://www.technologyreview.com/feed/"},
+    {"name": "CNET", "source": "cnet.com", "url": "https://www.cnet.com/rss/news/"},
+    {"name": "VentureBeat", "source": "venturebeat.com", "url": "https://venturebeat.com/feed/"},
+    {"name": "TechRepublic", "source": "techrepublic.com", "url": "https://www.techrepublic.com/rssfeeds/articles/"},
+]
+
+PARSERS = ("rss", "google_news")
+
+FEED_URL_SCHEMES = ("http", "https")
+
+# Fields update_source may change; only poll_interval_minutes may be cleared (back to adaptive)
+UPDATABLE_FIELDS = ("url", "parser", "limit", "require_breaking", "poll_interval_minutes", "enabled")
+NULLABLE_FIELDS = ("poll_interval_minutes",)
+
+
+async def validate_feed_url(url: str):
+    """Raise ValueError unless `url` is an http(s) URL whose host resolves only to public addresses.
+
+    The scheduler fetches every source on each poll, so a source must not point it at
+    loopback, private, link-local or otherwise internal hosts.
+    """
+    parts = urlsplit(url or "")
+    if parts.scheme not in FEED_URL_SCHEMES:
+        raise ValueError(f"Feed URL must use {' or '.join(FEED_URL_SCHEMES)}")
+    if not parts.hostname:
+        raise ValueError("Feed URL has no host")
+    try:
+        # The loop's getaddrinfo runs the lookup in its default executor, off the event loop
+        infos = await asyncio.get_running_loop().getaddrinfo(parts.hostname, parts.port or None, proto=socket.IPPROTO_TCP)
+        addresses = {info[4][0] for info in infos}
+    except (socket.gaierror, UnicodeError, ValueError):
+        raise ValueError(f"Feed host '{parts.hostname}' cannot be resolved")
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])
+        if not ip.is_global or ip.is_multicast:
+            raise ValueError(f"Feed host '{parts.hostname}' resolves to a non-public address ({ip})")
+
+
+def validate_parser(parser: str):
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown parser '{parser}'; expected one of {', '.join(PARSERS)}")
+
+
+class FeedSourceRegistry:
+    """The feeds to ingest, stored in the feed_sources table.
+
+    Sources are handed to the ingestion runner as plain dicts (name, source, url, params,
+    parser, limit, require_breaking, poll_interval_minutes) so they can be used after the
+    session that loaded them is gone.
+    """
+
+    def get_sources(self, db: Session, enabled_only: bool = True) -> List[Dict]:
+        """All configured sources, seeding the defaults into an empty table first"""
+        query = db.query(FeedSource)
+        if query.first() is None:
+            self.seed_defaults(db)
+        if enabled_only:
+            query = query.filter(FeedSource.enabled == True)
+        return [self._to_dict(source) for source in query.order_by(FeedSource.id).all()]
+
+    def get_source(self, db: Session, key: str) -> Optional[Dict]:
+        """Look a source up by display name or source label"""
+        self.get_sources(db, enabled_only=False)
+        source = db.query(FeedSource).filter((FeedSource.name == key) | (FeedSource.source == key)).first()
+        return self._to_dict(source) if source else None
+
+    def seed_defaults(self, db: Session):
+        for default in DEFAULT_FEED_SOURCES:
+            db.add(FeedSource(
+                name=default["name"],
+                source=default["source"],
+                url=default["url"],
+                params=json.dumps(default["params"]) if default.get("params") else None,
+                parser=default.get("parser", "rss"),
+                item_limit=default.get("limit", 15),
+                require_breaking=default.get("require_breaking", False),
+                enabled=True
+            ))
+        db.commit()
+        response_cache.invalidate(FEED_SOURCES)
+        print(f"Seeded {len(DEFAULT_FEED_SOURCES)} default feed sources")
+
+    async def create_source(
+        self,
+        db: Session,
+        name: str,
+        source: str,
+        url: str,
+        params: Optional[Dict] = None,
+        parser: str = "rss",
+        limit: int = 15,
+        require_breaking: bool = False,
+        poll_interval_minutes: Optional[float] = None,
+        enabled: bool = True
+    ) -> Dict:
+        validate_parser(parser)
+        await validate_feed_url(url)
+        feed_source = FeedSource(
+            name=name,
+            source=source,
+            url=url,
+            params=json.dumps(params) if params else None,
+            parser=parser,
+            item_limit=limit,
+            require_breaking=require_breaking,
+            poll_interval_minutes=poll_interval_minutes,
+            enabled=enabled
+        )
+        db.add(feed_source)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise ValueError(f"Feed source name '{name}' already exists")
+        response_cache.invalidate(FEED_SOURCES)
+        db.refresh(feed_source)
+        return self._to_dict(feed_source)
+
+    async def update_source(self, db: Session, source_id: int, changes: Dict[str, Any]) -> Optional[Dict]:
+        """Apply the fields present in `changes` (see UPDATABLE_FIELDS).
+
+        A field left out is kept; poll_interval_minutes set to None returns the source to
+        adaptive polling.
+        """
+        unknown = set(changes) - set(UPDATABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot update {', '.join(sorted(unknown))}")
+        for field, value in changes.items():
+            if value is None and field not in NULLABLE_FIELDS:
+                raise ValueError(f"{field} cannot be empty")
+        if "parser" in changes:
+            validate_parser(changes["parser"])
+        if "url" in changes:
+            await validate_feed_url(changes["url"])
+
+        feed_source = db.query(FeedSource).filter(FeedSource.id == source_id).first()
+        if not feed_source:
+            return None
+        columns = {"limit": "item_limit"}
+        for field, value in changes.items():
+            setattr(feed_source, columns.get(field, field), value)
+        db.commit()
+        response_cache.invalidate(FEED_SOURCES)
+        db.refresh(feed_source)
+        return self._to_dict(feed_source)
+
+    def _to_dict(self, source: FeedSource) -> Dict:
+        return {
+            "id": source.id,
+            "name": source.name,
+            "source": source.source,
+            "url": source.url,
+            "params": json.loads(source.params) if source.params else None,
+            "parser": source.parser or "rss",
+            "limit": source.item_limit or 15,
+            "require_breaking": bool(source.require_breaking),
+            "poll_interval_minutes": source.poll_interval_minutes,
+            "enabled": bool(source.enabled)
+        }
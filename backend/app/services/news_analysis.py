@@ -0,0 +1,180 @@
+from typing import Dict, List, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+from app.ai.content_generator import AIContentGenerator
+from app.core.config import settings
+from app.core.response_cache import BREAKING_NEWS, response_cache
+from app.models.database import BreakingNews
+
+
+class NewsAnalysisService:
+    """Scores breaking news importance in batches, committing after each batch.
+
+    The backlog of unanalyzed rows is walked in id order, ANALYSIS_BATCH_SIZE rows at a
+    time, so a crash loses at most one batch and the next run picks up where this one
+    stopped. Each batch is scored in one call; copies of a story already analyzed (from
+    another source) reuse that analysis instead. Large backlogs are scored across a
+    process pool. Every analysis is stamped with the analyzer version, and rows from an
+    older version are rescored the same way by `rescore_stale`.
+    """
+
+    def __init__(
+        self,
+        ai_generator: Optional[AIContentGenerator] = None,
+        batch_size: Optional[int] = None,
+        process_workers: Optional[int] = None,
+        process_min_items: Optional[int] = None
+    ):
+        self.ai_generator = ai_generator or AIContentGenerator()
+        self.batch_size = batch_size or settings.ANALYSIS_BATCH_SIZE
+        self.process_workers = process_workers if process_workers is not None else settings.ANALYSIS_PROCESS_WORKERS
+        self.process_min_items = process_min_items if process_min_items is not None else settings.ANALYSIS_PROCESS_MIN_ITEMS
+
+    async def analyze_pending(self, db: Session, max_items: Optional[int] = None) -> Dict:
+        """Analyze every stored item without an analysis yet (up to `max_items`)"""
+        return await self._analyze_matching(db, BreakingNews.ai_analysis.is_(None), max_items)
+
+    async def rescore_stale(self, db: Session, max_items: Optional[int] = None) -> Dict:
+        """Re-analyze items analyzed by an older analyzer version (up to `max_items`).
+
+        Rescored rows get the current version and drop out of the stale set, so repeated
+        runs work through a large backlog a chunk at a time.
+        """
+        totals = await self._analyze_matching(db, self.stale_filter(), max_items)
+        totals["analyzer_version"] = self.ai_generator.analyzer_version
+        return totals
+
+    def stale_filter(self):
+        """Analyzed rows whose analysis did not come from the current analyzer version"""
+        return and_(
+            BreakingNews.ai_analysis.isnot(None),
+            or_(
+                BreakingNews.analyzer_version.is_(None),
+                BreakingNews.analyzer_version != self.ai_generator.analyzer_version
+            )
+        )
+
+    def get_version_stats(self, db: Session) -> Dict:
+        """Analyzed rows per analyzer version, and how many are stale or not analyzed yet"""
+        versions = db.query(BreakingNews.analyzer_version, func.count(BreakingNews.id)).filter(
+            BreakingNews.ai_analysis.isnot(None)
+        ).group_by(BreakingNews.analyzer_version).all()
+        current = self.ai_generator.analyzer_version
+        return {
+            "analyzer_version": current,
+            "versions": {version or "unversioned": count for version, count in versions},
+            "stale": sum(count for version, count in versions if version != current),
+            "unanalyzed": db.query(BreakingNews.id).filter(BreakingNews.ai_analysis.is_(None)).count()
+        }
+
+    async def _analyze_matching(self, db: Session, condition, max_items: Optional[int]) -> Dict:
+        """Analyze the rows matching `condition` in id order, committing batch by batch"""
+        pending = db.query(BreakingNews.id).filter(condition).count()
+        if max_items is not None:
+            pending = min(pending, max_items)
+        totals = {"pending": pending, "analyzed": 0, "reused": 0, "failed": 0, "batches": 0, "process_pool": False}
+        if not pending:
+            return totals
+
+        executor = None
+        # The TF-IDF model scores a whole batch in one product; only the rules need processes
+        if self.process_workers > 1 and pending >= self.process_min_items and self.ai_generator.tfidf_model is None:
+            executor = ProcessPoolExecutor(max_workers=self.process_workers)
+            totals["process_pool"] = True
+        try:
+            last_id = 0
+            remaining = pending
+            while remaining > 0:
+                batch = db.query(BreakingNews).filter(
+                    condition,
+                    BreakingNews.id > last_id
+                ).order_by(BreakingNews.id).limit(min(self.batch_size, remaining)).all()
+                if not batch:
+                    break
+                last_id = batch[-1].id
+                remaining -= len(batch)
+                result = await self.analyze_items(db, batch, executor)
+                for key in ("analyzed", "reused", "failed"):
+                    totals[key] += result[key]
+                totals["batches"] += 1
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return totals
+
+    async def analyze_items(self, db: Session, news_items: List[BreakingNews], executor: Optional[Executor] = None) -> Dict:
+        """Score one batch of rows in a single call and commit their analyses together"""
+        cluster_analyses = self.cluster_analyses(db, {news.cluster_key for news in news_items if news.cluster_key is not None})
+
+        # One item per story cluster is scored; the other copies take its analysis
+        to_score = []
+        scheduled = set()
+        for news in news_items:
+            if news.cluster_key is None:
+                to_score.append(news)
+            elif news.cluster_key not in cluster_analyses and news.cluster_key not in scheduled:
+                scheduled.add(news.cluster_key)
+                to_score.append(news)
+
+        try:
+            analyses = await self.ai_generator.analyze_breaking_news_batch(
+                [(news.title, news.content) for news in to_score],
+                executor=executor,
+                workers=self.process_workers
+            )
+        except Exception as e:
+            print(f"Error analyzing a batch of {len(to_score)} breaking news items: {e}")
+            return {"analyzed": 0, "reused": 0, "failed": len(news_items)}
+
+        scored = {}
+        for news, analysis in zip(to_score, analyses):
+            scored[news.id] = analysis
+            if news.cluster_key is not None:
+                cluster_analyses[news.cluster_key] = analysis
+
+        reused = 0
+        for news in news_items:
+            analysis = scored.get(news.id)
+            if analysis is None:
+                analysis = cluster_analyses[news.cluster_key]
+                reused += 1
+            self.apply_analysis(news, analysis)
+
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        response_cache.invalidate(BREAKING_NEWS)
+        return {"analyzed": len(scored), "reused": reused, "failed": 0}
+
+    def cluster_analyses(self, db: Session, cluster_keys: set) -> Dict[int, Dict]:
+        """Analysis of an already analyzed item for each story cluster, keyed by cluster"""
+        analyses = {}
+        if not cluster_keys:
+            return analyses
+        # Only analyses from the current analyzer; stale ones are being rescored
+        analyzed = db.query(BreakingNews).filter(
+            BreakingNews.cluster_key.in_(cluster_keys),
+            BreakingNews.ai_analysis.isnot(None),
+            BreakingNews.analyzer_version == self.ai_generator.analyzer_version
+        ).all()
+        for news in analyzed:
+            analyses.setdefault(news.cluster_key, {
+                "importance_score": news.importance_score,
+                "is_critical": news.is_critical,
+                "reason": news.ai_analysis,
+                "sentiment": news.sentiment,
+                "impact_level": news.impact_level
+            })
+        return analyses
+
+    def apply_analysis(self, news: BreakingNews, analysis: Dict):
+        """Copy an analysis onto a row, stamped with the current analyzer version"""
+        news.importance_score = analysis.get("importance_score", 0.5)
+        news.is_critical = analysis.get("is_critical", False)
+        news.ai_analysis = analysis.get("reason", "")
+        news.sentiment = analysis.get("sentiment", "neutral")
+        news.impact_level = analysis.get("impact_level", "medium")
+        news.analyzer_version = self.ai_generator.analyzer_version
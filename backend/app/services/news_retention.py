@@ -0,0 +1,156 @@
+from typing import Dict, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import DateTime, and_, exists, func, insert, literal, or_, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.response_cache import BREAKING_NEWS, response_cache
+from app.models.database import BreakingNews, BreakingNewsArchive
+
+# The hot queries look back 48 hours; never archive anything they can still return
+MIN_RETENTION_DAYS = 2.0
+
+# Columns copied as they are; archived_at is set by the job
+ARCHIVED_COLUMNS = [column.name for column in BreakingNews.__table__.columns]
+
+
+class NewsRetentionService:
+    """Keeps breaking_news small by moving old rows to breaking_news_archive.
+
+    Rows are moved in batches of ids, each batch copied and deleted in one transaction,
+    so the job never holds a long lock and can be stopped at any point. Copies ignore
+    ids already archived, which makes a rerun (or two workers running it at once) safe.
+    A row is only deleted once the archive holds its copy (same id, url and created_at):
+    SQLite hands a freed id out again, and a new row reusing an archived id is left in
+    place and reported as a conflict rather than deleted uncopied.
+    """
+
+    def __init__(self, retention_days: Optional[float] = None, batch_size: Optional[int] = None):
+        self.retention_days = retention_days if retention_days is not None else settings.BREAKING_NEWS_RETENTION_DAYS
+        self.batch_size = batch_size or settings.BREAKING_NEWS_ARCHIVE_BATCH_SIZE
+
+    def archive_old_news(self, db: Session, retention_days: Optional[float] = None, max_batches: Optional[int] = None) -> Dict:
+        """Move rows published more than `retention_days` ago into the archive"""
+        days = retention_days if retention_days is not None else self.retention_days
+        if days < MIN_RETENTION_DAYS:
+            raise ValueError(f"Retention must be at least {MIN_RETENTION_DAYS:g} days")
+
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        archived = 0
+        conflicts = 0
+        batches = 0
+        last_id = 0
+        while max_batches is None or batches < max_batches:
+            ids = [
+                news_id for (news_id,) in db.query(BreakingNews.id).filter(
+                    or_(
+                        BreakingNews.published_at < cutoff,
+                        # No parseable publish date: age by when the row was stored
+                        and_(BreakingNews.published_at.is_(None), BreakingNews.created_at < cutoff)
+                    ),
+                    BreakingNews.id > last_id
+                ).order_by(BreakingNews.id).limit(self.batch_size)
+            ]
+            if not ids:
+                break
+            last_id = ids[-1]
+            try:
+                rows = select(
+                    *(BreakingNews.__table__.c[name] for name in ARCHIVED_COLUMNS),
+                    literal(datetime.utcnow(), DateTime).label("archived_at")
+                ).where(BreakingNews.id.in_(ids))
+                db.execute(self._insert_ignoring_archived(db).from_select(ARCHIVED_COLUMNS + ["archived_at"], rows))
+                deleted = db.query(BreakingNews).filter(
+                    BreakingNews.id.in_(ids),
+                    self._archived_copy_exists()
+                ).delete(synchronize_session=False)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            archived += deleted
+            conflicts += len(ids) - deleted
+            batches += 1
+
+        if archived:
+            response_cache.invalidate(BREAKING_NEWS)
+        if conflicts:
+            print(f"Left {conflicts} breaking news items in place: their ids are taken in breaking_news_archive by other rows")
+        return {"archived": archived, "conflicts": conflicts, "batches": batches, "cutoff": cutoff, "retention_days": days}
+
+    def _archived_copy_exists(self):
+        """The archive holds this breaking_news row itself, not another row with its id"""
+        archive = BreakingNewsArchive
+        return exists().where(
+            archive.id == BreakingNews.id,
+            or_(archive.url == BreakingNews.url, and_(archive.url.is_(None), BreakingNews.url.is_(None))),
+            or_(archive.created_at == BreakingNews.created_at, and_(archive.created_at.is_(None), BreakingNews.created_at.is_(None)))
+        )
+
+    def _insert_ignoring_archived(self, db: Session):
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            return sqlite_insert(BreakingNewsArchive).on_conflict_do_nothing(index_elements=["id"])
+        if dialect == "postgresql":
+            return postgresql_insert(BreakingNewsArchive).on_conflict_do_nothing(index_elements=["id"])
+        return insert(BreakingNewsArchive)
+
+    def get_history(
+        self,
+        db: Session,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        source: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> Dict:
+        """Archived breaking news, newest first, with the total matching count"""
+        query = db.query(BreakingNewsArchive)
+        if start is not None:
+            query = query.filter(BreakingNewsArchive.published_at >= start)
+        if end is not None:
+            query = query.filter(BreakingNewsArchive.published_at < end)
+        if source:
+            query = query.filter(BreakingNewsArchive.source == source)
+        if category:
+            query = query.filter(BreakingNewsArchive.category == category)
+
+        total = query.count()
+        items = query.order_by(BreakingNewsArchive.published_at.desc().nulls_last()).offset(offset).limit(limit).all()
+        return {"total": total, "items": [self._to_dict(item) for item in items]}
+
+    def get_stats(self, db: Session) -> Dict:
+        """Row counts and date ranges of the hot and archive tables"""
+        hot_count, hot_oldest = db.query(func.count(BreakingNews.id), func.min(BreakingNews.published_at)).one()
+        archive_count, archive_oldest, archive_newest = db.query(
+            func.count(BreakingNewsArchive.id),
+            func.min(BreakingNewsArchive.published_at),
+            func.max(BreakingNewsArchive.published_at)
+        ).one()
+        return {
+            "retention_days": self.retention_days,
+            "hot_rows": hot_count,
+            "hot_oldest": hot_oldest,
+            "archived_rows": archive_count,
+            "archive_oldest": archive_oldest,
+            "archive_newest": archive_newest
+        }
+
+    def _to_dict(self, item: BreakingNewsArchive) -> Dict:
+        return {
+            "id": item.id,
+            "title": item.title,
+            "content": item.content,
+            "source": item.source,
+            "url": item.url,
+            "category": item.category,
+            "importance_score": item.importance_score,
+            "is_critical": item.is_critical,
+            "sentiment": item.sentiment,
+            "impact_level": item.impact_level,
+            "published_at": item.published_at,
+            "ai_analysis": item.ai_analysis,
+            "archived_at": item.archived_at
+        }
@@ -0,0 +1,116 @@
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+import asyncio
+import time
+
+# Marks the end of a stage's input
+_DONE = object()
+
+Handler = Callable[[Any], AsyncIterator[Any]]
+
+
+def in_executor(func: Callable[[Any], Any]) -> Handler:
+    """Stage handler that runs a blocking function in the loop's thread pool.
+
+    The result is passed on unless it is None, so CPU-bound work (parsing, classifying)
+    overlaps with the network waits of the other stages.
+    """
+    async def handler(item):
+        result = await asyncio.get_running_loop().run_in_executor(None, func, item)
+        if result is not None:
+            yield result
+    return handler
+
+
+class Stage:
+    """One step of a pipeline: an async generator handler run by `workers` tasks.
+
+    The handler receives one item and yields any number of items for the next stage.
+    """
+
+    def __init__(self, name: str, handler: Handler, workers: int = 1, queue_size: Optional[int] = None):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue_size = queue_size
+
+
+class Pipeline:
+    """Stages connected by bounded queues.
+
+    A stage that falls behind fills its input queue, which blocks the stage before it on
+    put, so a slow step (article enrichment) slows intake instead of buffering without
+    limit. Per-stage counters are returned by `run`:
+
+    - items_in / items_out / errors: items received, yielded and failed
+    - busy_seconds: time spent in the handler
+    - blocked_seconds: time spent waiting for room in the next stage's queue
+    - max_queue: deepest the stage's input queue got
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 32, on_error: Optional[Callable[[str, Any, Exception], None]] = None):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.on_error = on_error
+
+    async def run(self, items: Iterable[Any]) -> Dict[str, Dict]:
+        """Push `items` through every stage and wait until the last stage is done"""
+        queues = [asyncio.Queue(maxsize=stage.queue_size or self.queue_size) for stage in self.stages]
+        stats = {
+            stage.name: {"items_in": 0, "items_out": 0, "errors": 0, "busy_seconds": 0.0, "blocked_seconds": 0.0, "max_queue": 0}
+            for stage in self.stages
+        }
+        workers = [
+            [asyncio.create_task(self._worker(index, queues, stats)) for _ in range(stage.workers)]
+            for index, stage in enumerate(self.stages)
+        ]
+
+        try:
+            for item in items:
+                await queues[0].put(item)
+                self._track_depth(stats[self.stages[0].name], queues[0])
+            # Close each stage once everything upstream of it has finished
+            for index, stage_workers in enumerate(workers):
+                for _ in stage_workers:
+                    await queues[index].put(_DONE)
+                await asyncio.gather(*stage_workers)
+        finally:
+            for task in (task for stage_workers in workers for task in stage_workers):
+                task.cancel()
+            await asyncio.gather(*(task for stage_workers in workers for task in stage_workers), return_exceptions=True)
+
+        for stage_stats in stats.values():
+            stage_stats["busy_seconds"] = round(stage_stats["busy_seconds"], 3)
+            stage_stats["blocked_seconds"] = round(stage_stats["blocked_seconds"], 3)
+        return stats
+
+    async def _worker(self, index: int, queues: List[asyncio.Queue], stats: Dict[str, Dict]):
+        stage = self.stages[index]
+        stage_stats = stats[stage.name]
+        output = queues[index + 1] if index + 1 < len(queues) else None
+
+        while True:
+            item = await queues[index].get()
+            if item is _DONE:
+                return
+            stage_stats["items_in"] += 1
+            resumed = time.perf_counter()
+            try:
+                async for result in stage.handler(item):
+                    now = time.perf_counter()
+                    stage_stats["busy_seconds"] += now - resumed
+                    stage_stats["items_out"] += 1
+                    if output is not None:
+                        await output.put(result)
+                        self._track_depth(stats[self.stages[index + 1].name], output)
+                    resumed = time.perf_counter()
+                    stage_stats["blocked_seconds"] += resumed - now
+            except Exception as e:
+                stage_stats["errors"] += 1
+                if self.on_error:
+                    self.on_error(stage.name, item, e)
+                else:
+                    print(f"Pipeline stage {stage.name} failed: {e}")
+            stage_stats["busy_seconds"] += time.perf_counter() - resumed
+
+    def _track_depth(self, stage_stats: Dict, queue: asyncio.Queue):
+        stage_stats["max_queue"] = max(stage_stats["max_queue"], queue.qsize())
@@ -1,122 +1,75 @@
 import asyncio
 import schedule
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 from sqlalchemy.orm import Session
-from app.models.database import SessionLocal, Fact
+from app.core.config import settings
+from app.core.response_cache import STOCKS, response_cache
+from app.models.database import SessionLocal
 from app.services.breaking_news_service import BreakingNewsService
+from app.services.daily_facts import DailyFactService
+from app.services.news_analysis import NewsAnalysisService
+from app.services.news_retention import NewsRetentionService
 from app.services.stock_service import StockService
 from app.ai.content_generator import AIContentGenerator
+from app.ai.inference_client import inference_client
 from app.models.database import BreakingNews
 
 class NewsScheduler:
     def __init__(self):
         self.breaking_news_service = BreakingNewsService()
         self.stock_service = StockService()
+        self.retention_service = NewsRetentionService()
         self.ai_generator = AIContentGenerator()
+        self.analysis_service = NewsAnalysisService(self.ai_generator)
+        self.daily_fact_service = DailyFactService(self.ai_generator)
     
     async def generate_daily_fact(self):
-        """Generate a new daily fact"""
+        """Pre-generate the daily facts for today and the coming days"""
+        db = SessionLocal()
         try:
-            db = SessionLocal()
-            
-            # Check if we already have a fact for today
-            today = datetime.now().date()
-            tomorrow = today + timedelta(days=1)
-            
-            existing_fact = db.query(Fact).filter(
-                Fact.is_active == True,
-                Fact.created_at >= datetime.combine(today, datetime.min.time()),
-                Fact.created_at < datetime.combine(tomorrow, datetime.min.time())
-            ).first()
-            
-            if existing_fact:
-                print(f"[{datetime.now()}] Daily fact already exists for today: {existing_fact.fact_text[:50]}...")
-                db.close()
-                return
-            
-            # Generate new fact
-            print(f"[{datetime.now()}] Generating new daily fact...")
-            fact_data = await self.ai_generator.generate_tech_fact("random")
-            
-            new_fact = Fact(
-                fact_text=fact_data["fact_text"],
-                category=fact_data["category"],
-                source=fact_data["source"]
-            )
-            
-            db.add(new_fact)
-            db.commit()
-            
-            print(f"[{datetime.now()}] Generated daily fact: {fact_data['fact_text'][:50]}...")
+            print(f"[{datetime.now()}] Pre-generating daily facts...")
+            result = await self.daily_fact_service.pregenerate(db)
+            print(f"[{datetime.now()}] Daily facts: {result['missing']} days missing, {result['generated']} generated, "
+                  f"{result['rejected']} rejected, {result['rotation']} from rotation")
             
         except Exception as e:
+            db.rollback()
             print(f"Error generating daily fact: {e}")
             import traceback
             traceback.print_exc()
         finally:
             db.close()
     
-    async def fetch_and_analyze_breaking_news(self):
-        """Fetch breaking news from all sources and analyze with AI"""
+    async def fetch_and_analyze_breaking_news(self, due_only: bool = False):
+        """Fetch breaking news from all sources and analyze with AI.
+
+        With `due_only` only sources whose adaptive poll interval has elapsed are fetched.
+        """
         try:
             db = SessionLocal()
             
             total_fetched = 0
             source_counts = {}
             
-            # Fetch from all 10 news sources
-            sources = [
-                ("Google News", self.breaking_news_service.fetch_google_news),
-                ("Wired.com", self.breaking_news_service.fetch_wired_news),
-                ("TechCrunch", self.breaking_news_service.fetch_techcrunch_news),
-                ("The Verge", self.breaking_news_service.fetch_theverge_news),
-                ("Ars Technica", self.breaking_news_service.fetch_arstechnica_news),
-                ("Engadget", self.breaking_news_service.fetch_engadget_news),
-                ("MIT Technology Review", self.breaking_news_service.fetch_mit_tech_review_news),
-                ("CNET", self.breaking_news_service.fetch_cnet_news),
-                ("VentureBeat", self.breaking_news_service.fetch_venturebeat_news),
-                ("TechRepublic", self.breaking_news_service.fetch_techrepublic_news),
-            ]
-            
-            for source_name, fetch_func in sources:
-                try:
-                    print(f"[{datetime.now()}] Fetching {source_name}...")
-                    news_items = await fetch_func(db)
-                    count = len(news_items)
-                    total_fetched += count
-                    source_counts[source_name] = count
-                    print(f"[{datetime.now()}] Fetched {count} items from {source_name}")
-                except Exception as e:
-                    print(f"[{datetime.now()}] Error fetching {source_name}: {e}")
-                    source_counts[source_name] = 0
-                    continue
-            
-            # Analyze importance for new breaking news
-            breaking_news = db.query(BreakingNews).filter(
-                BreakingNews.ai_analysis.is_(None)
-            ).all()
-            
-            for news in breaking_news:
-                try:
-                    analysis = await self.ai_generator.analyze_breaking_news_importance(
-                        news.title, 
-                        news.content
-                    )
-                    
-                    news.importance_score = analysis.get("importance_score", 0.5)
-                    news.is_critical = analysis.get("is_critical", False)
-                    news.ai_analysis = analysis.get("reason", "")
-                    news.sentiment = analysis.get("sentiment", "neutral")
-                    news.impact_level = analysis.get("impact_level", "medium")
-                    
-                    print(f"[{datetime.now()}] Analyzed: {news.title[:50]}... (Score: {news.importance_score:.2f})")
-                    
-                except Exception as e:
-                    print(f"Error analyzing news {news.id}: {e}")
-                    continue
-            
-            db.commit()
+            if settings.BREAKING_NEWS_CONCURRENT_FETCH:
+                results = await self.breaking_news_service.fetch_all_sources(db, due_only=due_only)
+                if results:
+                    print(f"[{datetime.now()}] Fetched {len(results)} due sources concurrently")
+            else:
+                results = await self.breaking_news_service.fetch_sources_sequentially(db, due_only=due_only)
+            for source_name, news_items in results.items():
+                count = len(news_items)
+                total_fetched += count
+                source_counts[source_name] = count
+                print(f"[{datetime.now()}] Fetched {count} items from {source_name}")
+            
+            # Analyze importance for new breaking news, committing batch by batch
+            analysis = await self.analysis_service.analyze_pending(db)
+            if analysis["pending"]:
+                print(f"[{datetime.now()}] Analyzed {analysis['analyzed']} breaking news items in {analysis['batches']} batches"
+                      f"{' on a process pool' if analysis['process_pool'] else ''}"
+                      f" (reused story cluster analysis for {analysis['reused']}, {analysis['failed']} failed)")
             source_summary = ", ".join([f"{name}: {count}" for name, count in source_counts.items()])
             print(f"[{datetime.now()}] Completed breaking news update. Total fetched: {total_fetched} items ({source_summary})")
             
@@ -127,6 +80,34 @@ class NewsScheduler:
         finally:
             db.close()
     
+    async def rescore_stale_analyses(self):
+        """Re-analyze a chunk of breaking news scored by an older analyzer version"""
+        db = SessionLocal()
+        try:
+            result = await self.analysis_service.rescore_stale(db, max_items=settings.ANALYSIS_RESCORE_MAX_ITEMS)
+            if result["pending"]:
+                print(f"[{datetime.now()}] Rescored {result['analyzed']} stale breaking news analyses to {result['analyzer_version']}"
+                      f" (reused {result['reused']}, {result['failed']} failed)")
+        except Exception as e:
+            print(f"Error rescoring breaking news analyses: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            db.close()
+    
+    def archive_old_breaking_news(self):
+        """Move breaking news older than the retention window to the archive table"""
+        db = SessionLocal()
+        try:
+            result = self.retention_service.archive_old_news(db)
+            print(f"[{datetime.now()}] Archived {result['archived']} breaking news items published before {result['cutoff']:%Y-%m-%d %H:%M}")
+        except Exception as e:
+            print(f"Error archiving breaking news: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            db.close()
+    
     async def update_daily_stocks(self):
         """Update stock data daily"""
         try:
@@ -136,6 +117,7 @@ class NewsScheduler:
             updated_stocks = self.stock_service.update_stock_data(db)
             
             db.commit()
+            response_cache.invalidate(STOCKS)
             print(f"[{datetime.now()}] Updated {len(updated_stocks)} stocks")
             
         except Exception as e:
@@ -145,46 +127,94 @@ class NewsScheduler:
         finally:
             db.close()
     
+    def _news_schedule(self) -> str:
+        """How breaking news is fetched, for the startup message"""
+        if not settings.BREAKING_NEWS_ADAPTIVE_POLLING:
+            return "next news fetch at 06:00 (then 12:00 and every 2 hours)"
+        db = SessionLocal()
+        try:
+            status = self.breaking_news_service.poll_scheduler.get_status(db)
+        except Exception as e:
+            print(f"Could not read the feed poll schedule: {e}")
+            status = []
+        finally:
+            db.close()
+        schedule_text = f"news polled per source on adaptive intervals (checked every {settings.BREAKING_NEWS_POLL_TICK_MINUTES} min"
+        if status:
+            intervals = [source["poll_interval_minutes"] for source in status]
+            due = [source["next_poll_at"] for source in status if source["next_poll_at"]]
+            schedule_text += f"; {len(status)} sources every {min(intervals):g}-{max(intervals):g} min"
+            if due:
+                schedule_text += f", next poll due at {min(due):%H:%M} UTC"
+        return schedule_text + ")"
+    
+    def _run(self, job):
+        """Run a job on a loop of its own, closing that loop's inference session after it"""
+        async def run_job():
+            try:
+                return await job
+            finally:
+                await inference_client.close()
+        return asyncio.run(run_job())
+    
     def start_scheduler(self):
         """Start the news scheduler"""
         print("Starting Breaking News Scheduler...")
         
         # Schedule daily fact generation at midnight (00:00)
         schedule.every().day.at("00:00").do(
-            lambda: asyncio.run(self.generate_daily_fact())
+            lambda: self._run(self.generate_daily_fact())
+        )
+        # Top up the pre-generated facts in between, retrying days a model could not fill
+        schedule.every(settings.FACT_PREGENERATE_EVERY_HOURS).hours.do(
+            lambda: self._run(self.generate_daily_fact())
         )
         
         # Schedule daily stock update at 9:00 AM (market open time)
         schedule.every().day.at("09:00").do(
-            lambda: asyncio.run(self.update_daily_stocks())
+            lambda: self._run(self.update_daily_stocks())
         )
         
-        # Schedule daily news fetch at 6:00 AM (after fact generation)
-        schedule.every().day.at("06:00").do(
-            lambda: asyncio.run(self.fetch_and_analyze_breaking_news())
-        )
+        # Keep the breaking_news table to the retention window
+        schedule.every().day.at(settings.BREAKING_NEWS_ARCHIVE_AT).do(self.archive_old_breaking_news)
         
-        # Also fetch news at noon for updates
-        schedule.every().day.at("12:00").do(
-            lambda: asyncio.run(self.fetch_and_analyze_breaking_news())
+        # Bring analyses from older analyzer versions up to date, a chunk per run
+        schedule.every(settings.ANALYSIS_RESCORE_EVERY_MINUTES).minutes.do(
+            lambda: self._run(self.rescore_stale_analyses())
         )
         
-        # Schedule breaking news fetch every 2 hours during the day
-        schedule.every(2).hours.do(
-            lambda: asyncio.run(self.fetch_and_analyze_breaking_news())
-        )
+        if settings.BREAKING_NEWS_ADAPTIVE_POLLING:
+            # Each source is polled on its own interval; the tick only picks up the due ones
+            schedule.every(settings.BREAKING_NEWS_POLL_TICK_MINUTES).minutes.do(
+                lambda: self._run(self.fetch_and_analyze_breaking_news(due_only=True))
+            )
+        else:
+            # Schedule daily news fetch at 6:00 AM (after fact generation)
+            schedule.every().day.at("06:00").do(
+                lambda: self._run(self.fetch_and_analyze_breaking_news())
+            )
+            
+            # Also fetch news at noon for updates
+            schedule.every().day.at("12:00").do(
+                lambda: self._run(self.fetch_and_analyze_breaking_news())
+            )
+            
+            # Schedule breaking news fetch every 2 hours during the day
+            schedule.every(2).hours.do(
+                lambda: self._run(self.fetch_and_analyze_breaking_news())
+            )
         
         # Run initial fetches on startup
         print(f"[{datetime.now()}] Running initial fact generation...")
-        asyncio.run(self.generate_daily_fact())
+        self._run(self.generate_daily_fact())
         
         print(f"[{datetime.now()}] Running initial news fetch...")
-        asyncio.run(self.fetch_and_analyze_breaking_news())
+        self._run(self.fetch_and_analyze_breaking_news(due_only=settings.BREAKING_NEWS_ADAPTIVE_POLLING))
         
         print(f"[{datetime.now()}] Running initial stock update...")
-        asyncio.run(self.update_daily_stocks())
+        self._run(self.update_daily_stocks())
         
-        print(f"[{datetime.now()}] Scheduler started. Next fact generation at 00:00, next news fetch at 06:00, next stock update at 09:00")
+        print(f"[{datetime.now()}] Scheduler started. Next fact generation at 00:00, {self._news_schedule()}, next stock update at 09:00")
         
         # Keep the scheduler running
         while True:
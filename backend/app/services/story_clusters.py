@@ -0,0 +1,149 @@
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import hashlib
+import re
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.database import BreakingNews
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or says said that the "
+    "this to was were will with after over new how why what".split()
+)
+
+FINGERPRINT_BITS = 64
+TITLE_WEIGHT = 3
+CONTENT_TOKENS = 40
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _features(text: str, limit: Optional[int] = None) -> List[str]:
+    tokens = [token for token in _TOKEN.findall(text.lower()) if token not in _STOPWORDS]
+    if limit is not None:
+        tokens = tokens[:limit]
+    # Words and word pairs, so shared phrasing counts for more than a shared vocabulary
+    return tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+
+
+def simhash(title: str, content: Optional[str] = None) -> int:
+    """64-bit SimHash of a story, as a signed integer so it fits a BIGINT column.
+
+    The title dominates (every source rewrites the body, headlines stay close); the
+    opening of the body is mixed in at a lower weight when there is real text.
+    """
+    weights = [0] * FINGERPRINT_BITS
+    weighted = [(feature, TITLE_WEIGHT) for feature in _features(title)]
+    if content:
+        weighted += [(feature, 1) for feature in _features(content, limit=CONTENT_TOKENS)]
+    for feature, weight in weighted:
+        value = _feature_hash(feature)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += weight if value >> bit & 1 else -weight
+
+    fingerprint = sum(1 << bit for bit in range(FINGERPRINT_BITS) if weights[bit] > 0)
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+def hamming_distance(first: int, second: int) -> int:
+    return bin((first ^ second) & 0xFFFFFFFFFFFFFFFF).count("1")
+
+
+class StoryClusterIndex:
+    """LSH index over recent story fingerprints that assigns each new item to a cluster.
+
+    The fingerprint is split into bands; two fingerprints within `max_distance` bits of
+    each other always share at least one band when there are more bands than that, so
+    only items in a matching band bucket are compared. A cluster is keyed by the
+    fingerprint of the first item seen for it, which is stored on every member row.
+
+    Buckets hold each (fingerprint, cluster key) once, so items this process assigned are
+    not added a second time when `sync` reads their rows back.
+    """
+
+    def __init__(self, bands: Optional[int] = None, max_distance: Optional[int] = None, window_hours: Optional[float] = None):
+        self.bands = bands or settings.STORY_CLUSTER_BANDS
+        self.max_distance = max_distance if max_distance is not None else settings.STORY_CLUSTER_MAX_DISTANCE
+        self.window = timedelta(hours=window_hours or settings.STORY_CLUSTER_WINDOW_HOURS)
+        self.band_bits = FINGERPRINT_BITS // self.bands
+        # (band number, band value) -> {(fingerprint, cluster key): newest created_at}
+        self._buckets: Dict[Tuple[int, int], Dict[Tuple[int, int], datetime]] = {}
+        self._last_id = 0
+        self._pruned_at = datetime.utcnow()
+
+    def assign(self, fingerprint: int, created_at: Optional[datetime] = None) -> int:
+        """Cluster key for a fingerprint; it starts its own cluster when nothing is close"""
+        created_at = created_at or datetime.utcnow()
+        cluster_key = self.find(fingerprint)
+        if cluster_key is None:
+            cluster_key = fingerprint
+        self._add(fingerprint, cluster_key, created_at)
+        return cluster_key
+
+    def find(self, fingerprint: int) -> Optional[int]:
+        """Cluster of the nearest indexed fingerprint within max_distance, if any"""
+        best = None
+        for key in self._band_keys(fingerprint):
+            for candidate, cluster_key in self._buckets.get(key, ()):
+                distance = hamming_distance(fingerprint, candidate)
+                if distance <= self.max_distance and (best is None or distance < best[0]):
+                    best = (distance, cluster_key)
+        return best[1] if best else None
+
+    def sync(self, db: Session):
+        """Index rows stored since the last sync, including those written by other workers.
+
+        Recent rows that predate clustering are fingerprinted and given a cluster here too.
+        """
+        now = datetime.utcnow()
+        if now - self._pruned_at > timedelta(hours=1):
+            self._prune(now - self.window)
+
+        rows = db.query(
+            BreakingNews.id, BreakingNews.title, BreakingNews.content,
+            BreakingNews.simhash, BreakingNews.cluster_key, BreakingNews.created_at
+        ).filter(
+            BreakingNews.id > self._last_id,
+            BreakingNews.created_at >= now - self.window
+        ).order_by(BreakingNews.id).all()
+
+        backfilled = 0
+        for row in rows:
+            self._last_id = max(self._last_id, row.id)
+            if row.simhash is not None and row.cluster_key is not None:
+                self._add(row.simhash, row.cluster_key, row.created_at)
+                continue
+            fingerprint = simhash(row.title or "", row.content)
+            cluster_key = self.assign(fingerprint, row.created_at)
+            db.query(BreakingNews).filter(BreakingNews.id == row.id).update(
+                {"simhash": fingerprint, "cluster_key": cluster_key}, synchronize_session=False
+            )
+            backfilled += 1
+        if backfilled:
+            db.commit()
+            print(f"Fingerprinted {backfilled} existing breaking news items into story clusters")
+
+    def _add(self, fingerprint: int, cluster_key: int, created_at: datetime):
+        entry = (fingerprint, cluster_key)
+        for key in self._band_keys(fingerprint):
+            bucket = self._buckets.setdefault(key, {})
+            seen = bucket.get(entry)
+            if seen is None or created_at > seen:
+                bucket[entry] = created_at
+
+    def _band_keys(self, fingerprint: int) -> List[Tuple[int, int]]:
+        unsigned = fingerprint & 0xFFFFFFFFFFFFFFFF
+        mask = (1 << self.band_bits) - 1
+        return [(band, unsigned >> (band * self.band_bits) & mask) for band in range(self.bands)]
+
+    def _prune(self, cutoff: datetime):
+        for key in list(self._buckets):
+            entries = {entry: created_at for entry, created_at in self._buckets[key].items() if created_at >= cutoff}
+            if entries:
+                self._buckets[key] = entries
+            else:
+                del self._buckets[key]
+        self._pruned_at = datetime.utcnow()
@@ -0,0 +1,252 @@
+from typing import Dict, Iterable, Optional, Tuple
+from datetime import datetime, timedelta
+from html import unescape
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import asyncio
+import base64
+import binascii
+import re
+import aiohttp
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.database import UrlRedirect
+
+# Query parameters that only identify a campaign, click or referrer, never the page
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "_ga", "_gl",
+    "mc_cid", "mc_eid", "mbid", "ref", "ref_src", "ref_url", "cmpid", "ocid", "ncid",
+    "taid", "smid", "smtyp", "sr_share", "s_cid", "soc_src", "soc_trk", "wt.mc_id",
+    "guccounter", "guce_referrer", "guce_referrer_sig",
+})
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_", "hsa_")
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_GOOGLE_NEWS_ARTICLE = re.compile(r"^/(?:rss/)?articles/([A-Za-z0-9_-]+)")
+# Publisher link Google News marks in the page it serves when it does not redirect
+_MARKED_LINK = re.compile(rb'data-n-au="([^"]+)"')
+# <link rel="canonical"> and <meta property="og:url">, whatever the attribute order
+_HEAD_TAG = re.compile(rb"<(?:link|meta)\b[^>]*>", re.IGNORECASE)
+_TAG_ATTRIBUTE = re.compile(rb'([A-Za-z:-]+)\s*=\s*"([^"]*)"')
+# Resolutions stored by the old page fallback, which took the page's first outside
+# <a href>; they may point at consent or help pages, so they are resolved again
+LEGACY_PAGE_METHOD = "page"
+_MAX_PAGE_BYTES = 200_000
+
+
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+    """Normalize a link so copies of the same page compare equal.
+
+    Lowercases the scheme and host, drops default ports, the fragment and tracking
+    parameters, and sorts what is left of the query. Anything that is not an http(s)
+    URL is returned unchanged.
+    """
+    url = (url or "").strip()
+    if not url:
+        return url
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    if scheme not in _DEFAULT_PORTS or not host:
+        return url
+
+    if ":" in host:
+        host = f"[{host}]"  # IPv6 literal
+    netloc = host if port is None or port == _DEFAULT_PORTS[scheme] else f"{host}:{port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit((scheme, netloc, parts.path or "/", urlencode(query), ""))
+
+
+def _is_google_host(host: str) -> bool:
+    return host == "google.com" or host.endswith(".google.com")
+
+
+def is_google_news_redirect(url: Optional[str]) -> bool:
+    """True for news.google.com article links, which only redirect to the publisher"""
+    if not url:
+        return False
+    parts = urlsplit(url)
+    return (parts.hostname or "") == "news.google.com" and bool(_GOOGLE_NEWS_ARTICLE.match(parts.path))
+
+
+def decode_google_news_url(url: str) -> Optional[str]:
+    """Publisher URL embedded in a Google News article id, when it is stored there in the clear.
+
+    Older ids are base64 protobufs holding the URL as field 4; newer ids are opaque and
+    return None, so they have to be resolved over the network.
+    """
+    match = _GOOGLE_NEWS_ARTICLE.match(urlsplit(url).path)
+    if not match:
+        return None
+    token = match.group(1)
+    try:
+        data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (binascii.Error, ValueError):
+        return None
+
+    start = data.find(b"http")
+    if start < 0:
+        return None
+    # The URL is preceded by its length as a one or two byte varint after the 0x22 tag
+    if start >= 2 and data[start - 2] == 0x22 and data[start - 1] < 0x80:
+        end = start + data[start - 1]
+    elif start >= 3 and data[start - 3] == 0x22 and data[start - 2] & 0x80:
+        end = start + ((data[start - 2] & 0x7F) | (data[start - 1] << 7))
+    else:
+        end = start
+        while end < len(data) and 0x21 <= data[end] <= 0x7E:
+            end += 1
+    try:
+        candidate = data[start:end].decode("ascii")
+        parts = urlsplit(candidate)
+    except (UnicodeDecodeError, ValueError):
+        return None
+    if parts.scheme not in _DEFAULT_PORTS or not parts.hostname or _is_google_host(parts.hostname):
+        return None
+    return candidate
+
+
+def _marked_page_link(page: bytes) -> Optional[str]:
+    """The article link a Google News page marks explicitly: data-n-au, then canonical/og:url"""
+    match = _MARKED_LINK.search(page)
+    if match:
+        return unescape(match.group(1).decode("utf-8", "replace"))
+    for tag in _HEAD_TAG.finditer(page):
+        attributes = {name.lower(): value for name, value in _TAG_ATTRIBUTE.findall(tag.group(0))}
+        if attributes.get(b"rel", b"").lower() == b"canonical" and attributes.get(b"href"):
+            return unescape(attributes[b"href"].decode("utf-8", "replace"))
+        if attributes.get(b"property", b"").lower() == b"og:url" and attributes.get(b"content"):
+            return unescape(attributes[b"content"].decode("utf-8", "replace"))
+    return None
+
+
+class RedirectResolver:
+    """Resolves redirect links (Google News) to canonical publisher URLs.
+
+    Every answer is kept in the url_redirects table, so a link is resolved once no matter
+    how many polls or workers see it. Ids that carry the URL are decoded without a
+    request; the rest are followed over HTTP. Links that cannot be resolved are recorded
+    too and only retried after URL_RESOLVE_RETRY_HOURS.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        retry_hours: Optional[float] = None
+    ):
+        self.headers = headers or {}
+        self.concurrency = concurrency or settings.URL_RESOLVE_CONCURRENCY
+        self.timeout = timeout or settings.URL_RESOLVE_TIMEOUT_SECONDS
+        self.retry_hours = retry_hours if retry_hours is not None else settings.URL_RESOLVE_RETRY_HOURS
+        self.stats = {"known": 0, "decoded": 0, "fetched": 0, "failed": 0}
+
+    async def resolve(self, db: Session, urls: Iterable[str], session: Optional[aiohttp.ClientSession] = None) -> Dict[str, str]:
+        """Map each resolvable redirect URL to its canonical URL; unresolved ones are left out"""
+        urls = {url for url in urls if url}
+        if not urls:
+            return {}
+
+        now = datetime.utcnow()
+        retry_before = now - timedelta(hours=self.retry_hours)
+        rows = {row.redirect_url: row for row in db.query(UrlRedirect).filter(UrlRedirect.redirect_url.in_(urls))}
+        resolved = {}
+        pending = []
+        for url in urls:
+            row = rows.get(url)
+            if row is not None and row.canonical_url and row.method != LEGACY_PAGE_METHOD:
+                resolved[url] = row.canonical_url
+                self.stats["known"] += 1
+            elif row is None or row.last_attempt_at is None or row.last_attempt_at < retry_before or row.method == LEGACY_PAGE_METHOD:
+                pending.append(url)
+        if not pending:
+            return resolved
+
+        answers: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        to_fetch = []
+        for url in pending:
+            decoded = decode_google_news_url(url)
+            if decoded:
+                answers[url] = (canonicalize_url(decoded), "decoded")
+                self.stats["decoded"] += 1
+            else:
+                to_fetch.append(url)
+        if to_fetch:
+            answers.update(await self._fetch_all(to_fetch, session))
+
+        for url in pending:
+            canonical_url, method = answers.get(url, (None, None))
+            row = rows.get(url)
+            if row is None:
+                row = UrlRedirect(redirect_url=url, attempts=0)
+                db.add(row)
+            row.attempts = (row.attempts or 0) + 1
+            row.last_attempt_at = now
+            if canonical_url:
+                row.canonical_url = canonical_url
+                row.method = method
+                row.resolved_at = now
+                resolved[url] = canonical_url
+            elif row.method == LEGACY_PAGE_METHOD:
+                row.canonical_url = row.method = row.resolved_at = None
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another worker resolved some of the same links first; its rows win
+            db.rollback()
+        return resolved
+
+    async def _fetch_all(self, urls, session: Optional[aiohttp.ClientSession]) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async def fetch(client, url):
+            async with semaphore:
+                try:
+                    return url, await self._follow(client, url, timeout)
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    print(f"Could not resolve {url}: {e}")
+                    return url, (None, None)
+
+        if session is not None:
+            pairs = await asyncio.gather(*(fetch(session, url) for url in urls))
+        else:
+            async with aiohttp.ClientSession(headers=self.headers) as client:
+                pairs = await asyncio.gather(*(fetch(client, url) for url in urls))
+
+        answers = dict(pairs)
+        for canonical_url, _ in answers.values():
+            self.stats["fetched" if canonical_url else "failed"] += 1
+        return answers
+
+    async def _follow(self, session: aiohttp.ClientSession, url: str, timeout: aiohttp.ClientTimeout) -> Tuple[Optional[str], Optional[str]]:
+        """Follow the link's redirects; when it stays on Google, look for the link in the page"""
+        async with session.get(url, headers=self.headers, timeout=timeout, allow_redirects=True) as response:
+            final_host = response.url.host or ""
+            if not _is_google_host(final_host):
+                return canonicalize_url(str(response.url)), "redirect"
+            page = await response.content.read(_MAX_PAGE_BYTES)
+
+        candidate = _marked_page_link(page)
+        if candidate:
+            host = urlsplit(candidate).hostname or ""
+            if host and not _is_google_host(host) and not host.endswith(("gstatic.com", "googleusercontent.com")):
+                return canonicalize_url(candidate), "page_marker"
+        # Anything else on the page (consent, help or video links) is not the article:
+        # leave the link unresolved so it is tried again later
+        return None, None
+
+    def get_stats(self, db: Session) -> Dict:
+        """Size of the persistent redirect map plus this process's resolution counters"""
+        total = db.query(UrlRedirect).count()
+        resolved = db.query(UrlRedirect).filter(UrlRedirect.canonical_url.isnot(None)).count()
+        return {"stored": total, "resolved": resolved, "unresolved": total - resolved, **self.stats}
@@ -0,0 +1 @@
+"""Offline benchmarks for the TechScope Daily backend. Run from backend/ with `python -m benchmarks.<name>`."""
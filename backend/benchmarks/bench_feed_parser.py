@@ -0,0 +1,94 @@
+"""Items/sec of the lxml streaming feed parser against the previous BeautifulSoup parser.
+
+Usage (from backend/):
+    python -m benchmarks.bench_feed_parser [--repeat 20] [--limit 15]
+
+Both parsers extract title, link, pubDate and a cleaned description per item; neither
+touches the database or the network, so the numbers isolate parsing cost.
+"""
+import argparse
+import time
+from typing import Callable, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from app.services.feed_parser import clean_description, iter_feed_items
+from benchmarks.feed_corpus import FEEDS_DIR, load_feeds
+
+
+def legacy_parse(content: bytes, limit: Optional[int]) -> List[Dict]:
+    """The whole-document BeautifulSoup parse used before feed_parser (kept for comparison)"""
+    soup = BeautifulSoup(content, 'xml')
+    items = soup.find_all('item')
+    parsed = []
+    for item in items[:limit]:
+        title_elem = item.find('title')
+        link_elem = item.find('link')
+        pub_date_elem = item.find('pubDate')
+        description_elem = item.find('description')
+
+        description = ""
+        if description_elem:
+            desc_soup = BeautifulSoup(str(description_elem), 'html.parser')
+            for script in desc_soup(["script", "style", "a"]):
+                script.decompose()
+            paragraphs = desc_soup.find_all('p')
+            if paragraphs:
+                description = ' '.join([p.get_text(strip=True) for p in paragraphs[:3] if p.get_text(strip=True)])
+            else:
+                description = desc_soup.get_text(separator=' ', strip=True)
+            description = description.replace('&nbsp;', ' ').replace('&amp;', '&')
+            description = description.replace('&lt;', '<').replace('&gt;', '>')
+            description = description.replace('&quot;', '"').replace('&#39;', "'")
+            description = ' '.join(description.split())
+
+        parsed.append({
+            "title": title_elem.get_text(strip=True) if title_elem else "",
+            "link": link_elem.get_text(strip=True) if link_elem else "",
+            "pub_date": pub_date_elem.get_text(strip=True) if pub_date_elem else "",
+            "description": description
+        })
+    return parsed
+
+
+def streaming_parse(content: bytes, limit: Optional[int]) -> List[Dict]:
+    parsed = []
+    for item in iter_feed_items(content, limit=limit):
+        item["description"] = clean_description(item["description"])
+        parsed.append(item)
+    return parsed
+
+
+def measure(parser: Callable, feeds: Dict[str, bytes], limit: Optional[int], repeat: int) -> Dict[str, float]:
+    items = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for content in feeds.values():
+            items += len(parser(content, limit))
+    elapsed = time.perf_counter() - started
+    return {"items": items, "seconds": elapsed, "items_per_sec": items / elapsed if elapsed else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=None, help="items per feed (default: all)")
+    args = parser.parse_args()
+
+    feeds = load_feeds()
+    corpus = "recorded" if any(FEEDS_DIR.glob("*.xml")) else "synthetic"
+    print(f"Corpus: {len(feeds)} {corpus} feeds, {sum(len(c) for c in feeds.values()) / 1024:.0f} KiB")
+
+    legacy = measure(legacy_parse, feeds, args.limit, args.repeat)
+    streaming = measure(streaming_parse, feeds, args.limit, args.repeat)
+
+    for name, result in (("BeautifulSoup", legacy), ("lxml iterparse", streaming)):
+        print(f"{name:>15}: {result['items']:>6} items in {result['seconds']:.3f}s = {result['items_per_sec']:,.0f} items/sec")
+    if legacy["items_per_sec"]:
+        print(f"{'speedup':>15}: {streaming['items_per_sec'] / legacy['items_per_sec']:.1f}x")
+    if legacy["items"] != streaming["items"]:
+        print("Note: BeautifulSoup only finds RSS <item>s; Atom <entry>s are counted by the streaming parser alone.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Fact generation latency against the stand-in inference server.
+
+Usage (from backend/):
+    python -m benchmarks.bench_inference [--calls 20] [--concurrency 5] [--latency-ms 800]
+                                         [--error-rate 0.1] [--loading-rate 0.05] [--hang-rate 0.05]
+                                         [--down mistralai/Mistral-7B-Instruct-v0.2] [--json results.json]
+
+Runs AIContentGenerator.generate_tech_fact through the pooled inference client while a
+probe task measures how late the event loop wakes it up, which is how long the loop was
+blocked. Reports p50/p99/max call latency, how many facts came from a model versus the
+local fallback, the client's retry/breaker counters and the worst event loop stall.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks.bench_ingestion import percentile
+from benchmarks.inference_server import InferenceServer
+
+_PROBE_INTERVAL = 0.01
+
+
+async def measure(args, api_url: str) -> Dict:
+    from app.ai.content_generator import AIContentGenerator
+    from app.ai.inference_client import InferenceClient
+
+    generator = AIContentGenerator()
+    generator.inference_client = client = InferenceClient(base_url=api_url, deadline=args.deadline)
+
+    stalls: List[float] = []
+    stop = asyncio.Event()
+
+    async def probe():
+        loop = asyncio.get_running_loop()
+        while not stop.is_set():
+            expected = loop.time() + _PROBE_INTERVAL
+            await asyncio.sleep(_PROBE_INTERVAL)
+            stalls.append(max(0.0, loop.time() - expected))
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+    sources: Dict[str, int] = {}
+
+    async def call(index: int):
+        async with semaphore:
+            started = time.perf_counter()
+            fact = await generator.generate_tech_fact(["cs", "ai", "tech", "companies"][index % 4])
+            latencies.append(time.perf_counter() - started)
+            sources[fact["source"]] = sources.get(fact["source"], 0) + 1
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+        await asyncio.gather(*(call(index) for index in range(args.calls)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe_task
+    await client.close()
+
+    return {
+        "calls": args.calls,
+        "seconds": round(elapsed, 2),
+        "latency_p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "latency_p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "latency_max_ms": round(max(latencies) * 1000, 1),
+        "latency_mean_ms": round(statistics.mean(latencies) * 1000, 1),
+        "sources": sources,
+        "max_loop_stall_ms": round(max(stalls, default=0.0) * 1000, 1),
+        "client": client.get_stats()
+    }
+
+
+def print_report(result: Dict):
+    print()
+    print(f"calls:                 {result['calls']} in {result['seconds']:.2f}s")
+    print(f"latency p50/p99/max:   {result['latency_p50_ms']:.0f} / {result['latency_p99_ms']:.0f} / {result['latency_max_ms']:.0f} ms")
+    print(f"max event loop stall:  {result['max_loop_stall_ms']:.1f} ms")
+    for source, count in sorted(result["sources"].items()):
+        print(f"  {source:<30}{count:>5}")
+    client = result["client"]
+    print(f"client:                {client['requests']} requests, {client['retries']} retries, {client['failed']} failed calls, "
+          f"{client['short_circuited']} short-circuited, {client['deadline_exceeded']} past deadline")
+    for model, breaker in client["breakers"].items():
+        print(f"  breaker {model}: {breaker['state']} (trips {breaker['trips']})")
+    print(f"server:                {result['server']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--deadline", type=float, default=None, help="seconds per fact (default INFERENCE_DEADLINE_SECONDS)")
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument("--jitter-ms", type=float, default=300.0)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--loading-rate", type=float, default=0.05)
+    parser.add_argument("--hang-rate", type=float, default=0.05)
+    parser.add_argument("--down", action="append", default=[], help="model that always fails (repeatable)")
+    parser.add_argument("--json", help="also write the results to this file, for comparing runs")
+    parser.add_argument("--verbose", action="store_true", help="show the generator's log output")
+    args = parser.parse_args()
+
+    server = InferenceServer(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        loading_rate=args.loading_rate,
+        hang_rate=args.hang_rate,
+        down_models=args.down
+    ).start()
+    try:
+        result = asyncio.run(measure(args, server.api_url))
+    finally:
+        server.stop()
+    result["server"] = {key: value for key, value in server.stats.items() if key != "by_model"}
+    print_report(result)
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(result, handle, indent=2)
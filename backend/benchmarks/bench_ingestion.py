@@ -0,0 +1,199 @@
+"""End-to-end ingestion benchmark against the replay server.
+
+Usage (from backend/):
+    python -m benchmarks.bench_ingestion [--iterations 3] [--latency-ms 50] [--jitter-ms 25]
+                                         [--error-rate 0.0] [--warm-cache] [--json results.json]
+
+Each iteration runs NewsScheduler.fetch_and_analyze_breaking_news (fetch, parse, store,
+enrich, analyze) on an emptied scratch database, with every feed source pointed at the
+replay server. Reports stored items/sec, p50/p99 latency per source (download start to
+items stored), SQL statements issued, peak RSS and the pipeline's per-stage counters.
+Nothing touches the app's own database or the live publishers.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_benchmark(args) -> Dict:
+    scratch = tempfile.mkdtemp(prefix="techscope-bench-")
+    # Settings are read at import, so the scratch paths must be set before any app import
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(scratch, 'bench.db')}"
+    os.environ["ARTICLE_CACHE_PATH"] = os.path.join(scratch, "article_cache.db")
+
+    from sqlalchemy import event
+
+    from app.models.database import BreakingNews, FeedFetchState, FeedSource, SessionLocal, engine
+    from app.services.article_cache import article_cache
+    from app.services.scheduler import NewsScheduler
+    from app.services.story_clusters import StoryClusterIndex
+    from benchmarks.replay_server import ReplayServer
+
+    server = ReplayServer(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        etags=False
+    ).start()
+
+    scheduler = NewsScheduler()
+    service = scheduler.breaking_news_service
+
+    db = SessionLocal()
+    service.feed_registry.get_sources(db)  # seeds the defaults
+    for feed_source in db.query(FeedSource):
+        if feed_source.source in server.feeds:
+            feed_source.url = server.feed_url(feed_source.source)
+            feed_source.params = None
+        else:
+            feed_source.enabled = False
+    db.commit()
+    db.close()
+
+    statements = {"count": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statement(*_):
+        statements["count"] += 1
+
+    # Per-source latency: from the start of the download to the end of storing its items
+    latencies: Dict[str, List[float]] = {}
+    started_at: Dict[str, float] = {}
+    download_feed = service._download_feed
+    store_feed_rows = service._store_feed_rows
+
+    async def timed_download(session, source, conditional_headers):
+        started_at[source["name"]] = time.perf_counter()
+        return await download_feed(session, source, conditional_headers)
+
+    def timed_store(db, feed, enrichment_jobs):
+        result = store_feed_rows(db, feed, enrichment_jobs)
+        name = feed["source"]["name"]
+        latencies.setdefault(name, []).append(time.perf_counter() - started_at[name])
+        return result
+
+    service._download_feed = timed_download
+    service._store_feed_rows = timed_store
+
+    runs = []
+    try:
+        for iteration in range(args.iterations):
+            db = SessionLocal()
+            db.query(BreakingNews).delete()
+            db.query(FeedFetchState).delete()
+            db.commit()
+            db.close()
+            service.story_clusters = StoryClusterIndex()
+            if not args.warm_cache:
+                with article_cache._lock:
+                    article_cache._connect().execute("DELETE FROM articles")
+                    article_cache._connect().commit()
+
+            statements_before = statements["count"]
+            output = io.StringIO()
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+                asyncio.run(scheduler.fetch_and_analyze_breaking_news())
+            elapsed = time.perf_counter() - started
+
+            db = SessionLocal()
+            stored = db.query(BreakingNews).count()
+            db.close()
+            runs.append({
+                "iteration": iteration + 1,
+                "seconds": round(elapsed, 3),
+                "items": stored,
+                "items_per_sec": round(stored / elapsed, 1) if elapsed else 0.0,
+                "statements": statements["count"] - statements_before
+            })
+            print(f"run {iteration + 1}: {stored} items in {elapsed:.2f}s, {runs[-1]['statements']} SQL statements")
+    finally:
+        server.stop()
+
+    per_source = {
+        name: {
+            "p50_ms": round(percentile(samples, 0.50) * 1000, 1),
+            "p99_ms": round(percentile(samples, 0.99) * 1000, 1),
+            "samples": len(samples)
+        }
+        for name, samples in sorted(latencies.items())
+    }
+    all_samples = [sample for samples in latencies.values() for sample in samples]
+    return {
+        "config": {
+            "iterations": args.iterations,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "warm_cache": args.warm_cache,
+            "feeds": len(server.feeds),
+            "recorded_articles": len(server.articles)
+        },
+        "runs": runs,
+        "items_per_sec": round(statistics.median(run["items_per_sec"] for run in runs), 1),
+        "statements_per_run": round(statistics.median(run["statements"] for run in runs)),
+        "latency_p50_ms": round(percentile(all_samples, 0.50) * 1000, 1),
+        "latency_p99_ms": round(percentile(all_samples, 0.99) * 1000, 1),
+        "per_source": per_source,
+        "pipeline": service.last_pipeline_stats["stages"] if service.last_pipeline_stats else {},
+        "server": server.stats,
+        "peak_rss_mb": round(peak_rss_mb(), 1)
+    }
+
+
+def print_report(result: Dict):
+    print()
+    print(f"items/sec (median):    {result['items_per_sec']:,.1f}")
+    print(f"SQL statements/run:    {result['statements_per_run']:,}")
+    print(f"source latency p50/p99: {result['latency_p50_ms']:.1f} / {result['latency_p99_ms']:.1f} ms")
+    print(f"peak RSS:              {result['peak_rss_mb']:.1f} MB")
+    print(f"replay server:         {result['server']['requests']} requests, {result['server']['errors']} injected errors")
+    print()
+    print(f"{'stage (last run)':<24}{'in':>6}{'out':>6}{'errors':>8}{'busy s':>9}{'blocked s':>11}{'max queue':>11}")
+    for name, row in result["pipeline"].items():
+        print(f"{name:<24}{row['items_in']:>6}{row['items_out']:>6}{row['errors']:>8}{row['busy_seconds']:>9.3f}{row['blocked_seconds']:>11.3f}{row['max_queue']:>11}")
+    print()
+    print(f"{'source':<24}{'p50 ms':>10}{'p99 ms':>10}{'samples':>9}")
+    for name, row in result["per_source"].items():
+        print(f"{name:<24}{row['p50_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['samples']:>9}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=25.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--warm-cache", action="store_true", help="keep the article cache between iterations")
+    parser.add_argument("--json", help="also write the results to this file, for comparing runs")
+    parser.add_argument("--verbose", action="store_true", help="show the scheduler's log output")
+    args = parser.parse_args()
+
+    result = run_benchmark(args)
+    print_report(result)
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(result, handle, indent=2)
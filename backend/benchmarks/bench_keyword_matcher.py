@@ -0,0 +1,109 @@
+"""Throughput of the single-pass keyword matcher against the per-list substring loops it replaced.
+
+Usage (from backend/):
+    python -m benchmarks.bench_keyword_matcher [--repeat 20]
+
+Each text is classified the way ingestion and analysis do it: breaking-news check,
+category, news importance and breaking-news importance/criticality/sentiment.
+"""
+import argparse
+import time
+from typing import Dict, List
+
+from app.ai.keyword_matcher import CATEGORY_ORDER, KEYWORD_GROUPS, keyword_matcher
+from app.services.feed_parser import clean_description, iter_feed_items
+from benchmarks.feed_corpus import load_feeds
+
+
+def legacy_signals(text: str) -> Dict:
+    """The substring loops used before keyword_matcher: one scan per keyword per function"""
+    text = text.lower()
+    breaking_score = 0
+    for indicator in KEYWORD_GROUPS["breaking_indicator"]:
+        if indicator in text:
+            breaking_score += 2
+    for company in KEYWORD_GROUPS["breaking_company"]:
+        if company in text:
+            breaking_score += 3
+    for keyword in KEYWORD_GROUPS["breaking_ai"]:
+        if keyword in text:
+            breaking_score += 2
+
+    category = "tech"
+    for group, name in CATEGORY_ORDER:
+        if any(word in text for word in KEYWORD_GROUPS[group]):
+            category = name
+            break
+
+    news_score = 0.5
+    for keyword in KEYWORD_GROUPS["news_high_importance"]:
+        if keyword in text:
+            news_score += 0.1
+    for company in KEYWORD_GROUPS["major_company"]:
+        if company in text:
+            news_score += 0.15
+    if any(word in text for word in KEYWORD_GROUPS["news_urgent"]):
+        news_score += 0.2
+
+    score = 0.6
+    for keyword in KEYWORD_GROUPS["breaking_high_importance"]:
+        if keyword in text:
+            score += 0.1
+    for company in KEYWORD_GROUPS["major_company"]:
+        if company in text:
+            score += 0.15
+    is_critical = any(indicator in text for indicator in KEYWORD_GROUPS["critical_indicator"])
+    positive = sum(1 for word in KEYWORD_GROUPS["positive"] if word in text)
+    negative = sum(1 for word in KEYWORD_GROUPS["negative"] if word in text)
+    return {"breaking": breaking_score >= 3, "category": category, "news_score": news_score,
+            "score": score, "is_critical": is_critical, "sentiment": (positive > negative) - (negative > positive)}
+
+
+def matcher_signals(text: str) -> Dict:
+    signals = keyword_matcher.scan(text)
+    breaking_score = 2 * signals.count("breaking_indicator") + 3 * signals.count("breaking_company") + 2 * signals.count("breaking_ai")
+    category = next((name for group, name in CATEGORY_ORDER if signals.has(group)), "tech")
+    news_score = 0.5 + 0.1 * signals.count("news_high_importance") + 0.15 * signals.count("major_company") + (0.2 if signals.has("news_urgent") else 0)
+    score = 0.6 + 0.1 * signals.count("breaking_high_importance") + 0.15 * signals.count("major_company")
+    positive, negative = signals.count("positive"), signals.count("negative")
+    return {"breaking": breaking_score >= 3, "category": category, "news_score": news_score,
+            "score": score, "is_critical": signals.has("critical_indicator"), "sentiment": (positive > negative) - (negative > positive)}
+
+
+def load_texts() -> List[str]:
+    texts = []
+    for content in load_feeds().values():
+        for item in iter_feed_items(content):
+            texts.append(f"{item['title']} {clean_description(item['description'])}")
+    return texts
+
+
+def measure(classify, texts: List[str], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            classify(text)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    texts = load_texts()
+    total = len(texts) * args.repeat
+    print(f"Corpus: {len(texts)} texts, avg {sum(len(t) for t in texts) / max(len(texts), 1):.0f} chars, {args.repeat} repeats")
+
+    legacy = measure(legacy_signals, texts, args.repeat)
+    matcher = measure(matcher_signals, texts, args.repeat)
+    print(f"{'substring loops':>16}: {total / legacy:,.0f} texts/sec")
+    print(f"{'keyword matcher':>16}: {total / matcher:,.0f} texts/sec")
+    print(f"{'speedup':>16}: {legacy / matcher:.1f}x")
+
+    category_changes = sum(1 for text in texts if legacy_signals(text)["category"] != matcher_signals(text)["category"])
+    print(f"{'category changes':>16}: {category_changes}/{len(texts)} (substring hits such as 'ai' in 'said' no longer count)")
+
+
+if __name__ == "__main__":
+    main()
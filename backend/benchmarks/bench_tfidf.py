@@ -0,0 +1,72 @@
+"""Batch scoring with the TF-IDF model against the per-item keyword rules.
+
+Usage (from backend/):
+    python -m benchmarks.bench_tfidf [--items 10000] [--max-features 20000]
+
+Labels half of the feed corpus with the rules (as stored analyses would be) and trains the
+model on it, then scores the items both ways. Reports items/sec for each, how the model's
+time splits between building the TF-IDF matrix and the sparse product, and how closely it
+agrees with the rules on the held-out half.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.ai.content_generator import score_breaking_news_batch
+from app.ai.tfidf_scorer import analysis_targets, train
+from benchmarks.bench_keyword_matcher import load_texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--max-features", type=int, default=20000)
+    args = parser.parse_args()
+
+    texts = load_texts()
+    items = [(texts[index % len(texts)], "") for index in range(args.items)]
+    print(f"Corpus: {len(texts)} distinct texts, scoring {len(items)} items")
+
+    started = time.perf_counter()
+    rules = score_breaking_news_batch(items)
+    rules_seconds = time.perf_counter() - started
+
+    # Train on half of the distinct texts; agreement is measured on the other half
+    training = texts[::2]
+    labels = score_breaking_news_batch([(text, "") for text in training])
+    started = time.perf_counter()
+    model = train(
+        training,
+        [analysis_targets(a["importance_score"], a["is_critical"], a["sentiment"]) for a in labels],
+        max_features=args.max_features
+    )
+    train_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    rows = model.transform([f"{title} {content}" for title, content in items])
+    transform_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    rows.dot(model.weights)
+    product_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    analyses = model.analyze(items)
+    model_seconds = time.perf_counter() - started
+
+    held_out = texts[1::2]
+    held_out_rules = score_breaking_news_batch([(text, "") for text in held_out])
+    held_out_model = model.analyze([(text, "") for text in held_out])
+    score_error = np.abs(np.array([a["importance_score"] for a in held_out_model]) - np.array([a["importance_score"] for a in held_out_rules]))
+    print(f"{'rules':>18}: {len(items) / rules_seconds:,.0f} items/sec ({rules_seconds * 1000:.0f} ms)")
+    print(f"{'tfidf':>18}: {len(items) / model_seconds:,.0f} items/sec ({model_seconds * 1000:.0f} ms)")
+    print(f"{'  matrix build':>18}: {transform_seconds * 1000:.1f} ms")
+    print(f"{'  sparse product':>18}: {product_seconds * 1000:.1f} ms")
+    print(f"{'training':>18}: {train_seconds:.2f}s on {len(training)} texts, {len(model.terms)} terms")
+    print(f"Agreement with the rules on {len(held_out)} held-out texts:")
+    print(f"{'score MAE':>18}: {score_error.mean():.3f}")
+    for field in ("is_critical", "sentiment", "impact_level"):
+        agree = sum(1 for a, b in zip(held_out_model, held_out_rules) if a[field] == b[field])
+        print(f"{field + ' agree':>18}: {agree / len(held_out):.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Load the recorded feed and article corpus, falling back to a deterministic synthetic one."""
+from pathlib import Path
+from typing import Dict
+from xml.sax.saxutils import escape
+import hashlib
+import random
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+FEEDS_DIR = CORPUS_DIR / "feeds"
+ARTICLES_DIR = CORPUS_DIR / "articles"
+
+_WORDS = (
+    "google apple microsoft amazon nvidia openai startup launches model chip funding cloud "
+    "security breach layoffs acquisition robotics quantum battery privacy regulators court "
+    "platform developers users update release market growth record outage data network "
+    "search browser phone laptop satellite streaming subscription pricing election policy"
+).split()
+
+
+def load_feeds() -> Dict[str, bytes]:
+    """Return {source: payload} from corpus/feeds, or the synthetic corpus if none are recorded"""
+    recorded = {path.stem: path.read_bytes() for path in sorted(FEEDS_DIR.glob("*.xml"))}
+    return recorded or synthetic_feeds()
+
+
+def article_key(url: str) -> str:
+    """File name stem of a recorded article page"""
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+
+def load_articles() -> Dict[str, bytes]:
+    """Return {article_key: page} from corpus/articles (empty when none are recorded)"""
+    return {path.stem: path.read_bytes() for path in sorted(ARTICLES_DIR.glob("*.html"))}
+
+
+def synthetic_article(key: str) -> bytes:
+    """A deterministic article page for `key`, shaped like a publisher's article markup"""
+    rng = random.Random(key)
+    paragraphs = "".join(f"<p>{_sentence(rng, rng.randint(20, 45))}.</p>" for _ in range(rng.randint(6, 14)))
+    return (
+        f"<html><head><title>{_sentence(rng, 8)}</title><script>track()</script></head><body>"
+        f"<header><nav>Home News Reviews</nav></header><main><article><h1>{_sentence(rng, 8)}</h1>"
+        f"{paragraphs}</article></main><footer>Copyright</footer></body></html>"
+    ).encode("utf-8")
+
+
+def synthetic_feeds(items_per_feed: int = 40, seed: int = 7) -> Dict[str, bytes]:
+    """Build payloads shaped like the real sources: WordPress RSS, Google News RSS and Atom"""
+    rng = random.Random(seed)
+    feeds = {"google_news": _google_news_feed(rng, items_per_feed), "theverge.com": _atom_feed(rng, items_per_feed)}
+    for source in ("wired.com", "techcrunch.com", "arstechnica.com", "engadget.com", "technologyreview.com",
+                   "cnet.com", "venturebeat.com", "techrepublic.com"):
+        feeds[source] = _wordpress_feed(rng, source, items_per_feed)
+    return feeds
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize()
+
+
+def _pub_date(rng: random.Random) -> str:
+    return f"Mon, {rng.randint(1, 28):02d} Sep 2026 {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00 +0000"
+
+
+def _wordpress_feed(rng: random.Random, source: str, count: int) -> bytes:
+    items = []
+    for i in range(count):
+        title = _sentence(rng, 9)
+        paragraphs = "".join(f"<p>{_sentence(rng, rng.randint(12, 30))}.&nbsp;</p>" for _ in range(rng.randint(1, 4)))
+        description = (
+            f"<p><img src=\"https://{source}/img/{i}.jpg\" /></p>{paragraphs}"
+            f"<p>The post <a href=\"https://{source}/{i}\">{title}</a> appeared first on {source}.</p>"
+            "<script>track()</script>"
+        )
+        body = "".join(f"<p>{_sentence(rng, 40)}.</p>" for _ in range(8))
+        items.append(
+            f"<item><title>{escape(title)}</title><link>https://{source}/2026/09/{i}/story-{i}/</link>"
+            f"<dc:creator><![CDATA[Staff Writer]]></dc:creator><pubDate>{_pub_date(rng)}</pubDate>"
+            f"<category><![CDATA[Tech]]></category><guid isPermaLink=\"false\">https://{source}/?p={i}</guid>"
+            f"<description><![CDATA[{description}]]></description>"
+            f"<content:encoded><![CDATA[{body}]]></content:encoded></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0" '
+        'xmlns:content="http://purl.org/rss/1.0/modules/content/" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+        f"<channel><title>{source}</title><link>https://{source}/</link>{''.join(items)}</channel></rss>"
+    ).encode("utf-8")
+
+
+def _google_news_feed(rng: random.Random, count: int) -> bytes:
+    items = []
+    for i in range(count):
+        title = f"{_sentence(rng, 10)} - WIRED"
+        description = escape(
+            f'<a href="https://news.google.com/rss/articles/CBMi{i:04d}?oc=5" target="_blank">{title}</a>'
+            '&nbsp;&nbsp;<font color="#6f6f6f">WIRED</font>'
+        )
+        items.append(
+            f"<item><title>{escape(title)}</title><link>https://news.google.com/rss/articles/CBMi{i:04d}?oc=5</link>"
+            f"<guid isPermaLink=\"false\">CBMi{i:04d}</guid><pubDate>{_pub_date(rng)}</pubDate>"
+            f"<description>{description}</description><source url=\"https://www.wired.com\">WIRED</source></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?><rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/">'
+        f"<channel><generator>NFE/5.0</generator><title>Google News</title>{''.join(items)}</channel></rss>"
+    ).encode("utf-8")
+
+
+def _atom_feed(rng: random.Random, count: int) -> bytes:
+    entries = []
+    for i in range(count):
+        content = "".join(f"<p>{_sentence(rng, rng.randint(15, 35))}.</p>" for _ in range(rng.randint(2, 6)))
+        entries.append(
+            f"<entry><published>2026-09-{rng.randint(1, 28):02d}T10:00:00-04:00</published>"
+            f"<updated>2026-09-{rng.randint(1, 28):02d}T10:30:00-04:00</updated>"
+            f"<title type=\"html\">{escape(_sentence(rng, 9))}</title>"
+            f"<content type=\"html\">{escape(content)}</content>"
+            f"<link rel=\"alternate\" type=\"text/html\" href=\"https://www.theverge.com/news/{i}/story\"/>"
+            f"<id>https://www.theverge.com/news/{i}</id><author><name>Staff</name></author></entry>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom" xml:lang="en-US">'
+        f"<title type=\"text\">The Verge</title>{''.join(entries)}</feed>"
+    ).encode("utf-8")
@@ -0,0 +1,149 @@
+"""Local stand-in for the Hugging Face inference API, for testing latency behaviour offline.
+
+Usage (from backend/):
+    python -m benchmarks.inference_server [--port 8766] [--latency-ms 800] [--jitter-ms 300]
+                                          [--error-rate 0.1] [--loading-rate 0.05] [--hang-rate 0.0]
+
+POST /models/<model> answers like the real API: [{"generated_text": "..."}]. A share of
+requests fail with a 503 (error-rate), answer 503 {"error": "... is currently loading",
+"estimated_time": N} (loading-rate), or never answer within any sane timeout (hang-rate).
+Models listed with --down always fail. Point the app at it with
+INFERENCE_API_URL=http://127.0.0.1:8766/models.
+"""
+import argparse
+import asyncio
+import random
+import threading
+from typing import Iterable, Optional
+
+from aiohttp import web
+
+_FACTS = [
+    "The first computer bug was a real moth found in a Harvard Mark II relay in 1947.",
+    "Quicksort was invented by Tony Hoare in 1959 while he was a visiting student in Moscow.",
+    "The transformer architecture was introduced in the 2017 paper Attention Is All You Need.",
+    "Git was written by Linus Torvalds in 2005 in about ten days.",
+    "The first domain name ever registered was symbolics.com, in 1985.",
+]
+
+
+class InferenceServer:
+    """Serves the stand-in API on 127.0.0.1 from a background thread (see `start` / `stop`)"""
+
+    def __init__(
+        self,
+        latency_ms: float = 800.0,
+        jitter_ms: float = 300.0,
+        error_rate: float = 0.0,
+        loading_rate: float = 0.0,
+        hang_rate: float = 0.0,
+        down_models: Iterable[str] = (),
+        seed: int = 7
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.loading_rate = loading_rate
+        self.hang_rate = hang_rate
+        self.down_models = set(down_models)
+        self.rng = random.Random(seed)
+        self.stats = {"requests": 0, "errors": 0, "loading": 0, "hung": 0, "by_model": {}}
+        self.base_url = ""
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.base_url}/models"
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/models/{model:.+}", self._generate)
+        return app
+
+    def start(self, port: int = 0) -> "InferenceServer":
+        """Start serving in a background thread; port 0 picks a free port"""
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._runner = web.AppRunner(self.app(), access_log=None, shutdown_timeout=0.5)
+            self._loop.run_until_complete(self._runner.setup())
+            site = web.TCPSite(self._runner, "127.0.0.1", port)
+            self._loop.run_until_complete(site.start())
+            bound_port = site._server.sockets[0].getsockname()[1]
+            self.base_url = f"http://127.0.0.1:{bound_port}"
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    async def _shutdown(self):
+        await self._runner.cleanup()
+        # Hung requests outlive the cleanup; cancel them so the loop stops cleanly
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _generate(self, request: web.Request) -> web.Response:
+        model = request.match_info["model"]
+        self.stats["requests"] += 1
+        self.stats["by_model"][model] = self.stats["by_model"].get(model, 0) + 1
+        await request.read()
+
+        roll = self.rng.random()
+        if roll < self.hang_rate:
+            self.stats["hung"] += 1
+            await asyncio.sleep(3600)
+        delay = max(0.0, self.rng.gauss(self.latency_ms, self.jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+
+        if model in self.down_models or roll < self.hang_rate + self.error_rate:
+            self.stats["errors"] += 1
+            return web.json_response({"error": "stand-in failure"}, status=503)
+        if roll < self.hang_rate + self.error_rate + self.loading_rate:
+            self.stats["loading"] += 1
+            return web.json_response(
+                {"error": f"Model {model} is currently loading", "estimated_time": round(self.rng.uniform(0.5, 2.0), 1)},
+                status=503
+            )
+        return web.json_response([{"generated_text": self.rng.choice(_FACTS) + "\nIgnored second line."}])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument("--jitter-ms", type=float, default=300.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--loading-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--down", action="append", default=[], help="model that always fails (repeatable)")
+    args = parser.parse_args()
+
+    server = InferenceServer(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        loading_rate=args.loading_rate,
+        hang_rate=args.hang_rate,
+        down_models=args.down
+    ).start(args.port)
+    print(f"Stand-in inference API at {server.api_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
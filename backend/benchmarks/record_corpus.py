@@ -0,0 +1,53 @@
+"""Record the live feeds and their article pages into benchmarks/corpus so benchmarks can run offline.
+
+Usage (from backend/):
+    python -m benchmarks.record_corpus [--articles-per-feed 5]
+"""
+import argparse
+
+import requests
+
+from app.models.database import SessionLocal
+from app.services.breaking_news_service import BreakingNewsService
+from app.services.feed_parser import parse_feed_items
+from benchmarks.feed_corpus import ARTICLES_DIR, FEEDS_DIR, article_key
+
+
+def record_feeds(articles_per_feed: int = 5):
+    service = BreakingNewsService()
+    FEEDS_DIR.mkdir(parents=True, exist_ok=True)
+    ARTICLES_DIR.mkdir(parents=True, exist_ok=True)
+
+    db = SessionLocal()
+    try:
+        sources = service.feed_registry.get_sources(db)
+    finally:
+        db.close()
+
+    for source in sources:
+        try:
+            response = requests.get(source["url"], params=source["params"], headers=service.request_headers, timeout=10)
+            response.raise_for_status()
+            path = FEEDS_DIR / f"{source['source']}.xml"
+            path.write_bytes(response.content)
+            print(f"Recorded {source['name']}: {len(response.content)} bytes -> {path.name}")
+        except Exception as e:
+            print(f"Could not record {source['name']}: {e}")
+            continue
+
+        for item in parse_feed_items(response.content, limit=articles_per_feed):
+            if not item["link"]:
+                continue
+            try:
+                page = requests.get(item["link"], headers=service.request_headers, timeout=10)
+                page.raise_for_status()
+                (ARTICLES_DIR / f"{article_key(item['link'])}.html").write_bytes(page.content)
+            except Exception as e:
+                print(f"Could not record article {item['link']}: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles-per-feed", type=int, default=5)
+    args = parser.parse_args()
+    record_feeds(args.articles_per_feed)
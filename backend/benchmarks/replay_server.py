@@ -0,0 +1,153 @@
+"""Local HTTP stand-in for the publishers that replays the benchmark corpus.
+
+Usage (from backend/):
+    python -m benchmarks.replay_server [--port 8765] [--latency-ms 50] [--jitter-ms 25] [--error-rate 0.05]
+
+Feeds are served at /feeds/<source> and article pages at /articles/<key>. Item links in
+the replayed feeds are rewritten to point back at this server, so article enrichment is
+replayed too; links without a recorded page get a synthetic one. Every response waits
+for the configured latency, and a share of requests (error-rate) fail with a 503.
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+import re
+import threading
+from typing import Dict, Optional
+
+from aiohttp import web
+
+from benchmarks.feed_corpus import article_key, load_articles, load_feeds, synthetic_article
+
+_RSS_LINK = re.compile(rb"(<link>)\s*(?:<!\[CDATA\[)?\s*(.*?)\s*(?:\]\]>)?\s*(</link>)", re.S)
+_ATOM_LINK = re.compile(rb'(<link\b[^>]*?\bhref=")([^"]+)(")')
+
+
+class ReplayServer:
+    """Serves the corpus on 127.0.0.1 from a background thread (see `start` / `stop`)"""
+
+    def __init__(
+        self,
+        feeds: Optional[Dict[str, bytes]] = None,
+        articles: Optional[Dict[str, bytes]] = None,
+        latency_ms: float = 50.0,
+        jitter_ms: float = 25.0,
+        error_rate: float = 0.0,
+        etags: bool = True,
+        seed: int = 7
+    ):
+        self.feeds = feeds if feeds is not None else load_feeds()
+        self.articles = articles if articles is not None else load_articles()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.etags = etags
+        self.rng = random.Random(seed)
+        self.stats = {"requests": 0, "errors": 0, "not_modified": 0, "bytes": 0}
+        self.base_url = ""
+        self._rewritten: Dict[str, bytes] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def feed_url(self, source: str) -> str:
+        return f"{self.base_url}/feeds/{source}"
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/feeds/{source}", self._feed)
+        app.router.add_get("/articles/{key}", self._article)
+        return app
+
+    def start(self, port: int = 0) -> "ReplayServer":
+        """Start serving in a background thread; port 0 picks a free port"""
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._runner = web.AppRunner(self.app(), access_log=None)
+            self._loop.run_until_complete(self._runner.setup())
+            site = web.TCPSite(self._runner, "127.0.0.1", port)
+            self._loop.run_until_complete(site.start())
+            bound_port = site._server.sockets[0].getsockname()[1]
+            self.base_url = f"http://127.0.0.1:{bound_port}"
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    async def _delay_or_fail(self) -> Optional[web.Response]:
+        self.stats["requests"] += 1
+        delay = max(0.0, self.rng.gauss(self.latency_ms, self.jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+        if self.rng.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return web.Response(status=503, text="replayed failure")
+        return None
+
+    async def _feed(self, request: web.Request) -> web.Response:
+        failure = await self._delay_or_fail()
+        if failure is not None:
+            return failure
+        source = request.match_info["source"]
+        if source not in self.feeds:
+            return web.Response(status=404)
+
+        payload = self._rewritten.get(source)
+        if payload is None:
+            payload = self._rewritten[source] = self._rewrite_links(self.feeds[source])
+        headers = {}
+        if self.etags:
+            etag = '"' + hashlib.sha1(payload).hexdigest()[:16] + '"'
+            headers["ETag"] = etag
+            if request.headers.get("If-None-Match") == etag:
+                self.stats["not_modified"] += 1
+                return web.Response(status=304, headers=headers)
+        self.stats["bytes"] += len(payload)
+        return web.Response(body=payload, content_type="application/rss+xml", headers=headers)
+
+    async def _article(self, request: web.Request) -> web.Response:
+        failure = await self._delay_or_fail()
+        if failure is not None:
+            return failure
+        key = request.match_info["key"]
+        page = self.articles.get(key) or synthetic_article(key)
+        self.stats["bytes"] += len(page)
+        return web.Response(body=page, content_type="text/html")
+
+    def _rewrite_links(self, payload: bytes) -> bytes:
+        def replace(match):
+            url = match.group(2).decode("utf-8", "replace").strip()
+            return match.group(1) + f"{self.base_url}/articles/{article_key(url)}".encode() + match.group(3)
+
+        return _ATOM_LINK.sub(replace, _RSS_LINK.sub(replace, payload))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=25.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = ReplayServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate).start(args.port)
+    print(f"Replaying {len(server.feeds)} feeds and {len(server.articles)} recorded articles at {server.base_url}")
+    for source in server.feeds:
+        print(f"  {server.feed_url(source)}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
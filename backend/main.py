@@ -14,6 +14,7 @@ from sqlalchemy import func
 
 from app.api.routes import news, facts, stocks, breaking_news, auth
 from app.core.config import settings
+from app.ai.inference_client import inference_client
 from app.services.scheduler import start_breaking_news_scheduler
 from app.models.database import SessionLocal, User
 from app.core.security import get_password_hash, verify_password
@@ -73,7 +74,7 @@ async def lifespan(app: FastAPI):
     start_breaking_news_scheduler()
     yield
     # Shutdown
-    pass
+    await inference_client.close()
 
 app = FastAPI(
     title="TechScope Daily API",
@@ -91,6 +92,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 